@@ -1,7 +1,18 @@
+"""
+AI recommendations through OpenCode Zen models.
+
+Identical calls are served from the response cache. Each request carries
+the explicit timeout of its endpoint (AI_RESPONSES_TIMEOUT, AI_CHAT_TIMEOUT,
+AI_CONNECT_TIMEOUT, AI_MAX_RETRIES) and can stream its text to an on_delta
+callback. Only non-transient errors fall back to the other endpoint, and the
+endpoint that answered is remembered in the shared endpoint memo.
+"""
+
 import textwrap
 import re
 
 #  Local imports
+from ai import endpoint_memo, response_cache
 from config import constants
 
 
@@ -21,14 +32,110 @@ def _extract_responses_text(resp):
     return "\n".join(chunks).strip()
 
 
-def ai_fpl_helper(prompt, SYSTEM_PROMPT, client, API_KEY):
+def _timeout(seconds):
+    """Per-request timeout with the shared connect timeout."""
+    from openai import Timeout
+
+    return Timeout(seconds, connect=constants.AI_CONNECT_TIMEOUT)
+
+
+def _is_transient(error):
+    """
+    True for errors the other endpoint would not avoid (network, timeout,
+    rate limit, server error); anything else means the endpoint does not
+    serve this model.
+    """
+    import openai
+
+    return isinstance(
+        error,
+        (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError),
+    )
+
+
+def _call_endpoint(client, endpoint, messages, on_delta=None):
+    """
+    One request on the given endpoint with its configured timeout.
+    Args:
+        client: OpenAI client instance
+        endpoint: endpoint_memo.RESPONSES or endpoint_memo.CHAT
+        messages: system and user messages
+        on_delta: optional function called with each text chunk; the
+            request is then streamed
+    Returns:
+        str: response text ("" if the endpoint returned no text)
+    """
+    stream = on_delta is not None
+    if endpoint == endpoint_memo.RESPONSES:
+        resp = client.responses.create(
+            model=constants.AI_MODEL,
+            input=messages,
+            temperature=constants.AI_TEMPERATURE,
+            max_output_tokens=constants.AI_MAX_OUTPUT_TOKENS,
+            timeout=_timeout(constants.AI_RESPONSES_TIMEOUT),
+            stream=stream,
+        )
+        if not stream:
+            return _extract_responses_text(resp)
+        chunks = []
+        for event in resp:
+            if getattr(event, "type", "") == "response.output_text.delta":
+                chunks.append(event.delta)
+                on_delta(event.delta)
+        return "".join(chunks).strip()
+
+    resp = client.chat.completions.create(
+        model=constants.AI_MODEL,
+        messages=messages,
+        temperature=constants.AI_TEMPERATURE,
+        max_tokens=constants.AI_MAX_OUTPUT_TOKENS,
+        timeout=_timeout(constants.AI_CHAT_TIMEOUT),
+        stream=stream,
+    )
+    if not stream:
+        return (resp.choices[0].message.content or "").strip()
+    chunks = []
+    for chunk in resp:
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if delta:
+            chunks.append(delta)
+            on_delta(delta)
+    return "".join(chunks).strip()
+
+
+def _endpoint_order(client):
+    """
+    Endpoints to try, in order, for the configured model.
+
+    Zen GPT models are served via /responses, others via chat completions
+    only. An endpoint remembered as working for this base URL and model is
+    tried first until its memo entry is due a re-probe.
+    """
+    model_name = (constants.AI_MODEL or "").lower()
+    if model_name.startswith("gpt-"):
+        order = [endpoint_memo.RESPONSES, endpoint_memo.CHAT]
+    else:
+        order = [endpoint_memo.CHAT]
+    known = endpoint_memo.get_memo().get(client.base_url, constants.AI_MODEL)
+    if known in order:
+        order.remove(known)
+        order.insert(0, known)
+    return order
+
+
+def ai_fpl_helper(prompt, SYSTEM_PROMPT, client, API_KEY, on_delta=None):
     """
     Get AI recommendations for FPL transfers.
+    Identical calls are answered from the response cache (AI_CACHE_*). The
+    endpoint that works is remembered per base URL and model
+    (AI_ENDPOINT_*), so later calls skip the one that does not.
     Args:
         prompt: json of players with replacements
         SYSTEM_PROMPT: system prompt for AI model
         client: OpenAI client instance
         API_KEY: boolean indicating if API key is available
+        on_delta: optional function called with the raw text as it streams
+            in (a cached response arrives as one chunk)
     Returns:
         str: formatted AI response text
     """
@@ -44,29 +151,46 @@ def ai_fpl_helper(prompt, SYSTEM_PROMPT, client, API_KEY):
             return "AI Error: No available client."
 
         raw = ""
-        model_name = (constants.AI_MODEL or "").lower()
-
-        # Zen GPT models are served via /responses endpoint.
-        if model_name.startswith("gpt-"):
-            try:
-                resp = client.responses.create(
-                    model=constants.AI_MODEL,
-                    input=messages,
-                    temperature=0.3,
-                    max_output_tokens=600,
-                )
-                raw = _extract_responses_text(resp)
-            except Exception:
-                raw = ""
+        cache, key = None, None
+        if constants.AI_CACHE_ENABLED:
+            cache = response_cache.get_cache()
+            key = response_cache.cache_key(
+                constants.AI_MODEL, SYSTEM_PROMPT, prompt, constants.AI_TEMPERATURE
+            )
+            raw = cache.get(key) or ""
+        cached = bool(raw)
+        if cached and on_delta is not None:
+            on_delta(raw)
 
         if not raw:
-            resp = client.chat.completions.create(
-                model=constants.AI_MODEL,
-                messages=messages,
-                temperature=0.3,
-                max_tokens=600,
-            )
-            raw = (resp.choices[0].message.content or "").strip()
+            streamed = []
+            if on_delta is not None:
+
+                def forward(text):
+                    streamed.append(text)
+                    on_delta(text)
+
+            else:
+                forward = None
+            order = _endpoint_order(client)
+            for i, endpoint in enumerate(order):
+                last = i == len(order) - 1
+                try:
+                    raw = _call_endpoint(client, endpoint, messages, forward)
+                except Exception as e:
+                    # Transient errors are not a reason to switch endpoints,
+                    # and text already streamed cannot be taken back
+                    if last or streamed or _is_transient(e):
+                        raise
+                    continue
+                if raw:
+                    endpoint_memo.get_memo().record(
+                        client.base_url, constants.AI_MODEL, endpoint
+                    )
+                    break
+
+        if cache is not None and raw and not cached:
+            cache.put(key, raw, constants.AI_MODEL)
     except Exception as e:
         return f"AI Error: {e}\nDo you have VPN on..."
 
@@ -12,12 +12,14 @@ def ai_transfer_prompt():
         Never include <think> or hidden reasoning steps.
         ONLY ever return the suggested transfer and the reason.
 
-        Each key in the JSON represents a player currently in the user's team
-        (a potential transfer OUT).
-        Each value contains:
-        - "current": the full player data for that team player.
-        - "candidates": a list of full player data dicts representing
-          possible replacements.
+        Players are compact rows: "cols" names the fields of every row
+        (xp = expected points next GW, ppg = points per game, xgi = expected
+        goal involvements, mins = minutes, fdr = upcoming fixture difficulty,
+        chance = % chance of playing).
+        Each key in "squad" is a player currently in the user's team
+        (a potential transfer OUT) with:
+        - "current": the row for that team player.
+        - "candidates": rows of possible replacements.
 
         Your task:
         - Review **all** possible transfers (OUT → IN) across the dataset.
@@ -49,8 +51,10 @@ def ai_wildcard_prompt(total_team_cost):
         You are an expert Fantasy Premier League (FPL) squad builder.
         Never include <think> or hidden reasoning.
 
-        You will receive a JSON object with keys GKP, DEF, MID, FWD.
-        Every player object includes a unique `id`.
+        You will receive a JSON object with keys GKP, DEF, MID, FWD, each a
+        list of player rows whose fields are named in "cols" (xp = expected
+        points next GW, ppg = points per game, mins = minutes, chance = %
+        chance of playing). Every row includes a unique `id`.
 
         Build the best possible valid 15-player squad using only the provided players
         and return JSON only.
@@ -94,9 +98,11 @@ def ai_wildcard_explain_prompt(total_team_cost):
     wildcard_explain_prompt = f"""
         You are an expert Fantasy Premier League analyst.
         You will receive a JSON payload containing:
-        - the optimizer-selected wildcard squad (already valid)
+        - the optimizer-selected wildcard squad (already valid), as rows whose
+          fields are named in "cols" (xp = expected points next GW, mins = minutes)
         - budget usage and diagnostics
-        - top excluded candidates
+        - top excluded candidates, as rows whose fields are named in
+          "excluded_cols"
 
         Your task:
         - Briefly explain why this squad is strong within the
@@ -0,0 +1,104 @@
+import os
+import json
+import time
+import threading
+
+#  Local imports
+from config import constants
+from utils import file_handlers
+
+RESPONSES = "responses"
+CHAT = "chat"
+
+
+class EndpointMemo:
+    """
+    Which API endpoint works per (base URL, model), shared by every worker.
+
+    Entries live in one JSON file replaced atomically, so a worker that
+    learns an endpoint is unsupported saves the others from trying it. An
+    entry older than reprobe_after is ignored and the preferred endpoint is
+    tried again.
+    """
+
+    def __init__(self, path=None, reprobe_after=None):
+        self.path = path or constants.AI_ENDPOINT_MEMO_PATH
+        self.reprobe_after = (
+            constants.AI_ENDPOINT_REPROBE_AFTER
+            if reprobe_after is None
+            else reprobe_after
+        )
+        self._lock = threading.Lock()
+        self._memo = (None, {})  # (file mtime, parsed entries)
+
+    @staticmethod
+    def key(base_url, model):
+        return f"{str(base_url).rstrip('/')}|{model}"
+
+    def _read(self):
+        """Read the shared entries, re-parsing only when the file has changed."""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return {}
+        if self._memo[0] == mtime:
+            return self._memo[1]
+        try:
+            with open(self.path, "r") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        self._memo = (mtime, entries)
+        return entries
+
+    def get(self, base_url, model):
+        """
+        Endpoint known to work, or None if unknown or due a re-probe.
+        Args:
+            base_url: API base URL of the client
+            model: model name
+        Returns:
+            str or None: RESPONSES, CHAT or None
+        """
+        entry = self._read().get(self.key(base_url, model))
+        if not entry or time.time() - entry.get("checked_at", 0) > self.reprobe_after:
+            return None
+        return entry.get("endpoint")
+
+    def record(self, base_url, model, endpoint):
+        """
+        Remember the endpoint that answered; unchanged fresh entries are
+        not rewritten.
+        Args:
+            base_url: API base URL of the client
+            model: model name
+            endpoint: RESPONSES or CHAT
+        """
+        if self.get(base_url, model) == endpoint:
+            return
+        with self._lock:
+            entries = dict(self._read())
+            entries[self.key(base_url, model)] = {
+                "endpoint": endpoint,
+                "checked_at": time.time(),
+            }
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                file_handlers.atomic_write(
+                    self.path, json.dumps(entries).encode("utf-8")
+                )
+            except OSError:
+                pass  # a read-only cache dir only costs a re-probe
+
+
+_memo = None
+_memo_lock = threading.Lock()
+
+
+def get_memo():
+    """Process-wide EndpointMemo, created on first use."""
+    global _memo
+    with _memo_lock:
+        if _memo is None:
+            _memo = EndpointMemo()
+        return _memo
@@ -0,0 +1,285 @@
+"""
+Compact AI payloads.
+
+Only the fields each prompt uses are sent, under short keys, as tabular rows
+under a "cols" header serialised without whitespace. The lowest-value
+candidates (smallest rating gain, lowest rating) are dropped to fit
+AI_*_TOKEN_BUDGET, counted with tiktoken if installed, else at about
+CHARS_PER_TOKEN characters per token.
+"""
+
+import importlib.util
+import json
+import math
+
+#  Local imports
+from config import constants
+
+HAS_TIKTOKEN = importlib.util.find_spec("tiktoken") is not None
+CHARS_PER_TOKEN = 4  # estimate when tiktoken is not installed
+
+# Player record key -> short key, per prompt (ai/ai_prompt.py)
+TRANSFER_FIELDS = {
+    "web_name": "name",
+    "team_name": "team",
+    "pos": "pos",
+    "now_cost(m)": "cost",
+    "rating": "rating",
+    "form": "form",
+    "ep_next": "xp",
+    "points_per_game": "ppg",
+    "expected_goal_involvements": "xgi",
+    "minutes": "mins",
+    "team_fix_dif": "fdr",
+    "chance_of_playing_next_round": "chance",
+}
+WILDCARD_FIELDS = {
+    "id": "id",
+    "web_name": "name",
+    "team_name": "team",
+    "now_cost(m)": "cost",
+    "rating": "rating",
+    "form": "form",
+    "ep_next": "xp",
+    "points_per_game": "ppg",
+    "minutes": "mins",
+    "chance_of_playing_next_round": "chance",
+}
+EXPLAIN_FIELDS = {
+    "id": "id",
+    "web_name": "name",
+    "team_name": "team",
+    "pos": "pos",
+    "now_cost(m)": "cost",
+    "rating": "rating",
+    "form": "form",
+    "ep_next": "xp",
+    "minutes": "mins",
+}
+EXCLUDED_FIELDS = ["name", "pos", "team", "cost", "rating", "reason"]
+SQUAD_SHAPE = {"GKP": 2, "DEF": 5, "MID": 5, "FWD": 3}
+
+_encoding = None
+
+
+def estimate_tokens(text):
+    """
+    Token count of text: tiktoken (o200k_base) if installed, else
+    len / CHARS_PER_TOKEN.
+    """
+    global _encoding
+    if HAS_TIKTOKEN and _encoding is None:
+        try:
+            import tiktoken
+
+            _encoding = tiktoken.get_encoding("o200k_base")
+        except Exception:
+            _encoding = False  # encoding files unavailable; estimate instead
+    if _encoding:
+        return len(_encoding.encode(text))
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def compact_json(payload):
+    """Serialise without indentation or spaces after separators."""
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+def _compact_value(value):
+    """Numbers as short numbers (API strings like "4.5" included)."""
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError:
+            return value
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return value
+    if math.isnan(number):
+        return None
+    number = round(number, 2)
+    return int(number) if number.is_integer() else number
+
+
+def _row(record, fields):
+    """One player as a list of compact values in fields order."""
+    return [_compact_value(record.get(key)) for key in fields]
+
+
+def _rating(record):
+    return _compact_value(record.get("rating")) or 0.0
+
+
+def _fit(render, items, budget):
+    """
+    Render a payload, dropping the lowest-value items until it fits budget.
+
+    Drops are first sized from per-item token estimates, then topped up
+    one at a time while the rendered payload is still over budget.
+    Args:
+        render: function of a set of dropped item ids -> payload text
+        items: list of (value, tokens, item id) that may be dropped
+        budget: token budget
+    Returns:
+        tuple: (payload text, tokens before dropping, num of items dropped)
+    """
+    text = render(set())
+    tokens_before = tokens = estimate_tokens(text)
+    order = sorted(items, key=lambda item: item[0])
+    dropped, k = set(), 0
+    excess = tokens - budget
+    while k < len(order) and excess > 0:
+        excess -= order[k][1]
+        dropped.add(order[k][2])
+        k += 1
+    if dropped:
+        text = render(dropped)
+        tokens = estimate_tokens(text)
+    while tokens > budget and k < len(order):
+        dropped.add(order[k][2])
+        k += 1
+        text = render(dropped)
+        tokens = estimate_tokens(text)
+    return text, tokens_before, len(dropped)
+
+
+def _stats(text, budget, tokens_before, dropped):
+    """Token count of the final payload for reports and logs."""
+    tokens = estimate_tokens(text)
+    return {
+        "tokens": tokens,
+        "budget": budget,
+        "tokens_before": tokens_before,
+        "dropped": dropped,
+        "within_budget": tokens <= budget,
+    }
+
+
+def build_transfer_prompt(squad, replacement_options, budget=None):
+    """
+    Compact transfer payload within a token budget.
+
+    Players are rows under the shared "cols" header. Candidates with the
+    smallest rating gain over the player they replace are dropped first.
+    Args:
+        squad: iterable of current team player dicts
+        replacement_options: list of candidate PlayerView/lists per player
+        budget: token budget (default AI_TRANSFER_TOKEN_BUDGET)
+    Returns:
+        tuple: (payload text, stats dict with tokens and candidates dropped)
+    """
+    budget = budget or constants.AI_TRANSFER_TOKEN_BUDGET
+    fields = list(TRANSFER_FIELDS)
+    entries, items = [], []
+    for i, (player, candidates) in enumerate(zip(squad, replacement_options)):
+        candidates = list(candidates)
+        current = _row(player, fields)
+        rows = [_row(candidate, fields) for candidate in candidates]
+        entries.append((player.get("web_name", ""), current, rows))
+        for j, (candidate, row) in enumerate(zip(candidates, rows)):
+            gain = _rating(candidate) - _rating(player)
+            items.append((gain, estimate_tokens(compact_json(row)) + 1, (i, j)))
+
+    def payload(dropped):
+        return {
+            "cols": list(TRANSFER_FIELDS.values()),
+            "squad": {
+                name: {
+                    "current": current,
+                    "candidates": [
+                        row for j, row in enumerate(rows) if (i, j) not in dropped
+                    ],
+                }
+                for i, (name, current, rows) in enumerate(entries)
+            },
+        }
+
+    text, tokens_before, dropped = _fit(
+        lambda dropped: compact_json(payload(dropped)), items, budget
+    )
+    return text, _stats(text, budget, tokens_before, dropped)
+
+
+def build_wildcard_prompt(players_by_pos, budget=None):
+    """
+    Compact wildcard candidate payload within a token budget.
+
+    The lowest-rated players of each position are dropped first, keeping
+    at least twice the squad slots per position.
+    Args:
+        players_by_pos: dict of player records (or PlayerView) per position
+        budget: token budget (default AI_WILDCARD_TOKEN_BUDGET)
+    Returns:
+        tuple: (payload text, stats dict with tokens and players dropped)
+    """
+    budget = budget or constants.AI_WILDCARD_TOKEN_BUDGET
+    fields = list(WILDCARD_FIELDS)
+    rows, items = {}, []
+    for pos, players in players_by_pos.items():
+        players = list(players)
+        rows[pos] = [_row(player, fields) for player in players]
+        keep = 2 * SQUAD_SHAPE.get(pos, 0)
+        for j, (player, row) in enumerate(zip(players, rows[pos])):
+            if j >= keep:
+                tokens = estimate_tokens(compact_json(row)) + 1
+                items.append((_rating(player), tokens, (pos, j)))
+
+    def payload(dropped):
+        out = {"cols": list(WILDCARD_FIELDS.values())}
+        for pos, pos_rows in rows.items():
+            out[pos] = [
+                row for j, row in enumerate(pos_rows) if (pos, j) not in dropped
+            ]
+        return out
+
+    text, tokens_before, dropped = _fit(
+        lambda dropped: compact_json(payload(dropped)), items, budget
+    )
+    return text, _stats(text, budget, tokens_before, dropped)
+
+
+def build_explain_prompt(optimization, budget_limit, budget=None):
+    """
+    Compact wildcard explanation payload within a token budget.
+
+    The selected squad and diagnostics are always kept; excluded
+    candidates are dropped from the lowest rating up.
+    Args:
+        optimization: dict from wildcard_optimizer.optimize_wildcard_squad
+        budget_limit: float squad budget in millions
+        budget: token budget (default AI_EXPLAIN_TOKEN_BUDGET)
+    Returns:
+        tuple: (payload text, stats dict with tokens and candidates dropped)
+    """
+    budget = budget or constants.AI_EXPLAIN_TOKEN_BUDGET
+    fields = list(EXPLAIN_FIELDS)
+    excluded = [
+        [_compact_value(entry.get(key)) for key in EXCLUDED_FIELDS]
+        for entry in optimization.get("top_excluded", [])
+    ]
+
+    def payload(dropped):
+        return {
+            "budget_limit": budget_limit,
+            "cols": list(EXPLAIN_FIELDS.values()),
+            "selected_squad": [_row(p, fields) for p in optimization["squad"]],
+            "diagnostics": {
+                "total_cost": optimization.get("total_cost"),
+                "budget_left": optimization.get("budget_left"),
+                "objective_score": optimization.get("objective_score"),
+            },
+            "excluded_cols": EXCLUDED_FIELDS,
+            "top_excluded": [row for j, row in enumerate(excluded) if j not in dropped],
+        }
+
+    items = [
+        (row[4] or 0.0, estimate_tokens(compact_json(row)) + 1, j)
+        for j, row in enumerate(excluded)
+    ]
+    text, tokens_before, dropped = _fit(
+        lambda dropped: compact_json(payload(dropped)), items, budget
+    )
+    return text, _stats(text, budget, tokens_before, dropped)
@@ -0,0 +1,143 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+#  Local imports
+from config import constants
+from utils import file_handlers
+
+
+def cache_key(model, system_prompt, payload, temperature):
+    """
+    Cache key for one AI call.
+    Args:
+        model: model name
+        system_prompt: system prompt text
+        payload: user prompt text (hashed on its own first)
+        temperature: sampling temperature
+    Returns:
+        str: hex digest identifying the call
+    """
+    payload_hash = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    key = json.dumps([model, system_prompt, payload_hash, float(temperature)])
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    On-disk LRU cache of AI responses with a TTL, shared by every worker.
+
+    Each response is one <key>.json file written atomically. A hit bumps
+    the file's mtime, so mtime order is recency order across processes;
+    once more than max_entries files exist the least recently used are
+    removed. Entries older than ttl are misses and are deleted when read.
+    Hit/miss counters are kept per process.
+    """
+
+    def __init__(self, cache_dir=None, ttl=None, max_entries=None):
+        self.cache_dir = cache_dir or constants.AI_CACHE_DIR
+        self.ttl = constants.AI_CACHE_TTL if ttl is None else ttl
+        self.max_entries = max_entries or constants.AI_CACHE_MAX_ENTRIES
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0}
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def get(self, key):
+        """
+        Return the cached response for key, or None on a miss.
+        Args:
+            key: cache_key of the call
+        Returns:
+            str or None: cached raw response text
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self._count("misses")
+            return None
+        if time.time() - entry.get("created", 0) > self.ttl:
+            self._count("expired")
+            self._count("misses")
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        try:
+            os.utime(path)  # most recently used
+        except OSError:
+            pass
+        self._count("hits")
+        return entry.get("response")
+
+    def put(self, key, response, model=""):
+        """
+        Store a response and evict least recently used entries over the cap.
+        Args:
+            key: cache_key of the call
+            response: raw response text
+            model: model name, kept for inspection
+        """
+        entry = {"response": response, "model": model, "created": time.time()}
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            file_handlers.atomic_write(
+                self._path(key), json.dumps(entry).encode("utf-8")
+            )
+            self._evict()
+        except OSError:
+            pass  # a read-only cache dir only costs the next call
+
+    def _evict(self):
+        """Remove the least recently used files beyond max_entries."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            try:
+                mtime = os.stat(os.path.join(self.cache_dir, name)).st_mtime_ns
+            except OSError:
+                continue
+            entries.append((mtime, name))
+        excess = len(entries) - self.max_entries
+        if excess <= 0:
+            return
+        removed = 0
+        for _, name in sorted(entries)[:excess]:
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+                removed += 1
+            except OSError:
+                pass  # already evicted by another worker
+        self._count("evicted", removed)
+
+    def stats(self):
+        """dict of this process's hit, miss, expiry and eviction counts."""
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_rate"] = round(counters["hits"] / lookups, 3) if lookups else 0.0
+        return counters
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Process-wide ResponseCache, created on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+        return _cache
@@ -0,0 +1,57 @@
+"""
+Budget sweep wall time: in-process vs the spawned process pool.
+
+The first pooled sweep includes starting the workers; later sweeps reuse
+them. Run from the repo root:
+    python -m benchmarks.bench_budget_sweep
+"""
+
+import os
+import time
+
+#  Local imports
+from benchmarks import synthetic
+from config import constants
+from models import ratings, sort, wildcard_optimizer
+
+BASE_BUDGET = 100.0
+SWEEPS = [1.0, 3.0, 6.0]  # extra budget; 0.5m steps
+WORKERS = max(2, min(4, os.cpu_count() or 1))
+
+
+def _budgets(extra):
+    steps = int(extra / constants.WILDCARD_SWEEP_STEP)
+    return [BASE_BUDGET + i * constants.WILDCARD_SWEEP_STEP for i in range(steps + 1)]
+
+
+def _squads(result):
+    return [(point["budget"], point["squad_ids"]) for point in result["points"]]
+
+
+def _timed(sorted_players, budgets, workers):
+    start = time.perf_counter()
+    result = wildcard_optimizer.sweep_budgets(
+        sorted_players, budgets, constants.WILDCARD_MIN_SPEND_GAP, workers
+    )
+    return time.perf_counter() - start, result
+
+
+def main():
+    players = synthetic.synthetic_table(700, 0)
+    players = ratings.compute_ml_ratings(players, constants.WC_WEIGHTS, "wildcard")
+    sorted_players = sort.sort_players(players)
+
+    startup, _ = _timed(sorted_players, _budgets(1.0), WORKERS)
+    print(f"pool start-up + first sweep ({WORKERS} workers): {startup:.2f}s")
+    print(f"{'budgets':>7} {'serial (s)':>11} {'pool (s)':>9}")
+    for extra in SWEEPS:
+        budgets = _budgets(extra)
+        serial, expected = _timed(sorted_players, budgets, 1)
+        pooled, result = _timed(sorted_players, budgets, WORKERS)
+        if _squads(result) != _squads(expected):
+            raise AssertionError("Pooled sweep differs from the serial sweep")
+        print(f"{len(budgets):>7} {serial:>11.2f} {pooled:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
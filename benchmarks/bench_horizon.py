@@ -0,0 +1,64 @@
+"""
+Multi-gameweek transfer horizon: solve time by horizon length.
+
+Starts from the optimal wildcard squad of a synthetic table and plans 1 to
+6 gameweeks ahead, once to optimality and once under a short time limit
+(the anytime incumbent). Run from the repo root:
+    python -m benchmarks.bench_horizon
+"""
+
+import time
+
+#  Local imports
+from benchmarks import synthetic
+from config import constants
+from models import fixtures, horizon_planner, ratings, sort, wildcard_optimizer
+
+HORIZONS = [1, 2, 3, 4, 5, 6]
+SHORT_LIMIT = 0.5
+SEEDS = [0, 1]
+
+
+def _plan(sorted_players, current_team, bank, matrix, num_gws, time_limit):
+    start = time.perf_counter()
+    result = horizon_planner.plan_horizon(
+        sorted_players, current_team, bank, matrix, 1, num_gws, 1, time_limit
+    )
+    return time.perf_counter() - start, result
+
+
+def main():
+    print(
+        f"{'seed':>4} {'GWs':>3} {'pool':>4} {'optimal (s)':>11} {'value':>7} "
+        f"{'limited (s)':>11} {'value':>7} {'gap':>6} {'hold':>7}"
+    )
+    for seed in SEEDS:
+        players = synthetic.synthetic_table(700, seed)
+        players = ratings.compute_ml_ratings(
+            players, constants.TRANSFER_WEIGHTS, "transfer"
+        )
+        sorted_players = sort.sort_players(players)
+        squad = wildcard_optimizer.optimize_wildcard_squad(sorted_players, 95.0)
+        current_team = sort.sort_current_team(sorted_players, squad["selected_ids"])
+        bank = 100.0 - squad["total_cost"]
+        matrix = fixtures.FixtureMatrix(synthetic.synthetic_fixtures(8, seed))
+
+        for num_gws in HORIZONS:
+            full_time, full = _plan(
+                sorted_players, current_team, bank, matrix, num_gws, 60.0
+            )
+            short_time, short = _plan(
+                sorted_players, current_team, bank, matrix, num_gws, SHORT_LIMIT
+            )
+            if short["objective"] > full["objective"] + 1e-6:
+                raise AssertionError("Time-limited plan beat the optimal plan")
+            gap = short["gap"] if short["gap"] is not None else 0.0
+            print(
+                f"{seed:>4} {num_gws:>3} {full['pool_size']:>4} {full_time:>11.2f} "
+                f"{full['objective']:>7.1f} {short_time:>11.2f} "
+                f"{short['objective']:>7.1f} {gap:>6.1%} {full['hold_objective']:>7.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
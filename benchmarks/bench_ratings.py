@@ -0,0 +1,146 @@
+"""
+Micro-benchmarks for rating-engine numeric coercion, batched profiles and
+incremental re-rating.
+
+Run from the repo root:
+    python -m benchmarks.bench_ratings
+"""
+
+import time
+
+#  Local imports
+from benchmarks import synthetic
+from config import constants
+from models import player_table, ratings
+
+SIZES = [700, 10_000, 50_000]
+REPEATS = 5
+PROFILES = [1, 10, 100, 500]
+CHANGED_SHARES = [0.005, 0.02, 0.05]
+
+
+def _legacy_safe_float(v):
+    try:
+        return float(v)
+    except Exception:
+        return 0.0
+
+
+def legacy_coercion(players, attrs):
+    """Per-cell .apply(safe_float) coercion used before vectorisation."""
+    df = players.frame
+    return {col: df[col].apply(_legacy_safe_float) for col in attrs}
+
+
+def cold_rating(players, weights, mode):
+    """compute_ml_ratings with the fitted-scaler cache emptied first."""
+    ratings._rating_cache.clear()
+    ratings.compute_ml_ratings(players, weights, mode)
+
+
+def _best_of(func, *args):
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    weights = constants.TRANSFER_WEIGHTS
+    attrs = [a for a, w in weights.items() if w != 0.0]
+    print(
+        f"{'players':>8} {'apply (ms)':>11} {'vector (ms)':>12} {'speed-up':>9}"
+        f" {'full rating (ms)':>17}"
+    )
+    for size in SIZES:
+        players = synthetic.synthetic_table(size)
+        legacy = _best_of(legacy_coercion, players, attrs)
+        vector = _best_of(ratings.feature_matrix, players, attrs)
+        full = _best_of(cold_rating, players, weights, "transfer")
+        print(
+            f"{size:>8} {legacy * 1000:>11.2f} {vector * 1000:>12.2f} "
+            f"{legacy / vector:>8.1f}x {full * 1000:>17.2f}"
+        )
+
+
+def bench_profiles(num_players=700):
+    """Time rating_matrix for weight sweeps against one call per profile."""
+    import numpy as np
+
+    players = synthetic.synthetic_table(num_players)
+    attrs, base = ratings.weights_matrix([constants.TRANSFER_WEIGHTS])
+    rng = np.random.default_rng(0)
+    print(f"\n{'profiles':>8} {'looped (ms)':>12} {'batched (ms)':>13}")
+    for count in PROFILES:
+        sweep = base * rng.uniform(0.5, 1.5, size=(count, len(attrs)))
+        profiles = [dict(zip(attrs, row)) for row in sweep]
+
+        def looped():
+            for profile in profiles:
+                ratings.compute_ml_ratings(players, profile, "transfer")
+
+        batched = _best_of(ratings.rating_matrix, players, attrs, sweep, "transfer")
+        print(f"{count:>8} {_best_of(looped) * 1000:>12.2f} {batched * 1000:>13.2f}")
+
+
+def _rerate(base, updated, threshold):
+    """Rate base cold, then updated with the given incremental threshold."""
+    ratings._rating_cache.clear()
+    ratings.compute_ml_ratings(base, constants.TRANSFER_WEIGHTS, "transfer")
+    constants.RATING_INCREMENTAL_MAX_CHANGED = threshold
+    start = time.perf_counter()
+    ratings.compute_ml_ratings(updated, constants.TRANSFER_WEIGHTS, "transfer")
+    return time.perf_counter() - start, updated.frame["rating"].to_numpy().copy()
+
+
+def bench_incremental(num_players=10_000):
+    """
+    Time re-rating a newer snapshot where a share of players changed: full
+    refit (threshold 0) against the incremental transform of changed rows,
+    and how far the incremental ratings drift from the refit ones.
+    """
+    import numpy as np
+
+    teams = synthetic.synthetic_team_data()
+    elements = synthetic.synthetic_elements(num_players)
+    base = player_table.PlayerTable.from_bootstrap(elements, teams, version="v1")
+    saved = constants.RATING_INCREMENTAL_MAX_CHANGED
+    print(
+        f"\n{'changed':>8} {'refit (ms)':>11} {'incremental (ms)':>17}"
+        f" {'max diff':>9} {'same top 100':>13}"
+    )
+    try:
+        for share in CHANGED_SHARES:
+            changed = [dict(el) for el in elements]
+            for el in changed[: int(share * num_players)]:
+                el["form"] = f"{float(el['form'] or 0) + 1.5:.1f}"
+            updated = player_table.PlayerTable.from_bootstrap(
+                changed, teams, version="v2"
+            )
+            refit_time, refit = min(
+                (_rerate(base, updated, 0.0) for _ in range(REPEATS)),
+                key=lambda run: run[0],
+            )
+            incremental_time, incremental = min(
+                (_rerate(base, updated, share) for _ in range(REPEATS)),
+                key=lambda run: run[0],
+            )
+            top = 100
+            same_top = len(
+                set(np.argsort(-refit)[:top]) & set(np.argsort(-incremental)[:top])
+            )
+            print(
+                f"{share:>8.1%} {refit_time * 1000:>11.2f} "
+                f"{incremental_time * 1000:>17.2f} "
+                f"{np.abs(refit - incremental).max():>9.2f} {same_top:>13}"
+            )
+    finally:
+        constants.RATING_INCREMENTAL_MAX_CHANGED = saved
+
+
+if __name__ == "__main__":
+    main()
+    bench_profiles()
+    bench_incremental()
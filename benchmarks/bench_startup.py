@@ -0,0 +1,48 @@
+"""
+Worker boot cost: wall time and peak RSS of importing the Flask app.
+
+Run from the repo root:
+    python -m benchmarks.bench_startup
+"""
+
+import resource
+import subprocess
+import sys
+import time
+
+REPEATS = 5
+MODULES = ["pandas", "sklearn", "scipy", "openai", "pulp"]
+
+
+def boot_once():
+    """Import web in a fresh interpreter; return (seconds, peak RSS MB)."""
+    before = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import web"], check=True)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return elapsed, max(peak, before) / 1024
+
+
+def loaded_modules():
+    """Heavy libraries present in sys.modules after importing web."""
+    code = (
+        "import sys, web; "
+        f"print(' '.join(m for m in {MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    )
+    return result.stdout.strip() or "-"
+
+
+def main():
+    runs = [boot_once() for _ in range(REPEATS)]
+    best = min(seconds for seconds, _ in runs)
+    peak = max(mb for _, mb in runs)
+    print(f"import web: best {best * 1000:.0f} ms, peak RSS {peak:.0f} MB")
+    print(f"heavy modules loaded at boot: {loaded_modules()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Wildcard optimisation over every player with dominance pruning.
+
+For each synthetic table and budget, solves the default spend-floor problem
+on the legacy WILDCARD_POOL_* cut, on the full table, and on the full table
+after wildcard_optimizer._undominated. Checks the pruned pool always reaches
+the full-table optimum. Run from the repo root:
+    python -m benchmarks.bench_wildcard_pruning
+"""
+
+import time
+
+#  Local imports
+from benchmarks import synthetic
+from benchmarks.bench_wildcard_solvers import _pool
+from config import constants
+from models import ratings, sort, wildcard_optimizer
+
+BUDGETS = [80.0, 90.0, 95.0, 100.0, 105.0, 110.0]
+SEEDS = [0, 1, 2]
+NUM_PLAYERS = 700
+
+
+def _solve(model, budget):
+    """Initial solve, relaxed if infeasible; (seconds, objective or None)."""
+    start = time.perf_counter()
+    solver = wildcard_optimizer.WildcardModel(model, budget)
+    result = solver.solve(budget - constants.WILDCARD_MIN_SPEND_GAP) or solver.solve(
+        0.0
+    )
+    return time.perf_counter() - start, result["objective_score"] if result else None
+
+
+def main():
+    print(
+        f"{'seed':>4} {'budget':>6} {'kept':>9} {'capped':>16} "
+        f"{'full':>16} {'pruned':>16}"
+    )
+    for seed in SEEDS:
+        players = synthetic.synthetic_table(NUM_PLAYERS, seed)
+        players = ratings.compute_ml_ratings(players, constants.WC_WEIGHTS, "wildcard")
+        sorted_players = sort.sort_players(players)
+        capped = wildcard_optimizer._build_model(_pool(sorted_players, 1))
+        full = wildcard_optimizer._build_model(sorted_players)
+
+        for budget in BUDGETS:
+            capped_time, capped_score = _solve(capped, budget)
+            full_time, full_score = _solve(full, budget)
+
+            start = time.perf_counter()
+            kept = wildcard_optimizer._undominated(
+                full, round(wildcard_optimizer.SPEND_TOP_UP_GAP * 10)
+            )
+            pruned = wildcard_optimizer._subset_model(full, kept)
+            prune_time = time.perf_counter() - start
+            pruned_time, pruned_score = _solve(pruned, budget)
+            pruned_time += prune_time
+
+            if pruned_score != full_score:
+                raise AssertionError(
+                    f"Pruned pool missed the optimum (seed {seed}, budget {budget}): "
+                    f"{pruned_score} != {full_score}"
+                )
+            print(
+                f"{seed:>4} {budget:>6.1f} {len(kept):>4}/{len(full['ids']):<4} "
+                + " ".join(
+                    f"{score or 0:>8.2f} {seconds * 1000:>5.0f}ms"
+                    for score, seconds in (
+                        (capped_score, capped_time),
+                        (full_score, full_time),
+                        (pruned_score, pruned_time),
+                    )
+                )
+            )
+    print("The pruned pool matched the full-table optimum in every case.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Wildcard solver backends on the same candidate pools.
+
+Times every installed backend (see models.wildcard_solvers.BACKENDS) on
+synthetic pools cut like web.process_wildcard, and checks that they agree on
+the optimal objective. Run from the repo root:
+    python -m benchmarks.bench_wildcard_solvers
+"""
+
+import time
+
+#  Local imports
+from benchmarks import synthetic
+from config import constants
+from models import ratings, sort, wildcard_optimizer, wildcard_solvers
+
+# Pool size per position: the default caps and two larger cuts
+POOL_SCALES = [1, 3, 6]
+BUDGETS = [80.0, 90.0, 100.0, 110.0]
+SEEDS = [0, 1, 2]
+REPEATS = 3
+
+
+def _pool(sorted_players, scale):
+    """Top players per position, WILDCARD_POOL_* times scale."""
+    caps = {
+        "GKP": constants.WILDCARD_POOL_GKP,
+        "DEF": constants.WILDCARD_POOL_DEF,
+        "MID": constants.WILDCARD_POOL_MID,
+        "FWD": constants.WILDCARD_POOL_FWD,
+    }
+    return {pos: sorted_players[pos][: caps[pos] * scale] for pos in caps}
+
+
+def _solve(model, budget, backend):
+    """Build and solve once with the default spend floor; (seconds, objective)."""
+    start = time.perf_counter()
+    solver = wildcard_optimizer.WildcardModel(model, budget, backend)
+    result = solver.solve(budget - constants.WILDCARD_MIN_SPEND_GAP) or solver.solve(
+        0.0
+    )
+    elapsed = time.perf_counter() - start
+    return elapsed, result["objective_score"] if result else None
+
+
+def main():
+    backends = [
+        name for name, (_, available) in wildcard_solvers.BACKENDS.items() if available
+    ]
+    print(f"{'pool':>5} " + " ".join(f"{name + ' (ms)':>11}" for name in backends))
+
+    for scale in POOL_SCALES:
+        totals = dict.fromkeys(backends, 0.0)
+        runs = 0
+        for seed in SEEDS:
+            players = synthetic.synthetic_table(700, seed)
+            players = ratings.compute_ml_ratings(
+                players, constants.WC_WEIGHTS, "wildcard"
+            )
+            model = wildcard_optimizer._build_model(
+                _pool(sort.sort_players(players), scale)
+            )
+            for budget in BUDGETS:
+                objectives = {}
+                for name in backends:
+                    best = float("inf")
+                    for _ in range(REPEATS):
+                        elapsed, objectives[name] = _solve(model, budget, name)
+                        best = min(best, elapsed)
+                    totals[name] += best
+                if len(set(objectives.values())) > 1:
+                    raise AssertionError(
+                        f"Backends disagree (seed {seed}, budget {budget}): "
+                        f"{objectives}"
+                    )
+                runs += 1
+        print(
+            f"{len(model['ids']):>5} "
+            + " ".join(f"{totals[name] / runs * 1000:>11.1f}" for name in backends)
+        )
+    print("All backends found the same optimal objective.")
+
+
+if __name__ == "__main__":
+    main()
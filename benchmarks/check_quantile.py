@@ -0,0 +1,65 @@
+"""
+Check UniformQuantileScaler against scikit-learn's QuantileTransformer.
+
+This is a manual check, not part of any test run. scikit-learn is not a
+runtime dependency, so install it first; the check exits non-zero when it
+is missing or when any case differs by more than 1e-12:
+    pip install scikit-learn
+    python -m benchmarks.check_quantile
+"""
+
+import sys
+import time
+import warnings
+
+import numpy as np
+
+#  Local imports
+from models.quantile import UniformQuantileScaler
+
+# (samples, n_quantiles, subsample): small, FPL-sized, subsampled, tiny
+CASES = [(5, 200, 50_000), (700, 200, 50_000), (300, 10, 100), (60_000, 200, 50_000)]
+
+
+def _features(rng, num_rows):
+    """Rounded skewed data with a constant column, ties and NaNs."""
+    X = np.round(rng.exponential(3, (num_rows, 8)), 1)
+    X[:, 0] = 0.0
+    X[::7, 2] = np.nan
+    return X
+
+
+def main():
+    try:
+        from sklearn.preprocessing import QuantileTransformer
+    except ImportError:
+        sys.exit("scikit-learn is not installed; nothing to compare against.")
+
+    rng = np.random.default_rng(0)
+    print(f"{'samples':>8} {'max |diff|':>11} {'sklearn (ms)':>13} {'numpy (ms)':>11}")
+    for num_rows, n_quantiles, subsample in CASES:
+        X = _features(rng, num_rows)
+        unseen = _features(rng, 50)
+        params = dict(n_quantiles=min(n_quantiles, num_rows), subsample=subsample)
+
+        start = time.perf_counter()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            reference = QuantileTransformer(random_state=0, **params).fit(X)
+            expected = reference.transform(X), reference.transform(unseen)
+        sklearn_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        scaler = UniformQuantileScaler(random_state=0, **params).fit(X)
+        actual = scaler.transform(X), scaler.transform(unseen)
+        numpy_ms = (time.perf_counter() - start) * 1000
+
+        diff = max(np.nanmax(np.abs(a - e)) for a, e in zip(actual, expected))
+        for a, e in zip(actual, expected):
+            np.testing.assert_allclose(a, e, rtol=0, atol=1e-12)
+        print(f"{num_rows:>8} {diff:>11.2e} {sklearn_ms:>13.2f} {numpy_ms:>11.2f}")
+    print("UniformQuantileScaler matches QuantileTransformer.")
+
+
+if __name__ == "__main__":
+    main()
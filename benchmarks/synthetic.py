@@ -0,0 +1,116 @@
+import numpy as np
+
+#  Local imports
+from models import player_table
+
+NUM_TEAMS = 20
+
+
+def synthetic_elements(num_players, seed=0):
+    """
+    Generate bootstrap-like element dicts for benchmarking.
+    Values mimic the API: counts as ints, rates as "4.5" strings, and a share of
+    "" / None cells so coercion paths are exercised.
+    Args:
+        num_players: num of players to generate
+        seed: int RNG seed
+    Returns:
+        list: element dicts with every player_table.ELEMENT_FIELDS key
+    """
+    rng = np.random.default_rng(seed)
+    element_type = rng.choice([1, 2, 3, 4], size=num_players, p=[0.1, 0.35, 0.4, 0.15])
+    base_cost = np.array([0, 40, 40, 45, 45])[element_type]
+    now_cost = base_cost + rng.integers(0, 60, size=num_players)
+    chance = rng.choice([None, None, None, 100, 75, 50, 0], size=num_players)
+
+    elements = []
+    for i in range(num_players):
+        el = {
+            "id": i + 1,
+            "web_name": f"Player{i + 1}",
+            "element_type": int(element_type[i]),
+            "team": int(rng.integers(1, NUM_TEAMS + 1)),
+            "now_cost": int(now_cost[i]),
+            "status": str(rng.choice(list("aaaaaaadi"))),
+            "chance_of_playing_next_round": chance[i],
+            "news": "",
+        }
+        for field in player_table.ELEMENT_FIELDS:
+            if field in el:
+                continue
+            roll = rng.random()
+            if roll < 0.02:
+                el[field] = ""
+            elif roll < 0.03:
+                el[field] = None
+            elif roll < 0.5:
+                el[field] = int(rng.integers(0, 200))
+            else:
+                el[field] = f"{rng.uniform(0, 90):.1f}"
+        elements.append(el)
+    return elements
+
+
+def synthetic_team_data(seed=0):
+    """
+    Generate team_stats-like team data for benchmarking.
+    Args:
+        seed: int RNG seed
+    Returns:
+        dict: {team_id: {"name": str, "strength": int, "fix_diff": float}}
+    """
+    rng = np.random.default_rng(seed)
+    return {
+        t: {
+            "name": f"T{t:02d}",
+            "strength": int(rng.integers(2, 6)),
+            "fix_diff": float(rng.uniform(2, 4)),
+        }
+        for t in range(1, NUM_TEAMS + 1)
+    }
+
+
+def synthetic_table(num_players, seed=0):
+    """
+    Build a PlayerTable of num_players synthetic players.
+    Args:
+        num_players: num of players to generate
+        seed: int RNG seed
+    Returns:
+        PlayerTable: synthetic player table
+    """
+    return player_table.PlayerTable.from_bootstrap(
+        synthetic_elements(num_players, seed), synthetic_team_data(seed)
+    )
+
+
+def synthetic_fixtures(num_gws, seed=0):
+    """
+    Generate a fixtures-endpoint-like list with blanks and doubles.
+    Args:
+        num_gws: num of gameweeks to generate (starting at GW 1)
+        seed: int RNG seed
+    Returns:
+        list: fixture dicts with the fields fixtures.FixtureMatrix reads
+    """
+    rng = np.random.default_rng(seed)
+    fixture_list = []
+    for gw in range(1, num_gws + 1):
+        teams = rng.permutation(np.arange(1, NUM_TEAMS + 1))
+        # Occasionally one pair blanks and another plays twice
+        pairs = teams.reshape(-1, 2).tolist()
+        if rng.random() < 0.3:
+            pairs = pairs[1:] + [pairs[-1]]
+        for home, away in pairs:
+            fixture_list.append(
+                {
+                    "event": gw,
+                    "team_h": int(home),
+                    "team_a": int(away),
+                    "team_h_difficulty": int(rng.integers(2, 6)),
+                    "team_a_difficulty": int(rng.integers(2, 6)),
+                    "kickoff_time": f"2025-01-{gw:02d}T15:00:00Z",
+                    "finished": False,
+                }
+            )
+    return fixture_list
@@ -0,0 +1,110 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+#  Local imports
+from config import constants, fpl_api, settings
+
+_executor = ThreadPoolExecutor(
+    max_workers=constants.FPL_POOL_SIZE, thread_name_prefix="fpl-fetch"
+)
+
+
+@dataclass
+class AnalysisData:
+    """
+    Everything run_analysis needs from the FPL API, fetched in one stage.
+    Args:
+        bootstrap: json of all the FPL bootstrap data
+        fixtures: json of all the FPL fixture data
+        bootstrap_version: snapshot version of bootstrap
+        fixtures_version: snapshot version of fixtures
+        gw_current: num of current game week
+        next_event: dict of next gameweek event data
+        bank: num of current team bank in millions
+        picks_pids: list of current team player ids
+        timings: dict of fetch name -> seconds taken
+    """
+
+    bootstrap: Any
+    fixtures: Any
+    bootstrap_version: str
+    fixtures_version: str
+    gw_current: int
+    next_event: Dict[str, Any]
+    bank: float
+    picks_pids: List[int]
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+def _timed(timings, name, func, *args, **kwargs):
+    """Run func and record its wall time under name."""
+    start = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        timings[name] = round(time.perf_counter() - start, 3)
+
+
+def _result(future, name, deadline):
+    """Wait for future until the shared deadline, naming the fetch on timeout."""
+    try:
+        return future.result(timeout=max(0.0, deadline - time.monotonic()))
+    except FutureTimeout:
+        future.cancel()
+        raise TimeoutError(f"FPL {name} request timed out") from None
+
+
+def acquire_analysis_data(team_id=None, timeout=None):
+    """
+    Fetch bootstrap, fixtures and picks concurrently.
+    Fixtures never depend on bootstrap, and picks only need the current GW, so
+    picks are requested straight away for the GW in the last cached bootstrap
+    snapshot and only re-requested if the fresh bootstrap disagrees.
+    Args:
+        team_id: FPL team id (default = constants.TEAM_ID)
+        timeout: max seconds for the whole stage (default = FPL_ACQUIRE_TIMEOUT)
+    Returns:
+        AnalysisData: typed bundle of all fetched data
+    """
+    deadline = time.monotonic() + (timeout or constants.FPL_ACQUIRE_TIMEOUT)
+    timings = {}
+
+    bootstrap_future = _executor.submit(
+        _timed, timings, "bootstrap", settings.fetch_bootstrap_snapshot
+    )
+    fixtures_future = _executor.submit(
+        _timed, timings, "fixtures", settings.fetch_fixture_snapshot
+    )
+
+    picks_future = None
+    guessed_gw = None
+    cached_bootstrap = fpl_api.get_client().cached("bootstrap")
+    if cached_bootstrap is not None:
+        guessed_gw = settings.get_current_gameweek(cached_bootstrap.data)
+        picks_future = _executor.submit(
+            _timed, timings, "picks", settings.my_picks, guessed_gw, team_id
+        )
+
+    bootstrap = _result(bootstrap_future, "bootstrap", deadline)
+    gw_current = settings.get_current_gameweek(bootstrap.data)
+    if picks_future is None or guessed_gw != gw_current:
+        picks_future = _executor.submit(
+            _timed, timings, "picks", settings.my_picks, gw_current, team_id
+        )
+
+    fixtures = _result(fixtures_future, "fixtures", deadline)
+    bank, picks_pids = _result(picks_future, "picks", deadline)
+
+    return AnalysisData(
+        bootstrap=bootstrap.data,
+        fixtures=fixtures.data,
+        bootstrap_version=bootstrap.version,
+        fixtures_version=fixtures.version,
+        gw_current=gw_current,
+        next_event=settings.get_next_gameweek_event(bootstrap.data),
+        bank=bank,
+        picks_pids=picks_pids,
+        timings=timings,
+    )
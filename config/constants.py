@@ -3,6 +3,7 @@ import os
 # --- Global Constants ---
 BOOTSTRAP_URL = "https://fantasy.premierleague.com/api/bootstrap-static/"
 FIXTURE_URL = "https://fantasy.premierleague.com/api/fixtures/"
+ENTRY_URL = "https://fantasy.premierleague.com/api/entry"
 POS_MAP = {1: "GKP", 2: "DEF", 3: "MID", 4: "FWD"}
 STATUS_MAP = {
     "a": "available",
@@ -15,16 +16,122 @@ STATUS_MAP = {
 TEAM_ID = os.getenv("FPL_TEAM_ID")
 
 
+# --- FPL API client ---
+FPL_CACHE_DIR = os.getenv("FPL_CACHE_DIR", "cache")
+FPL_TIMEOUT = 15  # seconds per request
+FPL_ACQUIRE_TIMEOUT = 30  # seconds for the whole concurrent fetch stage
+FPL_POOL_SIZE = 8  # keep-alive connections per host
+FPL_SNAPSHOT_KEEP = 3  # on-disk versions kept per snapshot
+FPL_USER_AGENT = "FPLGaffer/1.0"
+
+# --- Rating engine ---
+# Tie-break jitter before quantile scaling: "hash" (deterministic per player
+# and attribute) or "random" (unseeded, ratings vary between runs).
+RATING_TIE_BREAK = os.getenv("RATING_TIE_BREAK", "hash")
+# Re-rate incrementally (reuse the fitted quantile scaler) when at most this
+# share of players' features changed since the cached fit; otherwise refit.
+# At 2% the incremental path is about twice as fast, moves ratings by at most
+# 0.03 and keeps the same top 100 (python -m benchmarks.bench_ratings).
+# Set to 0 to refit on every change.
+RATING_INCREMENTAL_MAX_CHANGED = float(
+    os.getenv("RATING_INCREMENTAL_MAX_CHANGED", "0.02")
+)
+
+# --- Transfer planner ---
+TRANSFER_PLAN_MAX_TRANSFERS = 3  # largest plan searched
+TRANSFER_PLAN_FREE_TRANSFERS = 1  # transfers before hits apply
+TRANSFER_PLAN_COUNT = 5  # plans kept per transfer count
+TRANSFER_PLAN_DEPTH = 8  # incoming players kept per position and price level
+TRANSFER_PLAN_TIME_LIMIT = 2.0  # seconds for the whole search
+TRANSFER_HIT_POINTS = 4  # FPL points per extra transfer
+TRANSFER_HIT_RATING = 10.0  # rating gain an extra transfer must beat
+
+# --- Transfer horizon (multi-gameweek MILP) ---
+HORIZON_GAMEWEEKS = 5  # gameweeks planned from the next deadline
+HORIZON_TIME_LIMIT = 5.0  # seconds for build + solve; best incumbent after that
+HORIZON_MIP_GAP = 0.005  # relative gap at which HiGHS stops early
+HORIZON_MAX_FREE_TRANSFERS = 5  # free transfers that can be banked
+HORIZON_DECAY = 0.9  # weight of each later gameweek relative to the one before
+HORIZON_BENCH_WEIGHT = 0.1  # share of bench players' projected points counted
+HORIZON_FORM_WEIGHT = 0.5  # form vs points per game in the per-fixture base
+HORIZON_FDR_WEIGHT = 0.1  # points scale per difficulty step from neutral (3)
+# Incoming candidates per position by projected points, plus the best
+# HORIZON_VALUE_POOL by points per £m
+HORIZON_POOL_GKP = 6
+HORIZON_POOL_DEF = 20
+HORIZON_POOL_MID = 20
+HORIZON_POOL_FWD = 12
+HORIZON_VALUE_POOL = 4
+
+
 # --- AI setup ---
 ZEN_API_KEY = os.getenv("ZEN_API_KEY")
 AI_BASE_URL = "https://opencode.ai/zen/v1"
 AI_MODEL = "gpt-5.4"
+AI_TEMPERATURE = 0.3
+AI_MAX_OUTPUT_TOKENS = 600
+# Input token budgets for the compact prompt payloads (ai/prompt_builder.py);
+# the lowest-value candidates are dropped first to fit
+AI_TRANSFER_TOKEN_BUDGET = 4000
+AI_WILDCARD_TOKEN_BUDGET = 4000
+AI_EXPLAIN_TOKEN_BUDGET = 1500
+# Identical AI calls (model, system prompt, payload, temperature) are served
+# from an on-disk LRU cache shared by all workers
+AI_CACHE_ENABLED = os.getenv("AI_CACHE_ENABLED", "1") != "0"
+AI_CACHE_DIR = os.getenv("AI_CACHE_DIR", os.path.join(FPL_CACHE_DIR, "ai"))
+AI_CACHE_TTL = 6 * 3600  # seconds; well inside one gameweek
+AI_CACHE_MAX_ENTRIES = 200
+# Which endpoint (Responses or Chat Completions) works per base URL and
+# model is remembered in a file shared by all workers; the preferred one is
+# re-probed once the entry is this old
+AI_ENDPOINT_MEMO_PATH = os.path.join(FPL_CACHE_DIR, "ai_endpoints.json")
+AI_ENDPOINT_REPROBE_AFTER = 24 * 3600  # seconds
+# Seconds per AI request on each endpoint, and SDK retries per request
+AI_RESPONSES_TIMEOUT = float(os.getenv("AI_RESPONSES_TIMEOUT", "45"))
+AI_CHAT_TIMEOUT = float(os.getenv("AI_CHAT_TIMEOUT", "45"))
+AI_CONNECT_TIMEOUT = 5.0
+AI_MAX_RETRIES = 1
+# Web reports: the AI text streams into a sidecar next to the report
+# (reports/<name>.txt.ai); the report page polls it through short requests
+# to any worker, every AI_STREAM_POLL_SECONDS for at most
+# AI_STREAM_MAX_SECONDS. A sidecar not written for AI_STREAM_STALL_SECONDS
+# is treated as finished
+AI_STREAM_SUFFIX = ".ai"
+AI_STREAM_POLL_SECONDS = 0.5
+AI_STREAM_MAX_SECONDS = 300
+AI_STREAM_STALL_SECONDS = 180
 AI_PROMPT = ""
 WILDCARD_MIN_SPEND_GAP = 2.0
+# Top players per position listed in the wildcard report (the optimizer
+# considers every player)
 WILDCARD_POOL_GKP = 10
 WILDCARD_POOL_DEF = 30
 WILDCARD_POOL_MID = 30
 WILDCARD_POOL_FWD = 20
+# Wildcard solver backend: "highs" (in-process, SciPy), "cbc" (PuLP),
+# "bnb" (NumPy branch and bound, no extra dependency) or "auto" for the
+# first of those that is installed.
+WILDCARD_SOLVER = os.getenv("WILDCARD_SOLVER", "auto")
+# Per-solve limits: a solve stops at the time limit or once its squad is
+# within the relative gap of the bound, and returns the best squad found
+WILDCARD_SOLVER_TIME_LIMIT = float(os.getenv("WILDCARD_SOLVER_TIME_LIMIT", "10"))
+WILDCARD_SOLVER_GAP = float(os.getenv("WILDCARD_SOLVER_GAP", "0"))
+# Next-best wildcard squads listed after the optimum, and the minimum Hamming
+# distance between any two listed squads (2 per swapped player)
+WILDCARD_ALTERNATIVES = 3
+WILDCARD_ALT_MIN_DISTANCE = 2
+# Top excluded wildcard players explained by forcing each into the squad,
+# re-solved in this many threads within this many seconds in total
+WILDCARD_EXCLUSION_COUNT = 5
+WILDCARD_EXCLUSION_WORKERS = 4
+WILDCARD_EXCLUSION_TIME_LIMIT = 3.0
+# Budget sweep: budgets from the team value up to this much more, per step,
+# solved in this many spawned worker processes (1 = in the web worker)
+WILDCARD_SWEEP_MAX_EXTRA = 3.0
+WILDCARD_SWEEP_STEP = 0.5
+WILDCARD_SWEEP_WORKERS = int(
+    os.getenv("WILDCARD_SWEEP_WORKERS", min(4, os.cpu_count() or 1))
+)
 
 
 # Global weights for all numeric keys in player dict.
@@ -0,0 +1,273 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+#  Local imports
+from config import constants
+from utils import file_handlers
+
+
+@dataclass
+class Snapshot:
+    """
+    Parsed FPL API payload plus the metadata needed to revalidate it.
+    Args:
+        name: snapshot store key (e.g. "bootstrap", "fixtures")
+        data: parsed json payload (shared, treat as read-only)
+        version: short content hash of the raw payload
+        fetched_at: unix time of the last successful download or revalidation
+        etag: ETag header returned by the API
+        last_modified: Last-Modified header returned by the API
+        url: url the payload was fetched from
+        source: "network" (200), "revalidated" (304), "disk" (not yet
+            revalidated this process) or "stale" (network error)
+    """
+
+    name: str
+    data: Any
+    version: str
+    fetched_at: float
+    etag: str = ""
+    last_modified: str = ""
+    url: str = ""
+    source: str = field(default="network", compare=False)
+
+
+def _content_version(body):
+    """Short, stable version id for a raw payload."""
+    return hashlib.sha1(body).hexdigest()[:12]
+
+
+class FPLClient:
+    """
+    Pooled FPL API client with conditional revalidation and a versioned on-disk
+    snapshot store.
+
+    Each named snapshot is stored as <name>-<version>.json next to a
+    <name>.meta.json pointer holding the current version, ETag and
+    Last-Modified. Repeat fetches send If-None-Match / If-Modified-Since, so an
+    unchanged payload costs a 304 round-trip and reuses the already parsed data.
+    A name fetched from a new url (e.g. a team's picks for the next gameweek)
+    replaces its old snapshot, so the store holds one snapshot per name.
+    """
+
+    def __init__(self, cache_dir=None, timeout=None, pool_size=None):
+        self.cache_dir = cache_dir or constants.FPL_CACHE_DIR
+        self.timeout = timeout or constants.FPL_TIMEOUT
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": constants.FPL_USER_AGENT})
+        adapter = HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=pool_size or constants.FPL_POOL_SIZE,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.3,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=frozenset(["GET"]),
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._memory = {}
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    # ----- Snapshot store -----
+    def _meta_path(self, name):
+        return os.path.join(self.cache_dir, f"{name}.meta.json")
+
+    def _body_path(self, name, version):
+        return os.path.join(self.cache_dir, f"{name}-{version}.json")
+
+    def _lock_for(self, name):
+        with self._locks_guard:
+            return self._locks.setdefault(name, threading.Lock())
+
+    def _read_meta(self, name):
+        try:
+            with open(self._meta_path(name), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _load_from_disk(self, name):
+        """Load the current on-disk snapshot for name, or None if missing."""
+        meta = self._read_meta(name)
+        if not meta:
+            return None
+        try:
+            with open(self._body_path(name, meta["version"]), "rb") as f:
+                data = json.loads(f.read())
+        except (OSError, ValueError, KeyError):
+            return None
+        return Snapshot(
+            name=name,
+            data=data,
+            version=meta["version"],
+            fetched_at=meta.get("fetched_at", 0.0),
+            etag=meta.get("etag", ""),
+            last_modified=meta.get("last_modified", ""),
+            url=meta.get("url", ""),
+            source="disk",
+        )
+
+    def _store(self, snapshot, body=None):
+        """Persist snapshot metadata (and body for new versions) atomically."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            if body is not None:
+                body_path = self._body_path(snapshot.name, snapshot.version)
+                file_handlers.atomic_write(body_path, body)
+            meta = {
+                "version": snapshot.version,
+                "fetched_at": snapshot.fetched_at,
+                "etag": snapshot.etag,
+                "last_modified": snapshot.last_modified,
+                "url": snapshot.url,
+            }
+            file_handlers.atomic_write(
+                self._meta_path(snapshot.name), json.dumps(meta).encode("utf-8")
+            )
+            if body is not None:
+                self._prune_versions(snapshot.name, keep=snapshot.version)
+        except OSError:
+            pass  # a read-only cache dir only costs us the next conditional GET
+
+    def _prune_versions(self, name, keep):
+        """Remove old snapshot bodies beyond constants.FPL_SNAPSHOT_KEEP."""
+        prefix = f"{name}-"
+        bodies = []
+        for f in os.listdir(self.cache_dir):
+            if f.startswith(prefix) and f.endswith(".json"):
+                path = os.path.join(self.cache_dir, f)
+                bodies.append((os.path.getmtime(path), f, path))
+        bodies.sort(reverse=True)
+        for _, f, path in bodies[constants.FPL_SNAPSHOT_KEEP :]:
+            if f != f"{prefix}{keep}.json":
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    # ----- Fetching -----
+    def cached(self, name):
+        """
+        Return the last known snapshot for name without touching the network.
+        Args:
+            name: snapshot store key
+        Returns:
+            Snapshot or None if nothing has been fetched yet
+        """
+        snapshot = self._memory.get(name)
+        if snapshot is None:
+            snapshot = self._load_from_disk(name)
+            if snapshot is not None:
+                self._memory[name] = snapshot
+        return snapshot
+
+    def fetch(self, name, url, timeout=None):
+        """
+        Fetch url as snapshot name, revalidating any cached copy.
+        Args:
+            name: snapshot store key
+            url: FPL API url
+            timeout: request timeout in seconds (default = client timeout)
+        Returns:
+            Snapshot: fresh, revalidated or (on network error) stale snapshot
+        """
+        with self._lock_for(name):
+            cached = self.cached(name)
+            if cached is not None and cached.url != url:
+                cached = None  # a different payload under the same name
+            headers = {}
+            if cached is not None:
+                if cached.etag:
+                    headers["If-None-Match"] = cached.etag
+                if cached.last_modified:
+                    headers["If-Modified-Since"] = cached.last_modified
+
+            try:
+                response = self.session.get(
+                    url, headers=headers, timeout=timeout or self.timeout
+                )
+                if response.status_code == 304 and cached is not None:
+                    snapshot = Snapshot(
+                        name=name,
+                        data=cached.data,
+                        version=cached.version,
+                        fetched_at=time.time(),
+                        etag=response.headers.get("ETag", cached.etag),
+                        last_modified=response.headers.get(
+                            "Last-Modified", cached.last_modified
+                        ),
+                        url=url,
+                        source="revalidated",
+                    )
+                    self._memory[name] = snapshot
+                    self._store(snapshot)
+                    return snapshot
+                response.raise_for_status()  # Stops code if error in response
+            except requests.RequestException:
+                if cached is None:
+                    raise
+                return replace(cached, source="stale")
+
+            body = response.content
+            version = _content_version(body)
+            if cached is not None and cached.version == version:
+                data = cached.data  # server ignored validators, skip the parse
+            else:
+                data = json.loads(body)
+            snapshot = Snapshot(
+                name=name,
+                data=data,
+                version=version,
+                fetched_at=time.time(),
+                etag=response.headers.get("ETag", ""),
+                last_modified=response.headers.get("Last-Modified", ""),
+                url=url,
+                source="network",
+            )
+            self._memory[name] = snapshot
+            self._store(snapshot, body)
+            return snapshot
+
+    def get_json(self, name, url, timeout=None):
+        """
+        Fetch url and return only the parsed payload.
+        Args:
+            name: snapshot store key
+            url: FPL API url
+            timeout: request timeout in seconds (default = client timeout)
+        Returns:
+            parsed json payload
+        """
+        return self.fetch(name, url, timeout=timeout).data
+
+
+_client = None
+_client_guard = threading.Lock()
+
+
+def get_client():
+    """
+    Return the process-wide FPL client, creating it on first use.
+    Args:
+        None
+    Returns:
+        FPLClient: shared client instance
+    """
+    global _client
+    if _client is None:
+        with _client_guard:
+            if _client is None:
+                _client = FPLClient()
+    return _client
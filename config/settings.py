@@ -1,10 +1,8 @@
 import sys
-import requests
-import statistics
-from openai import OpenAI
 
 #  Local imports
-from config import constants
+from config import constants, fpl_api
+from models import fixtures, player_table
 
 
 def validate_team_id():
@@ -38,7 +36,20 @@ def ai_client():
     print("AI API KEY STATUS")
     print("=" * 60)
     if constants.ZEN_API_KEY:
-        client = OpenAI(base_url=constants.AI_BASE_URL, api_key=constants.ZEN_API_KEY)
+        # Imported on first use so workers do not pay for it at boot
+        from openai import OpenAI, Timeout
+
+        # Explicit timeouts and retries; each request also sets the timeout
+        # of its endpoint (ai/ai_advisor.py)
+        client = OpenAI(
+            base_url=constants.AI_BASE_URL,
+            api_key=constants.ZEN_API_KEY,
+            timeout=Timeout(
+                max(constants.AI_RESPONSES_TIMEOUT, constants.AI_CHAT_TIMEOUT),
+                connect=constants.AI_CONNECT_TIMEOUT,
+            ),
+            max_retries=constants.AI_MAX_RETRIES,
+        )
         print("ZEN API key available")
     else:
         client = None
@@ -48,15 +59,31 @@ def ai_client():
     return API_KEY, client
 
 
+def fetch_fixture_snapshot():
+    """
+    Fetch (or revalidate) the fixture snapshot from FPL API.
+    Returns:
+        Snapshot: fixture data plus its version and cache metadata
+    """
+    return fpl_api.get_client().fetch("fixtures", constants.FIXTURE_URL)
+
+
+def fetch_bootstrap_snapshot():
+    """
+    Fetch (or revalidate) the bootstrap snapshot from FPL API.
+    Returns:
+        Snapshot: bootstrap data plus its version and cache metadata
+    """
+    return fpl_api.get_client().fetch("bootstrap", constants.BOOTSTRAP_URL)
+
+
 def fetch_fixture_data():
     """
     "Fetch fixture data from FPL API.
     Returns:
         response: json of all FPL fixture data
     """
-    response = requests.get(constants.FIXTURE_URL)
-    response.raise_for_status()  # Stops code if error in response
-    return response.json()
+    return fetch_fixture_snapshot().data
 
 
 def fetch_bootstrap_data():
@@ -65,124 +92,58 @@ def fetch_bootstrap_data():
     Returns:
         response: json of all FPL bootstrap data
     """
-    response = requests.get(constants.BOOTSTRAP_URL)
-    response.raise_for_status()  # Stops code if error in response
-    return response.json()
+    return fetch_bootstrap_snapshot().data
 
 
-def team_stats(bootstrap_data, fixture_data, num_fix=3):
+def team_stats(bootstrap_data, fixture_data, num_fix=3, fixture_version=None):
     """
     Pre-calculate fixture difficulties for all teams to avoid repeated calculations.
     Args:
         bootstrap_data: json of all the FPL bootstrap data (fetch_bootstrap_data)
         fixture_data: json of all the FPL fixture data (fetch_fixture_data)
         num_fix: num of fixtures to assess (default = 3)
+        fixture_version: fixture snapshot version, used to reuse the matrix
     Returns:
         dict: {team_id: {"name": str, "strength": int, "fix_diff": float}}
     """
-    team_data = {}
-    # Initialize with team names and strengths
-    for team in bootstrap_data["teams"]:
-        team_id = team["id"]
-        team_data[team_id] = {"name": team["short_name"], "strength": team["strength"]}
-    # Calculate fixture difficulties for each team
-    for team_id in team_data.keys():
-        team_fixtures = []
-        for fixture in fixture_data:
-            if (
-                fixture["team_h"] == team_id or fixture["team_a"] == team_id
-            ) and not fixture["finished"]:
-                team_fixtures.append(fixture)
-        # Sort by kickoff time and take next N fixtures
-        team_fixtures.sort(key=lambda x: x["kickoff_time"] or "")
-        next_fixtures = team_fixtures[:num_fix]
-        # Calculate average difficulty
-        difficulties = []
-        for fixture in next_fixtures:
-            if fixture["team_h"] == team_id:
-                difficulties.append(fixture["team_h_difficulty"])
-            else:
-                difficulties.append(fixture["team_a_difficulty"])
-        team_data[team_id]["fix_diff"] = (
-            statistics.mean(difficulties) if difficulties else 2.5
-        )
-    return team_data
-
-
-def safe_chance(v):
-    """
-    Convert chance of playing value to safe float.
-    Args:
-        v: value representing chance of playing (can be None, string, or number)
-    Returns:
-        float: safe float value (100.0 default for missing/invalid values)
-    """
-    if v in [None, "None", ""]:
-        return float(100)  # assume 100% if missing
-    try:
-        return float(v)
-    except Exception:
-        return 100.0  # fallback
+    matrix = fixtures.get_fixture_matrix(fixture_data, fixture_version)
+    team_ids = [team["id"] for team in bootstrap_data["teams"]]
+    fix_diffs = matrix.next_fixtures_difficulty(team_ids, num_fix)
+    return {
+        team["id"]: {
+            "name": team["short_name"],
+            "strength": team["strength"],
+            "fix_diff": float(fix_diff),
+        }
+        for team, fix_diff in zip(bootstrap_data["teams"], fix_diffs)
+    }
 
 
-def format_all_players(bootstrap_data):
+def format_all_players(
+    bootstrap_data, fixture_data=None, fixture_version=None, bootstrap_version=None
+):
     """
     Format all player data with team statistics.
     Args:
         bootstrap_data: json of all the FPL bootstrap data (fetch_bootstrap_data)
+        fixture_data: json of all the FPL fixture data (fetched if not given)
+        fixture_version: fixture snapshot version, used to reuse the matrix
+        bootstrap_version: bootstrap snapshot version, used to reuse ratings
     Returns:
-        player: List of player dict with team stats
-    """
-    fixture_data = fetch_fixture_data()
-    team_data = team_stats(bootstrap_data, fixture_data)
-    players = []
-    for el in bootstrap_data["elements"]:
-        team_id = el.get("team")
-        team_info = team_data.get(team_id, {"name": "", "strength": 0, "fix_diff": 2.5})
-        player = {
-            "web_name": el.get("web_name", ""),
-            "element_type": el.get("element_type", ""),
-            "id": el.get("id", ""),
-            "now_cost": el.get("now_cost", ""),
-            "team_name": team_info["name"],
-            "team_strength": team_info["strength"],
-            "team_fix_dif": team_info["fix_diff"],
-            "status": el.get("status", ""),
-            "chance_of_playing_next_round": safe_chance(
-                el.get("chance_of_playing_next_round")
-            ),
-            "news": el.get("news", ""),
-            "minutes": el.get("minutes", ""),
-            "goals_scored": el.get("goals_scored", ""),
-            "assists": el.get("assists", ""),
-            "bonus": el.get("bonus", ""),
-            "bps": el.get("bps", ""),
-            "total_points": el.get("total_points", ""),
-            "points_per_game": el.get("points_per_game", ""),
-            "form": el.get("form", ""),
-            "ep_next": el.get("ep_next", ""),
-            "value_form": el.get("value_form", ""),
-            "value_season": el.get("value_season", ""),
-            "expected_goals": el.get("expected_goals", ""),
-            "expected_assists": el.get("expected_assists", ""),
-            "expected_goal_involvements": el.get("expected_goal_involvements", ""),
-            "ict_index": el.get("ict_index", ""),
-            "influence": el.get("influence", ""),
-            "creativity": el.get("creativity", ""),
-            "threat": el.get("threat", ""),
-            "clean_sheets": el.get("clean_sheets", ""),
-            "saves": el.get("saves", ""),
-            "penalties_saved": el.get("penalties_saved", ""),
-            "goals_conceded": el.get("goals_conceded", ""),
-            "expected_goals_conceded": el.get("expected_goals_conceded", ""),
-            "expected_goal_involvements_per_90": el.get(
-                "expected_goal_involvements_per_90", ""
-            ),
-            "clean_sheets_per_90": el.get("clean_sheets_per_90", ""),
-            "selected_by_percent": el.get("selected_by_percent", ""),
-        }
-        players.append(player)
-    return players
+        PlayerTable: columnar table of all players with team stats
+    """
+    if fixture_data is None:
+        snapshot = fetch_fixture_snapshot()
+        fixture_data, fixture_version = snapshot.data, snapshot.version
+    team_data = team_stats(
+        bootstrap_data, fixture_data, fixture_version=fixture_version
+    )
+    version = None
+    if bootstrap_version is not None and fixture_version is not None:
+        version = (bootstrap_version, fixture_version)
+    return player_table.PlayerTable.from_bootstrap(
+        bootstrap_data["elements"], team_data, version
+    )
 
 
 def get_current_gameweek(bootstrap_data):
@@ -225,20 +186,20 @@ def get_next_gameweek_event(bootstrap_data):
     return {"id": current_gw}
 
 
-def my_picks(gw):
+def my_picks(gw, team_id=None):
     """
     Get user's current team picks for a given gameweek.
     Args:
         gw: num of current game week (get_current_gameweek)
+        team_id: FPL team id (default = constants.TEAM_ID)
     Ruturns:
         bank: num of current team bank in millions
         pick_pids: List of current team players ids
     """
-    base_url = "https://fantasy.premierleague.com/api/entry"
-    squad_url = f"{base_url}/{constants.TEAM_ID}/event/{gw}/picks/"
-    response = requests.get(squad_url)
-    response.raise_for_status()
-    picks = response.json()
+    team_id = team_id or constants.TEAM_ID
+    squad_url = f"{constants.ENTRY_URL}/{team_id}/event/{gw}/picks/"
+    # One snapshot per team; a new gameweek's url replaces the last one
+    picks = fpl_api.get_client().get_json(f"picks_{team_id}", squad_url)
     bank = picks.get("entry_history", {}).get("bank", 0) / 10.0  # Convert to millions
     picks_pids = [el.get("element") for el in picks.get("picks", [])]
     return bank, picks_pids
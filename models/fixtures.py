@@ -0,0 +1,185 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_DIFFICULTY = 2.5
+_UNSCHEDULED_KICKOFF = "~"  # sorts after any ISO timestamp
+_MATRIX_CACHE_SIZE = 2
+
+_matrix_cache = OrderedDict()
+_matrix_cache_lock = threading.Lock()
+
+
+class FixtureMatrix:
+    """
+    Precomputed team x gameweek fixture difficulty for all unfinished fixtures.
+
+    Built in one pass over the fixture list. Gameweek data is held as
+    prefix sums over the gameweek axis, so any horizon, home/away split or
+    blank/double gameweek count is a constant-time slice. Upcoming fixtures are
+    also kept in kickoff order per team for "next N fixtures" averages.
+    """
+
+    def __init__(self, fixture_data):
+        upcoming = [f for f in fixture_data if not f.get("finished")]
+        n = len(upcoming)
+
+        # Two rows per fixture: the home side and the away side
+        teams = np.empty(2 * n, dtype=np.int64)
+        events = np.zeros(2 * n, dtype=np.int64)
+        difficulty = np.empty(2 * n, dtype=float)
+        is_home = np.zeros(2 * n, dtype=bool)
+        kickoff = [_UNSCHEDULED_KICKOFF] * (2 * n)
+        for i, fixture in enumerate(upcoming):
+            h, a = 2 * i, 2 * i + 1
+            teams[h], teams[a] = fixture["team_h"], fixture["team_a"]
+            difficulty[h] = fixture["team_h_difficulty"]
+            difficulty[a] = fixture["team_a_difficulty"]
+            is_home[h] = True
+            events[h] = events[a] = fixture.get("event") or 0
+            kickoff[h] = kickoff[a] = fixture.get("kickoff_time") or (
+                _UNSCHEDULED_KICKOFF
+            )
+
+        max_team = int(teams.max()) if n else 0
+        max_gw = int(events.max()) if n else 0
+        self.num_gameweeks = max_gw
+
+        # ----- Team x gameweek matrices (column 0 = unscheduled) -----
+        shape = (max_team + 1, max_gw + 1)
+        counts = np.zeros(shape)
+        diff_sum = np.zeros(shape)
+        home_counts = np.zeros(shape)
+        home_sum = np.zeros(shape)
+        np.add.at(counts, (teams, events), 1)
+        np.add.at(diff_sum, (teams, events), difficulty)
+        np.add.at(home_counts, (teams[is_home], events[is_home]), 1)
+        np.add.at(home_sum, (teams[is_home], events[is_home]), difficulty[is_home])
+        self.counts = counts.astype(np.int64)
+        self.unscheduled = self.counts[:, 0]
+
+        # Prefix sums over gameweeks: cum[:, g] = total for gameweeks 1..g-1
+        def prefix(matrix):
+            out = np.zeros((matrix.shape[0], matrix.shape[1] + 1))
+            np.cumsum(matrix[:, 1:], axis=1, out=out[:, 2:])
+            return out
+
+        self._cum = {
+            None: (prefix(diff_sum), prefix(counts)),
+            "home": (prefix(home_sum), prefix(home_counts)),
+            "away": (prefix(diff_sum - home_sum), prefix(counts - home_counts)),
+        }
+
+        # ----- Next fixtures per team in kickoff order -----
+        order = np.lexsort((np.array(kickoff, dtype=str), teams))
+        sorted_teams = teams[order]
+        sorted_diff = difficulty[order]
+        remaining = np.bincount(teams, minlength=max_team + 1)
+        starts = np.concatenate(([0], np.cumsum(remaining)[:-1]))
+        position = np.arange(2 * n) - starts[sorted_teams]
+        max_len = int(remaining.max()) if n else 0
+        next_diff = np.zeros((max_team + 1, max_len))
+        next_diff[sorted_teams, position] = sorted_diff
+        self.remaining = remaining
+        self._next_cum = np.zeros((max_team + 1, max_len + 1))
+        np.cumsum(next_diff, axis=1, out=self._next_cum[:, 1:])
+
+    def _team_rows(self, team_ids):
+        """Map team ids to matrix rows; unknown teams map to an empty row."""
+        team_ids = np.asarray(team_ids, dtype=np.int64)
+        return np.where(team_ids < len(self.remaining), team_ids, 0)
+
+    def next_fixtures_difficulty(self, team_ids, num_fix=3):
+        """
+        Average difficulty of each team's next num_fix fixtures by kickoff.
+        Args:
+            team_ids: iterable of FPL team ids
+            num_fix: num of fixtures to assess (default = 3)
+        Returns:
+            np.ndarray: mean difficulty per team (DEFAULT_DIFFICULTY if none)
+        """
+        rows = self._team_rows(team_ids)
+        taken = np.minimum(self.remaining[rows], num_fix)
+        column = min(num_fix, self._next_cum.shape[1] - 1)
+        totals = self._next_cum[rows, column]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = totals / taken
+        return np.where(taken > 0, means, DEFAULT_DIFFICULTY)
+
+    def horizon(self, team_ids, start_gw, num_gws, venue=None):
+        """
+        Difficulty totals and fixture counts over gameweeks
+        [start_gw, start_gw + num_gws).
+        Args:
+            team_ids: iterable of FPL team ids
+            start_gw: first gameweek of the horizon
+            num_gws: num of gameweeks in the horizon
+            venue: None for all fixtures, "home" or "away"
+        Returns:
+            tuple: (difficulty_sum, fixture_count) arrays per team
+        """
+        rows = self._team_rows(team_ids)
+        cum_diff, cum_count = self._cum[venue]
+        last = cum_diff.shape[1] - 1
+        lo = int(np.clip(start_gw, 1, last))
+        hi = int(np.clip(start_gw + num_gws, 1, last))
+        return (
+            cum_diff[rows, hi] - cum_diff[rows, lo],
+            cum_count[rows, hi] - cum_count[rows, lo],
+        )
+
+    def horizon_difficulty(self, team_ids, start_gw, num_gws, venue=None):
+        """
+        Mean fixture difficulty over a gameweek horizon.
+        Args:
+            team_ids: iterable of FPL team ids
+            start_gw: first gameweek of the horizon
+            num_gws: num of gameweeks in the horizon
+            venue: None for all fixtures, "home" or "away"
+        Returns:
+            np.ndarray: mean difficulty per team (DEFAULT_DIFFICULTY if none)
+        """
+        totals, counts = self.horizon(team_ids, start_gw, num_gws, venue)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = totals / counts
+        return np.where(counts > 0, means, DEFAULT_DIFFICULTY)
+
+    def gameweek_counts(self, team_ids, start_gw, num_gws):
+        """
+        Fixtures per team per gameweek (0 = blank, 2+ = double).
+        Args:
+            team_ids: iterable of FPL team ids
+            start_gw: first gameweek of the window
+            num_gws: num of gameweeks in the window
+        Returns:
+            np.ndarray: shape (teams, gameweeks) of fixture counts
+        """
+        rows = self._team_rows(team_ids)
+        lo = int(np.clip(start_gw, 1, self.num_gameweeks + 1))
+        hi = int(np.clip(start_gw + num_gws, lo, self.num_gameweeks + 1))
+        return self.counts[rows, lo:hi]
+
+
+def get_fixture_matrix(fixture_data, version=None):
+    """
+    Return the FixtureMatrix for fixture_data, cached per snapshot version.
+    Args:
+        fixture_data: json of all the FPL fixture data (fetch_fixture_data)
+        version: fixture snapshot version (no caching if None)
+    Returns:
+        FixtureMatrix: precomputed difficulty engine
+    """
+    if version is None:
+        return FixtureMatrix(fixture_data)
+    with _matrix_cache_lock:
+        matrix = _matrix_cache.get(version)
+        if matrix is not None:
+            _matrix_cache.move_to_end(version)
+            return matrix
+    matrix = FixtureMatrix(fixture_data)
+    with _matrix_cache_lock:
+        _matrix_cache[version] = matrix
+        while len(_matrix_cache) > _MATRIX_CACHE_SIZE:
+            _matrix_cache.popitem(last=False)
+    return matrix
@@ -0,0 +1,390 @@
+import importlib.util
+import time
+
+import numpy as np
+
+# Local imports
+from config import constants
+from models import ratings
+
+HAS_SCIPY = importlib.util.find_spec("scipy") is not None
+
+SQUAD_SHAPE = {"GKP": 2, "DEF": 5, "MID": 5, "FWD": 3}
+LINEUP_MIN = {"GKP": 1, "DEF": 3, "MID": 2, "FWD": 1}
+LINEUP_MAX = {"GKP": 1, "DEF": 5, "MID": 5, "FWD": 3}
+LINEUP_SIZE = 11
+TEAM_CAP = 3
+NEUTRAL_DIFFICULTY = 3.0
+
+
+def _numeric(view, name):
+    """Column as floats, 0 for missing or malformed values."""
+    return ratings.coerce_numeric(view.column(name))
+
+
+def project_points(view, matrix, start_gw, num_gws):
+    """
+    Projected FPL points per player per gameweek from the fixture matrix.
+
+    A player's per-fixture base is a blend of form and points per game,
+    scaled by HORIZON_FDR_WEIGHT per difficulty step away from neutral.
+    Blank gameweeks score 0 and doubles score both fixtures. Availability
+    (chance_of_playing_next_round) only discounts the first gameweek.
+    Args:
+        view: PlayerView of players to project
+        matrix: fixtures.FixtureMatrix of the upcoming fixtures
+        start_gw: first gameweek of the horizon
+        num_gws: num of gameweeks in the horizon
+    Returns:
+        np.ndarray: shape (players, gameweeks) of projected points
+    """
+    weight = constants.HORIZON_FORM_WEIGHT
+    base = weight * _numeric(view, "form") + (1 - weight) * _numeric(
+        view, "points_per_game"
+    )
+    teams = _numeric(view, "team").astype(np.int64)
+    points = np.zeros((len(view), num_gws))
+    for t in range(num_gws):
+        difficulty, count = matrix.horizon(teams, start_gw + t, 1)
+        fixture_factor = count + constants.HORIZON_FDR_WEIGHT * (
+            NEUTRAL_DIFFICULTY * count - difficulty
+        )
+        points[:, t] = base * fixture_factor
+    chance = view.column("chance_of_playing_next_round").astype(float)
+    points[:, 0] *= np.clip(chance, 0, 100) / 100.0
+    return points
+
+
+def _candidate_pool(sorted_players, current_team, points):
+    """
+    Current squad plus the best incoming players per position.
+
+    Keeps the top HORIZON_POOL_* players by total projected points and the
+    top HORIZON_VALUE_POOL by points per £m, so cheap enablers stay in reach.
+    Args:
+        sorted_players: dict of PlayerView per position (sort_players)
+        current_team: PlayerView of current team players (sort_current_team)
+        points: dict of projected points per position (project_points)
+    Returns:
+        PlayerView: candidate players, current squad first
+    """
+    caps = {
+        "GKP": constants.HORIZON_POOL_GKP,
+        "DEF": constants.HORIZON_POOL_DEF,
+        "MID": constants.HORIZON_POOL_MID,
+        "FWD": constants.HORIZON_POOL_FWD,
+    }
+    rows = [current_team.rows]
+    for pos, view in sorted_players.items():
+        total = points[pos].sum(axis=1)
+        price = view.column("now_cost(m)").astype(float)
+        by_total = np.argsort(-total, kind="stable")[: caps.get(pos, 0)]
+        by_value = np.argsort(-total / np.maximum(price, 0.1), kind="stable")[
+            : constants.HORIZON_VALUE_POOL
+        ]
+        rows.append(view.rows[by_total])
+        rows.append(view.rows[by_value])
+    rows = np.concatenate(rows)
+    _, first = np.unique(rows, return_index=True)
+    return current_team.table.view(rows[np.sort(first)])
+
+
+class _Layout:
+    """Column offsets of the horizon MILP variables."""
+
+    BLOCKS = ("squad", "lineup", "captain", "buy", "sell")
+
+    def __init__(self, num_players, num_gws):
+        self.n, self.T = num_players, num_gws
+        size = num_players * num_gws
+        self.block = {name: i * size for i, name in enumerate(self.BLOCKS)}
+        scalars = len(self.BLOCKS) * size
+        self.free = scalars  # free transfers available at the start of each GW
+        self.hits = scalars + num_gws
+        self.bank = scalars + 2 * num_gws
+        self.size = scalars + 3 * num_gws
+
+    def var(self, block, t, players=None):
+        """Column indices of a player block in gameweek t."""
+        players = np.arange(self.n) if players is None else players
+        return self.block[block] + t * self.n + players
+
+
+def _build_milp(
+    pool, points, bank_units, free_transfers, current_ids, decay, bench_weight
+):
+    """
+    Assemble the horizon MILP as sparse arrays for scipy.optimize.milp.
+
+    Per gameweek: the squad evolves from the previous one by buys and sells,
+    keeps the 2-5-5-3 shape and team cap, fields a valid XI with a captain
+    and keeps a non-negative bank. Unused free transfers roll over up to
+    HORIZON_MAX_FREE_TRANSFERS; transfers beyond them are hits.
+    Returns:
+        tuple: (layout, objective, rows, cols, vals, lower, upper, bounds)
+    """
+    n, T = len(pool), points.shape[1]
+    layout = _Layout(n, T)
+    price = np.round(pool.column("now_cost(m)").astype(float) * 10)
+    pos = pool.column("pos")
+    teams = pool.column("team_name")
+    owned = np.isin(pool.ids, current_ids).astype(float)
+
+    objective = np.zeros(layout.size)
+    for t in range(T):
+        weight = decay**t
+        objective[layout.var("squad", t)] = weight * bench_weight * points[:, t]
+        objective[layout.var("lineup", t)] = weight * (1 - bench_weight) * points[:, t]
+        objective[layout.var("captain", t)] = weight * points[:, t]
+        objective[layout.hits + t] = -weight * constants.TRANSFER_HIT_POINTS
+
+    rows, cols, vals, lower, upper = [], [], [], [], []
+
+    def add_row(columns, coefficients, lo, hi):
+        row = len(lower)
+        columns = np.atleast_1d(columns)
+        rows.extend([row] * len(columns))
+        cols.extend(columns.tolist())
+        vals.extend(np.broadcast_to(coefficients, columns.shape).tolist())
+        lower.append(lo)
+        upper.append(hi)
+
+    everyone = np.arange(n)
+    for t in range(T):
+        squad, lineup = layout.var("squad", t), layout.var("lineup", t)
+        captain = layout.var("captain", t)
+        buy, sell = layout.var("buy", t), layout.var("sell", t)
+
+        # Squad balance: squad_t = squad_{t-1} + buy_t - sell_t
+        for p in everyone:
+            columns = [squad[p], buy[p], sell[p]]
+            coefficients = [1.0, -1.0, 1.0]
+            if t == 0:
+                add_row(columns, coefficients, owned[p], owned[p])
+            else:
+                columns.append(layout.var("squad", t - 1)[p])
+                coefficients.append(-1.0)
+                add_row(columns, coefficients, 0.0, 0.0)
+            # Lineup within the squad, captain within the lineup
+            add_row([lineup[p], squad[p]], [1.0, -1.0], -np.inf, 0.0)
+            add_row([captain[p], lineup[p]], [1.0, -1.0], -np.inf, 0.0)
+
+        for name, size in SQUAD_SHAPE.items():
+            mask = pos == name
+            add_row(squad[mask], 1.0, size, size)
+            add_row(lineup[mask], 1.0, LINEUP_MIN[name], LINEUP_MAX[name])
+        add_row(lineup, 1.0, LINEUP_SIZE, LINEUP_SIZE)
+        add_row(captain, 1.0, 1.0, 1.0)
+        for team in set(teams):
+            add_row(squad[teams == team], 1.0, -np.inf, TEAM_CAP)
+
+        # Bank: bank_t = bank_{t-1} + sales - purchases (tenths of £m)
+        columns = np.concatenate(([layout.bank + t], sell, buy))
+        coefficients = np.concatenate(([1.0], -price, price))
+        if t == 0:
+            add_row(columns, coefficients, bank_units, bank_units)
+        else:
+            columns = np.append(columns, layout.bank + t - 1)
+            coefficients = np.append(coefficients, -1.0)
+            add_row(columns, coefficients, 0.0, 0.0)
+
+        # Free transfers used this GW: buys - hits <= free_t
+        add_row(
+            np.concatenate((buy, [layout.hits + t, layout.free + t])),
+            np.concatenate((np.ones(n), [-1.0, -1.0])),
+            -np.inf,
+            0.0,
+        )
+        # Roll-over: free_{t+1} <= free_t - (buys - hits) + 1
+        if t + 1 < T:
+            add_row(
+                np.concatenate(
+                    (
+                        [layout.free + t + 1, layout.free + t, layout.hits + t],
+                        buy,
+                    )
+                ),
+                np.concatenate(([1.0, -1.0, -1.0], np.ones(n))),
+                -np.inf,
+                1.0,
+            )
+
+    lb = np.zeros(layout.size)
+    ub = np.ones(layout.size)
+    lb[layout.free : layout.free + T] = 1
+    ub[layout.free : layout.free + T] = constants.HORIZON_MAX_FREE_TRANSFERS
+    lb[layout.free] = ub[layout.free] = min(
+        free_transfers, constants.HORIZON_MAX_FREE_TRANSFERS
+    )
+    ub[layout.hits : layout.hits + T] = sum(SQUAD_SHAPE.values())
+    ub[layout.bank : layout.bank + T] = np.inf
+    return layout, objective, (rows, cols, vals, lower, upper), (lb, ub)
+
+
+def _hold_plan(points, owned_mask, pos, decay, bench_weight):
+    """
+    Objective and lineups of keeping the current squad for every gameweek.
+
+    The XI is the formation minimum per position by projected points plus
+    the best remaining outfielders, which is optimal for a fixed squad.
+    Returns:
+        tuple: (objective, list of (lineup indices, captain index) per GW)
+    """
+    squad = np.flatnonzero(owned_mask)
+    total, lineups = 0.0, []
+    for t in range(points.shape[1]):
+        order = squad[np.argsort(-points[squad, t], kind="stable")]
+        lineup = []
+        for name, minimum in LINEUP_MIN.items():
+            lineup.extend(order[pos[order] == name][:minimum].tolist())
+        rest = [i for i in order if i not in lineup and pos[i] != "GKP"]
+        lineup.extend(rest[: LINEUP_SIZE - len(lineup)])
+        captain = max(lineup, key=lambda i: points[i, t])
+        bench = points[squad, t].sum() - points[lineup, t].sum()
+        total += decay**t * (
+            points[lineup, t].sum() + points[captain, t] + bench_weight * bench
+        )
+        lineups.append((lineup, captain))
+    return total, lineups
+
+
+def plan_horizon(
+    sorted_players,
+    current_team,
+    bank,
+    fixture_matrix,
+    start_gw,
+    num_gws=constants.HORIZON_GAMEWEEKS,
+    free_transfers=constants.TRANSFER_PLAN_FREE_TRANSFERS,
+    time_limit=constants.HORIZON_TIME_LIMIT,
+):
+    """
+    Plan transfers over the next num_gws gameweeks as one MILP.
+
+    Per-gameweek points come from project_points. Free transfers bank up to
+    HORIZON_MAX_FREE_TRANSFERS and each extra transfer costs
+    TRANSFER_HIT_POINTS. HiGHS stops at time_limit with its best incumbent;
+    keeping the current squad is always feasible, so a plan is returned even
+    if no better incumbent was found in time.
+    Args:
+        sorted_players: dict of PlayerView per position (sort_players)
+        current_team: PlayerView of current team players (sort_current_team)
+        bank: num of current team bank in millions (my_picks)
+        fixture_matrix: fixtures.FixtureMatrix of the upcoming fixtures
+        start_gw: first gameweek planned (the next deadline)
+        num_gws: num of gameweeks planned
+        free_transfers: num of free transfers available for start_gw
+        time_limit: seconds for the solver
+    Returns:
+        dict: per-gameweek transfers, XI and projected points plus diagnostics
+    """
+    start = time.perf_counter()
+    if not HAS_SCIPY:
+        return {"valid": False, "errors": ["Horizon planning requires scipy."]}
+    from scipy.optimize import Bounds, LinearConstraint, milp
+    from scipy.sparse import coo_array
+
+    points = {
+        pos: project_points(view, fixture_matrix, start_gw, num_gws)
+        for pos, view in sorted_players.items()
+    }
+    pool = _candidate_pool(sorted_players, current_team, points)
+    pool_points = project_points(pool, fixture_matrix, start_gw, num_gws)
+    pos = pool.column("pos")
+    owned = np.isin(pool.ids, current_team.ids)
+    decay, bench_weight = constants.HORIZON_DECAY, constants.HORIZON_BENCH_WEIGHT
+    bank_units = int(round(float(bank) * 10))
+
+    layout, objective, (rows, cols, vals, lower, upper), (lb, ub) = _build_milp(
+        pool,
+        pool_points,
+        bank_units,
+        free_transfers,
+        current_team.ids,
+        decay,
+        bench_weight,
+    )
+    matrix = coo_array((vals, (rows, cols)), shape=(len(lower), layout.size))
+    integrality = np.ones(layout.size)
+    integrality[layout.bank : layout.bank + num_gws] = 0
+    build_time = time.perf_counter() - start
+
+    result = milp(
+        -objective,
+        constraints=LinearConstraint(matrix.tocsr(), lower, upper),
+        integrality=integrality,
+        bounds=Bounds(lb, ub),
+        options={
+            "time_limit": max(0.1, time_limit - build_time),
+            "mip_rel_gap": constants.HORIZON_MIP_GAP,
+        },
+    )
+    hold_score, hold_lineups = _hold_plan(pool_points, owned, pos, decay, bench_weight)
+
+    names = pool.column("web_name")
+    records = pool.records()
+    gameweeks = []
+    if result.x is not None and -result.fun >= hold_score - 1e-6:
+        x = np.round(result.x).astype(np.int64)
+        source, score = "solver", -float(result.fun)
+        for t in range(num_gws):
+            lineup = np.flatnonzero(x[layout.var("lineup", t)])
+            captain = int(np.flatnonzero(x[layout.var("captain", t)])[0])
+            gameweeks.append(
+                {
+                    "gw": start_gw + t,
+                    "in": [records[i] for i in np.flatnonzero(x[layout.var("buy", t)])],
+                    "out": [
+                        records[i] for i in np.flatnonzero(x[layout.var("sell", t)])
+                    ],
+                    "hits": int(x[layout.hits + t]),
+                    "hit_points": -constants.TRANSFER_HIT_POINTS
+                    * int(x[layout.hits + t]),
+                    "free_transfers": int(x[layout.free + t]),
+                    "bank": round(result.x[layout.bank + t] / 10, 1),
+                    "lineup": [names[i] for i in lineup],
+                    "captain": names[captain],
+                    "points": round(
+                        float(pool_points[lineup, t].sum() + pool_points[captain, t]),
+                        2,
+                    ),
+                }
+            )
+    else:
+        source, score = "hold", hold_score
+        for t, (lineup, captain) in enumerate(hold_lineups):
+            gameweeks.append(
+                {
+                    "gw": start_gw + t,
+                    "in": [],
+                    "out": [],
+                    "hits": 0,
+                    "hit_points": 0,
+                    "free_transfers": min(
+                        free_transfers + t, constants.HORIZON_MAX_FREE_TRANSFERS
+                    ),
+                    "bank": round(bank_units / 10, 1),
+                    "lineup": [names[i] for i in lineup],
+                    "captain": names[captain],
+                    "points": round(
+                        float(pool_points[lineup, t].sum() + pool_points[captain, t]),
+                        2,
+                    ),
+                }
+            )
+
+    return {
+        "valid": True,
+        "errors": [],
+        "gameweeks": gameweeks,
+        "objective": round(score, 2),
+        "hold_objective": round(float(hold_score), 2),
+        "source": source,
+        "status": result.message,
+        "optimal": result.status == 0,
+        "gap": getattr(result, "mip_gap", None),
+        "nodes": getattr(result, "mip_node_count", None),
+        "pool_size": len(pool),
+        "build_time": round(build_time, 3),
+        "elapsed": round(time.perf_counter() - start, 3),
+    }
@@ -0,0 +1,221 @@
+import numpy as np
+import pandas as pd
+
+# Raw bootstrap element fields carried for every player, in report order.
+ELEMENT_FIELDS = [
+    "web_name",
+    "element_type",
+    "id",
+    "now_cost",
+    "status",
+    "chance_of_playing_next_round",
+    "news",
+    "minutes",
+    "goals_scored",
+    "assists",
+    "bonus",
+    "bps",
+    "total_points",
+    "points_per_game",
+    "form",
+    "ep_next",
+    "value_form",
+    "value_season",
+    "expected_goals",
+    "expected_assists",
+    "expected_goal_involvements",
+    "ict_index",
+    "influence",
+    "creativity",
+    "threat",
+    "clean_sheets",
+    "saves",
+    "penalties_saved",
+    "goals_conceded",
+    "expected_goals_conceded",
+    "expected_goal_involvements_per_90",
+    "clean_sheets_per_90",
+    "selected_by_percent",
+]
+
+# Keys of the player dicts handed to reports and the AI (the dict boundary).
+RECORD_FIELDS = [
+    "web_name",
+    "element_type",
+    "id",
+    "team_name",
+    "team_strength",
+    "team_fix_dif",
+    "status",
+    "chance_of_playing_next_round",
+    "news",
+    "minutes",
+    "goals_scored",
+    "assists",
+    "bonus",
+    "bps",
+    "total_points",
+    "points_per_game",
+    "form",
+    "ep_next",
+    "expected_goals",
+    "expected_assists",
+    "expected_goal_involvements",
+    "ict_index",
+    "influence",
+    "creativity",
+    "threat",
+    "clean_sheets",
+    "saves",
+    "penalties_saved",
+    "goals_conceded",
+    "expected_goals_conceded",
+    "expected_goal_involvements_per_90",
+    "clean_sheets_per_90",
+    "selected_by_percent",
+    "rating",
+    "pos",
+    "now_cost(m)",
+]
+
+
+class PlayerTable:
+    """
+    Columnar store of every player, one row per player.
+
+    Stages (format -> rate -> sort -> replacements -> optimizer) read and add
+    columns on the shared frame and pass row indices around as PlayerView
+    objects. Player dicts are only built at the report/AI boundary.
+
+    version identifies the snapshots the table was built from (None if
+    unknown) and keys derived caches such as fitted ratings.
+    """
+
+    def __init__(self, frame, version=None):
+        self.frame = frame.reset_index(drop=True)
+        self.version = version
+        ids = self.frame["id"].to_numpy(dtype=np.int64)
+        self.ids = ids
+        # Dense id -> row lookup (FPL ids are small positive ints)
+        self._row_by_id = np.full(int(ids.max(initial=0)) + 1, -1, dtype=np.int64)
+        self._row_by_id[ids] = np.arange(len(ids))
+
+    @classmethod
+    def from_bootstrap(cls, elements, team_data, version=None):
+        """
+        Build the table from bootstrap elements and team statistics.
+        Args:
+            elements: list of bootstrap element dicts (bootstrap_data["elements"])
+            team_data: dict of team stats per team id (team_stats)
+            version: hashable snapshot version of the inputs (None if unknown)
+        Returns:
+            PlayerTable: table with raw element fields plus team columns
+        """
+        # Columns keep the API's raw values (ints, "4.5" strings, None)
+        columns = {
+            field: [el.get(field, "") for el in elements] for field in ELEMENT_FIELDS
+        }
+        columns["team"] = [el.get("team") for el in elements]
+        frame = pd.DataFrame(columns, dtype=object)
+
+        default_team = {"name": "", "strength": 0, "fix_diff": 2.5}
+        team_info = [team_data.get(t, default_team) for t in frame["team"]]
+        frame["team_name"] = [t["name"] for t in team_info]
+        frame["team_strength"] = [t["strength"] for t in team_info]
+        frame["team_fix_dif"] = np.array([t["fix_diff"] for t in team_info], float)
+        chance = pd.to_numeric(frame["chance_of_playing_next_round"], errors="coerce")
+        frame["chance_of_playing_next_round"] = chance.fillna(100.0).astype(float)
+        return cls(frame, version)
+
+    def __len__(self):
+        return len(self.frame)
+
+    def column(self, name, rows=None):
+        """
+        Return a column as a NumPy array, optionally restricted to rows.
+        Args:
+            name: column name
+            rows: optional array of row indices
+        Returns:
+            np.ndarray: column values
+        """
+        series = self.frame[name]
+        if rows is None:
+            return series.to_numpy()
+        # Take from the backing array so small selections stay O(len(rows))
+        return np.asarray(series.array[rows])
+
+    def rows_for_ids(self, player_ids):
+        """
+        Map player ids to row indices, dropping unknown ids.
+        Args:
+            player_ids: iterable of FPL player ids
+        Returns:
+            np.ndarray: row indices in the order of player_ids
+        """
+        ids = np.asarray(list(player_ids), dtype=np.int64)
+        ids = ids[(ids >= 0) & (ids < len(self._row_by_id))]
+        rows = self._row_by_id[ids]
+        return rows[rows >= 0]
+
+    def view(self, rows):
+        """Return a PlayerView over rows."""
+        return PlayerView(self, rows)
+
+    def records(self, rows):
+        """
+        Build report/AI player dicts for rows (the dict boundary).
+        Args:
+            rows: array of row indices
+        Returns:
+            list: player dicts keyed by RECORD_FIELDS
+        """
+        fields = [c for c in RECORD_FIELDS if c in self.frame.columns]
+        return self.frame.iloc[rows][fields].to_dict("records")
+
+
+class PlayerView:
+    """
+    Ordered selection of PlayerTable rows.
+
+    Behaves like a read-only list of player dicts for printing and
+    serialisation, but slicing and filtering only move row indices.
+    """
+
+    def __init__(self, table, rows):
+        self.table = table
+        self.rows = np.asarray(rows, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.records())
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return PlayerView(self.table, self.rows[key])
+        return self.table.records(self.rows[[key]])[0]
+
+    @property
+    def ids(self):
+        """np.ndarray of player ids in view order."""
+        return self.table.ids[self.rows]
+
+    def column(self, name):
+        """np.ndarray of a column in view order."""
+        return self.table.column(name, self.rows)
+
+    def take(self, selector):
+        """
+        Return a sub-view by boolean mask or positional indices.
+        Args:
+            selector: boolean mask or array of positions within this view
+        Returns:
+            PlayerView: selected rows in view order
+        """
+        return PlayerView(self.table, self.rows[selector])
+
+    def records(self):
+        """list of player dicts for this view (the dict boundary)."""
+        return self.table.records(self.rows)
@@ -0,0 +1,74 @@
+import numpy as np
+
+
+class UniformQuantileScaler:
+    """
+    NumPy-only column-wise map of features onto uniform [0, 1] quantiles.
+
+    Numerically equivalent to sklearn's
+    QuantileTransformer(output_distribution="uniform") for dense input with
+    the same n_quantiles, subsample and random_state, without importing
+    scikit-learn (and SciPy) into every worker.
+    """
+
+    def __init__(self, n_quantiles=1000, subsample=10_000, random_state=None):
+        self.n_quantiles = n_quantiles
+        self.subsample = subsample
+        self.random_state = random_state
+
+    def fit(self, X):
+        """
+        Compute the reference quantiles of each column.
+        Args:
+            X: array-like of shape (samples, features)
+        Returns:
+            UniformQuantileScaler: self
+        """
+        X = np.asarray(X, dtype=float)
+        n_samples = X.shape[0]
+        self.n_quantiles_ = max(1, min(self.n_quantiles, n_samples))
+        self.references_ = np.linspace(0, 1, self.n_quantiles_, endpoint=True)
+
+        if self.subsample is not None and self.subsample < n_samples:
+            # Same rows as sklearn.utils.resample(replace=False)
+            rng = np.random.RandomState(self.random_state)
+            indices = np.arange(n_samples)
+            rng.shuffle(indices)
+            X = X[indices[: self.subsample]]
+
+        quantiles = np.nanpercentile(X, self.references_ * 100, axis=0)
+        # Guard against tiny non-monotonic steps from floating point rounding
+        self.quantiles_ = np.maximum.accumulate(quantiles)
+        return self
+
+    def transform(self, X):
+        """
+        Map each column onto [0, 1] by its fitted quantiles.
+        Args:
+            X: array-like of shape (samples, features)
+        Returns:
+            np.ndarray: transformed copy of X (NaNs are kept)
+        """
+        X = np.array(X, dtype=float)
+        for j in range(X.shape[1]):
+            X[:, j] = self._transform_col(X[:, j], self.quantiles_[:, j])
+        return X
+
+    def fit_transform(self, X):
+        """Fit to X, then transform it."""
+        return self.fit(X).transform(X)
+
+    def _transform_col(self, col, quantiles):
+        lower_bounds = col == quantiles[0]
+        upper_bounds = col == quantiles[-1]
+        finite = ~np.isnan(col)
+        values = col[finite]
+        # Interpolate up and down and average, so repeated quantiles map to
+        # the middle of their run rather than one end
+        col[finite] = 0.5 * (
+            np.interp(values, quantiles, self.references_)
+            - np.interp(-values, -quantiles[::-1], -self.references_[::-1])
+        )
+        col[upper_bounds] = 1.0
+        col[lower_bounds] = 0.0
+        return col
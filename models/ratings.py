@@ -1,108 +1,298 @@
+import threading
+import zlib
+from collections import OrderedDict
+
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import QuantileTransformer
 
+# Local imports
+from config import constants
+from models.quantile import UniformQuantileScaler
 
-def compute_ml_ratings(players, attribute_weights, mode="wildcard"):
+_RATING_CACHE_SIZE = 4  # attribute sets kept per process
+_TIE_BREAK_SCALE = 1e-5  # jitter size used to separate equal values
+
+# attribute set -> last fitted state: version, ids, features, scaler and scaled
+# feature matrix. States are never mutated once stored.
+_rating_cache = OrderedDict()
+_rating_cache_lock = threading.Lock()
+
+
+def coerce_numeric(values, missing=0.0):
     """
-    Compute player ratings using ML scaling + weighted sum.
+    Vectorised float conversion for raw FPL columns.
     Args:
-        players: list of player dicts with attributes
-        attribute_weights: dict of weights for each player attribute
+        values: array-like of raw API values (numbers, "4.5" strings, "", None)
+        missing: float used for empty, None or unparseable values
     Returns:
-        list: players with added 'rating' key (0–100 float)
+        np.ndarray: float64 values
     """
-
-    # ----- Helper functions -----
-    def safe_float(v):
+    values = np.asarray(values)
+    if values.dtype == object:
         try:
-            return float(v)
-        except Exception:
-            return 0.0
+            # Fast path: C-level float parse, with blanks treated as missing
+            numeric = np.where(values == "", None, values).astype(float)
+        except (TypeError, ValueError):
+            # Some cell is not a number: coerce it to NaN cell by cell
+            numeric = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(
+                dtype=float
+            )
+    else:
+        numeric = values.astype(float)
+    return np.where(np.isnan(numeric), missing, numeric)
 
-    # ----- Convert to DataFrame -----
-    df = pd.DataFrame(players)
 
-    # Keep only attributes that appear in weights that are not 0.0
-    numeric_attrs = [
-        a for a, w in attribute_weights.items() if a in df.columns and float(w) != 0.0
-    ]
+def feature_matrix(players, attrs):
+    """
+    Build the float feature matrix for attrs in one pass per column.
+    Args:
+        players: PlayerTable of all players (format_all_players)
+        attrs: list of column names
+    Returns:
+        np.ndarray: shape (players, attrs) float64 matrix
+    """
+    features = np.empty((len(players), len(attrs)))
+    for j, attr in enumerate(attrs):
+        features[:, j] = coerce_numeric(players.frame[attr].to_numpy())
+    return features
+
 
-    # Convert numeric columns safely
-    for col in numeric_attrs:
-        df[col] = df[col].apply(safe_float)
+def _cached_state(key):
+    with _rating_cache_lock:
+        state = _rating_cache.get(key)
+        if state is not None:
+            _rating_cache.move_to_end(key)
+        return state
 
-    # ----- QuantileTransformer -----
-    # Add small noise to separate same values
-    df[numeric_attrs] += np.random.normal(0, 1e-5, df[numeric_attrs].shape)
+
+def _store_state(key, state):
+    with _rating_cache_lock:
+        _rating_cache[key] = state
+        _rating_cache.move_to_end(key)
+        while len(_rating_cache) > _RATING_CACHE_SIZE:
+            _rating_cache.popitem(last=False)
+
+
+def tie_break_noise(ids, attrs):
+    """
+    Small jitter added before quantile scaling to separate equal values.
+
+    In "hash" mode (default) each (player id, attribute) cell gets a fixed
+    pseudo-random offset, so identical inputs always give identical ratings
+    and a player's offset survives new snapshots. "random" mode keeps the old
+    unseeded normal noise.
+    Args:
+        ids: np.ndarray of player ids, one per feature row
+        attrs: list of attribute names, one per feature column
+    Returns:
+        np.ndarray: shape (players, attrs) jitter
+    """
+    shape = (len(ids), len(attrs))
+    if constants.RATING_TIE_BREAK == "random":
+        return np.random.normal(0, _TIE_BREAK_SCALE, shape)
+
+    # splitmix64 finaliser over (id << 32 | crc32(attr)), wrapping uint64 maths
+    salts = np.array([zlib.crc32(a.encode("utf-8")) for a in attrs], np.uint64)
+    z = (np.asarray(ids, dtype=np.uint64)[:, None] << np.uint64(32)) | salts
+    z = z + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    z = z ^ (z >> np.uint64(31))
+    uniform = (z >> np.uint64(11)).astype(float) / float(1 << 53)
+    return (uniform - 0.5) * 2 * _TIE_BREAK_SCALE
+
+
+def _fit_scaler(features):
+    """
+    Fit the uniform quantile scaler and transform features.
+    Args:
+        features: np.ndarray of shape (players, attrs), tie-break noise added
+    Returns:
+        tuple: (fitted scaler, scaled feature matrix)
+    """
     # Choose smooth quantile resolution
-    n_quantiles = min(200, len(players))
-    scaler = QuantileTransformer(
-        output_distribution="uniform",
+    n_quantiles = min(200, len(features))
+    scaler = UniformQuantileScaler(
         n_quantiles=n_quantiles,
         subsample=50000,
         random_state=0,
     )
-    scaled_values = scaler.fit_transform(df[numeric_attrs])
-    scaled_df = pd.DataFrame(scaled_values, columns=numeric_attrs)
+    return scaler, scaler.fit_transform(features)
 
-    # ----- Apply weights -----
-    weighted_scores = np.zeros(len(df))
-    total_positive_weight = sum(w for w in attribute_weights.values() if w > 0)
-    total_negative_weight = sum(abs(w) for w in attribute_weights.values() if w < 0)
 
-    for attr in numeric_attrs:
-        w = attribute_weights.get(attr, 0)
-        if w != 0:
-            weighted_scores += scaled_df[attr] * w
+def _scale_features(features, noise, ids, previous):
+    """
+    Quantile-scale features, reusing the previous fit where possible.
+
+    Unchanged features reuse the cached scaled matrix as is. When only a few
+    players changed (RATING_INCREMENTAL_MAX_CHANGED), just their rows are
+    transformed with the cached scaler; otherwise the scaler is refitted.
+    Args:
+        features: np.ndarray of shape (players, attrs)
+        noise: np.ndarray tie-break jitter of the same shape (tie_break_noise)
+        ids: np.ndarray of player ids, one per feature row
+        previous: cached state for the same weights and mode, or None
+    Returns:
+        tuple: (scaler, scaled feature matrix)
+    """
+    if (
+        previous is not None
+        and previous["features"].shape == features.shape
+        and np.array_equal(previous["ids"], ids)
+    ):
+        changed = np.flatnonzero((previous["features"] != features).any(axis=1))
+        if len(changed) == 0:
+            return previous["scaler"], previous["scaled"]
+        if len(changed) <= constants.RATING_INCREMENTAL_MAX_CHANGED * len(ids):
+            scaled = previous["scaled"].copy()
+            noisy = features[changed] + noise[changed]
+            scaled[changed] = previous["scaler"].transform(noisy)
+            return previous["scaler"], scaled
+    return _fit_scaler(features + noise)
+
+
+def scaled_features(players, attrs):
+    """
+    Quantile-scaled feature matrix for attrs, cached per attribute set.
+
+    A table with the same snapshot version reuses the cached matrix outright;
+    a newer snapshot is re-scaled incrementally (see _scale_features).
+    Args:
+        players: PlayerTable of all players (format_all_players)
+        attrs: list of attribute column names
+    Returns:
+        np.ndarray: shape (players, attrs) values in [0, 1]
+    """
+    if not attrs:
+        return np.zeros((len(players), 0))
+    key = tuple(attrs)
+    previous = _cached_state(key)
+    if (
+        previous is not None
+        and players.version is not None
+        and previous["version"] == players.version
+        and np.array_equal(previous["ids"], players.ids)
+    ):
+        return previous["scaled"]
+
+    # Convert numeric columns in bulk (raw table columns stay untouched)
+    features = feature_matrix(players, attrs)
+    # Small jitter separates equal values (deterministic by default)
+    noise = tie_break_noise(players.ids, attrs)
+    scaler, scaled = _scale_features(features, noise, players.ids, previous)
+    _store_state(
+        key,
+        {
+            "version": players.version,
+            "ids": players.ids.copy(),
+            "features": features,
+            "scaler": scaler,
+            "scaled": scaled,
+        },
+    )
+    return scaled
+
+
+def weights_matrix(profiles):
+    """
+    Stack weight dicts into a profiles x attributes matrix.
+    Args:
+        profiles: list of attribute weight dicts (e.g. constants.WC_WEIGHTS)
+    Returns:
+        tuple: (list of attribute names, np.ndarray of shape (profiles, attrs))
+    """
+    attrs = list(dict.fromkeys(a for profile in profiles for a in profile))
+    matrix = np.array(
+        [[float(profile.get(a, 0.0)) for a in attrs] for profile in profiles]
+    ).reshape(len(profiles), len(attrs))
+    return attrs, matrix
+
+
+def rating_matrix(players, attrs, weights, modes="wildcard"):
+    """
+    Rate every player under many weight profiles in one pass.
+
+    All profiles share one quantile-scaled feature matrix (the union of their
+    non-zero attributes) and are weighted with a single matrix multiply; each
+    row equals compute_ml_ratings for that profile.
+    Args:
+        players: PlayerTable of all players (format_all_players)
+        attrs: list of attribute names, one per weights column
+        weights: array-like of shape (profiles, attrs) (weights_matrix)
+        modes: mode per profile, or one mode for all ("transfer"/"wildcard")
+    Returns:
+        np.ndarray: shape (profiles, players) ratings (0–100, 2 d.p.)
+    """
+    df = players.frame
+    weights = np.asarray(weights, dtype=float).reshape(-1, len(attrs))
+    num_profiles = len(weights)
+    if isinstance(modes, str):
+        modes = [modes] * num_profiles
+
+    # Keep only attributes that appear in weights that are not 0.0
+    used = [j for j, a in enumerate(attrs) if a in df.columns and weights[:, j].any()]
+    scaled_values = scaled_features(players, [attrs[j] for j in used])
+
+    # ----- Apply weights -----
+    weighted_scores = weights[:, used] @ scaled_values.T
+    total_positive_weight = np.array([sum(w for w in row if w > 0) for row in weights])
+    total_negative_weight = np.array(
+        [sum(abs(w) for w in row if w < 0) for row in weights]
+    )
 
     # Normalize weighted sum to 0–1 range
-    if (total_positive_weight + total_negative_weight) > 0:
-        min_possible = -total_negative_weight
-        max_possible = total_positive_weight
-        normalized = (weighted_scores - min_possible) / (max_possible - min_possible)
-        normalized = np.clip(normalized, 0, 1)
-    else:
-        normalized = np.zeros(len(df))
+    min_possible = -total_negative_weight[:, None]
+    max_possible = total_positive_weight[:, None]
+    span = max_possible - min_possible
+    has_span = span > 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        normalized = (weighted_scores - min_possible) / span
+    normalized = np.where(has_span, np.clip(normalized, 0, 1), 0.0)
 
     # ----- Apply multipliers -----
     availability = (
-        df["chance_of_playing_next_round"]
-        .apply(lambda v: safe_float(v) / 100 if v not in ("", None) else 1.0)
-        .values
+        coerce_numeric(df["chance_of_playing_next_round"].to_numpy(), 100.0) / 100
     )
 
-    df["team_fix_dif"] = df["team_fix_dif"].apply(safe_float)
-    fix_multiplier = 0.08 if mode == "transfer" else 0.05
-    fix_factor = 1.0 + (2.5 - df["team_fix_dif"]) * fix_multiplier
-    strength = df["team_strength"].apply(safe_float)
+    team_fix_dif = coerce_numeric(df["team_fix_dif"].to_numpy())
+    fix_multiplier = np.array([0.08 if m == "transfer" else 0.05 for m in modes])
+    fix_factor = 1.0 + (2.5 - team_fix_dif) * fix_multiplier[:, None]
+    strength = coerce_numeric(df["team_strength"].to_numpy())
 
     # Convert FPL team strength numbers (1–5) to 100 baseline
     strength_scaled = 1.0 + ((strength - 100) / 1000.0)
 
     # Calculated final score
-    final_scores = (
-        normalized * availability * fix_factor.values * strength_scaled.values
-    )
+    final_scores = normalized * availability * fix_factor * strength_scaled
 
     # ----- Final rating 0–100 -----
     # Use a more robust scaling approach to prevent clustering
-    mean_score = final_scores.mean()
-    std_score = final_scores.std()
+    mean_score = final_scores.mean(axis=1, keepdims=True)
+    if final_scores.shape[1] > 1:
+        std_score = final_scores.std(axis=1, ddof=1, keepdims=True)
+    else:
+        std_score = np.zeros((num_profiles, 1))
 
-    if std_score > 0:
-        # Z-score normalization, then scale to 0-100
+    # Z-score normalization, then sigmoid to bound values and preserve
+    # differences, scaled to a 1-99 range; 50 if all values are the same
+    with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
         z_scores = (final_scores - mean_score) / std_score
-        # Use sigmoid to bound values and preserve differences
-        final_scores = 1 / (1 + np.exp(-z_scores))
-        # Scale to 0-100 range with some padding
-        final_scores = final_scores * 98 + 1  # 1-99 range
-    else:
-        # Fallback if all values are the same
-        final_scores = np.full_like(final_scores, 50.0)
+        sigmoid = 1 / (1 + np.exp(-z_scores))
+    final_scores = np.where(std_score > 0, sigmoid * 98 + 1, 50.0)
+    return np.round(final_scores, 2)
 
-    # Insert rating back into players dict
-    for p, score in zip(players, final_scores):
-        p["rating"] = round(float(score), 2)
 
+def compute_ml_ratings(players, attribute_weights, mode="wildcard"):
+    """
+    Compute player ratings using ML scaling + weighted sum.
+    Args:
+        players: PlayerTable of all players (format_all_players)
+        attribute_weights: dict of weights for each player attribute
+        mode: "transfer" or "wildcard" (sets the fixture multiplier)
+    Returns:
+        PlayerTable: players with added 'rating' column (0–100 float)
+    """
+    attrs, weights = weights_matrix([attribute_weights])
+    # Insert rating as a table column
+    players.frame["rating"] = rating_matrix(players, attrs, weights, mode)[0]
     return players
@@ -1,33 +1,142 @@
+import numpy as np
+
+MIN_PRICE = 4.0  # cheapest replacement considered (£m)
+
+
+class ReplacementIndex:
+    """
+    Per-position price index of replacement-eligible players.
+
+    Eligible players (available, 100% chance, at least MIN_PRICE) are grouped
+    by distinct price. For every price level the index stores the best `depth`
+    players costing at most that price, in rating order. "Best N players
+    within budget, excluding my squad" is then a binary search on the price
+    levels plus a scan of at most `depth` precomputed rows.
+    """
+
+    def __init__(self, sorted_players, depth):
+        self.depth = depth
+        self.positions = {}
+        for pos, view in sorted_players.items():
+            cost = view.column("now_cost(m)")
+            eligible = np.flatnonzero(
+                (MIN_PRICE <= cost)
+                & (view.column("status") == "available")
+                & (view.column("chance_of_playing_next_round") == 100)
+            )
+            levels, level_of = np.unique(cost[eligible], return_inverse=True)
+
+            # Prefix top-depth: player i is within budget at every level >= its own
+            allowed = level_of[None, :] <= np.arange(len(levels))[:, None]
+            slot = np.cumsum(allowed, axis=1) - 1
+            level, member = np.nonzero(allowed & (slot < depth))
+            top = np.full((len(levels), depth), -1, dtype=np.int64)
+            top[level, slot[level, member]] = eligible[member]
+
+            # Positions in view (rating order), -1 padded
+            self.positions[pos] = {"view": view, "levels": levels, "top": top}
+
+    def candidate_rows(self, pos, exclude_ids, depth):
+        """
+        Players that are among the best `depth` at or under some price level.
+
+        Any other player has at least `depth` players that are no more
+        expensive and rated at least as high, so it can be skipped by searches
+        that never need more than `depth` alternatives.
+        Args:
+            pos: position key
+            exclude_ids: player ids never suggested (the current squad)
+            depth: num of players kept per price level (<= self.depth)
+        Returns:
+            PlayerView: candidates in rating order
+        """
+        view, top = self.positions[pos]["view"], self.positions[pos]["top"]
+        keep = top >= 0
+        keep &= ~np.isin(view.ids[np.maximum(top, 0)], list(exclude_ids))
+        keep &= np.cumsum(keep, axis=1) <= depth
+        return view.take(np.unique(top[keep]))
+
+    def query(self, positions, budgets, exclude_ids, num_replacements=4):
+        """
+        Best replacements for many (position, budget) slots in one call.
+        Args:
+            positions: array of position keys, one per slot
+            budgets: array of max prices in millions, one per slot
+            exclude_ids: player ids never suggested (the current squad)
+            num_replacements: num of replacements per slot (<= depth)
+        Returns:
+            list: PlayerView of replacements per slot, best rated first
+        """
+        positions = np.asarray(positions)
+        budgets = np.asarray(budgets, dtype=float)
+        exclude_ids = np.asarray(list(exclude_ids), dtype=np.int64)
+        results = [None] * len(positions)
+
+        for pos, entry in self.positions.items():
+            slots = np.flatnonzero(positions == pos)
+            if not len(slots):
+                continue
+            view, levels, top = entry["view"], entry["levels"], entry["top"]
+            level = np.searchsorted(levels, budgets[slots], side="right") - 1
+            if len(levels):
+                candidates = np.where(
+                    (level >= 0)[:, None], top[np.maximum(level, 0)], -1
+                )
+            else:
+                candidates = np.full((len(slots), self.depth), -1, dtype=np.int64)
+            keep = candidates >= 0
+            keep &= ~np.isin(view.ids[np.maximum(candidates, 0)], exclude_ids)
+            keep &= np.cumsum(keep, axis=1) <= num_replacements
+            for slot, chosen, mask in zip(slots, candidates, keep):
+                results[slot] = view.take(chosen[mask])
+
+        # Slots with an unknown position get no replacements
+        empty = next(iter(self.positions.values()))["view"][:0]
+        return [view if view is not None else empty for view in results]
+
+
+def find_replacements_batch(
+    players, bank, sorted_players, current_team, num_replacements=4
+):
+    """
+    Find replacement candidates for several players with one index build.
+    Args:
+        players: PlayerView of players to replace (e.g. sorted_current[:n])
+        bank: num of current team bank in millions (my_picks)
+        sorted_players: dict of PlayerView per position (sort_players)
+        current_team: PlayerView of current team players (sort_current_team)
+        num_replacements: num of number of replacements to give (default = 4)
+    Returns:
+        list: PlayerView of replacements per player, in players order
+    """
+    if not len(players):
+        return []
+    # Deep enough that excluding the whole squad still leaves enough players
+    index = ReplacementIndex(sorted_players, num_replacements + len(current_team))
+    # Max price of replacements is the bank plus the outgoing player's price
+    budgets = bank + players.column("now_cost(m)")
+    return index.query(
+        players.column("pos"), budgets, current_team.ids, num_replacements
+    )
+
+
 def find_replacements(player, bank, sorted_players, current_team, num_replacements=4):
     """
     Find replacement candidates for a player.
     Args:
         player: dict of player to replace
         bank: num of current team bank in millions (my_picks)
-        sorted_players: dict of players per position (sort_players)
-        current_team: list of current team player dicts
+        sorted_players: dict of PlayerView per position (sort_players)
+        current_team: PlayerView of current team players (sort_current_team)
         num_replacements: num of number of replacements to give (default = 4)
     Returns:
-        list: replacement player dicts up to num_replacements
+        PlayerView: replacement players up to num_replacements
     """
-    # Calculate max and min price of replacements
-    player_cost = player.get("now_cost(m)", 0)
-    available_budget = (bank) + player_cost
-    min_price = 4.0
-    max_price = available_budget
-    position = player.get("pos", "")
-    # Filter candidates by budget, availability, and not in current team
-    current_team_ids = {p["id"] for p in current_team}
-    candidates = [
-        p
-        for p in sorted_players[position]
-        if (
-            min_price <= p["now_cost(m)"] <= max_price
-            and p["id"] not in current_team_ids
-            and p["status"] == "available"
-            and p["chance_of_playing_next_round"] == 100
-        )
-    ]
-    # Sort replacements best rated first
-    sorted_candidates = sorted(candidates, key=lambda x: x["rating"], reverse=True)
-    return sorted_candidates[:num_replacements]
+    index = ReplacementIndex(
+        {player.get("pos", ""): sorted_players[player.get("pos", "")]},
+        num_replacements + len(current_team),
+    )
+    budget = bank + player.get("now_cost(m)", 0)
+    return index.query(
+        [player.get("pos", "")], [budget], current_team.ids, num_replacements
+    )[0]
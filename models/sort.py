@@ -1,83 +1,88 @@
 import numpy as np
+import pandas as pd
 
 # Local imports
 from config import constants
+from models.ratings import coerce_numeric
 
 
 def sort_players(players):
     """
-    Sort players into positions and by rating, while cleaning and formatting each
-    player dict.
+    Sort players into positions and by rating, while cleaning and formatting the
+    player table columns used by reports.
     Args:
-        players: list of player dicts (format_all_players)
+        players: PlayerTable of rated players (compute_ml_ratings)
     Ruturns:
-        dict: {GKP: [{player}], DEF: [{player}], MID: [{player}], FWD: [{player}],}
+        dict: {GKP: PlayerView, DEF: PlayerView, MID: PlayerView, FWD: PlayerView}
     """
-    positions = {"GKP": [], "DEF": [], "MID": [], "FWD": []}
-    for p in players:
-        pos_key = constants.POS_MAP.get(p.get("element_type"))
-        if pos_key not in positions:
-            continue  # skip unknown element types
-        player = p.copy()  # avoid mutating the original dict
-        # Defining the new key values
-        now_cost = round(player.get("now_cost", 0) / 10, 1)
-        team_fix_dif = round(player.get("team_fix_dif", 0), 2)
-        status = constants.STATUS_MAP.get(player.get("status", "a"), "available")
-        # Apply transformations
-        player["pos"] = pos_key
-        player["now_cost(m)"] = now_cost
-        player["team_fix_dif"] = team_fix_dif
-        player["status"] = status
-        # Remove unwanted keys
-        player.pop("now_cost", None)
-        player.pop("value_form", None)
-        player.pop("value_season", None)
-        positions[pos_key].append(player)
+    df = players.frame
+    # --- GROUP BY POSITION (unknown types get code -1 and are skipped) ---
+    pos_keys = list(constants.POS_MAP.values())
+    element_type = coerce_numeric(df["element_type"].to_numpy(), -1.0)
+    codes = np.full(len(df), -1, dtype=np.int64)
+    for g, type_id in enumerate(constants.POS_MAP):
+        codes[element_type == type_id] = g
 
-    # --- NORMALISE 'rating' PER POSITION ---
-    for pos, group in positions.items():
-        if not group:
-            continue
-
-        ratings = np.array([p["rating"] for p in group], dtype=float)
-        r_min, r_max = ratings.min(), ratings.max()
+    # Defining the new column values
+    df["pos"] = pd.Categorical.from_codes(codes, categories=pos_keys)
+    df["now_cost(m)"] = np.round(coerce_numeric(df["now_cost"].to_numpy()) / 10, 1)
+    df["team_fix_dif"] = np.round(df["team_fix_dif"].to_numpy(dtype=float), 2)
+    # Labels from an earlier call are kept, so sorting again changes nothing
+    # (the per-position rating rescale below is already idempotent)
+    status = df["status"]
+    labels = status.where(status.isin(list(constants.STATUS_MAP.values())))
+    df["status"] = status.map(constants.STATUS_MAP).fillna(labels).fillna("available")
 
-        # Avoid division by zero when all ratings identical
-        if r_max == r_min:
-            for p in group:
-                p["rating"] = 50.0
-            continue
+    rows = np.flatnonzero(codes >= 0)
+    groups = codes[rows]
+    ratings = df["rating"].to_numpy(dtype=float).copy()
+    group_ratings = ratings[rows]
 
+    # --- NORMALISE 'rating' PER POSITION ---
+    r_min = np.full(len(pos_keys), np.inf)
+    r_max = np.full(len(pos_keys), -np.inf)
+    np.minimum.at(r_min, groups, group_ratings)
+    np.maximum.at(r_max, groups, group_ratings)
+    lo, hi = r_min[groups], r_max[groups]
+    with np.errstate(invalid="ignore", divide="ignore"):
         # Min-max scale → 0–100
-        scaled = (ratings - r_min) / (r_max - r_min)
-        scaled = np.clip(scaled * 100, 0, 100)
+        scaled = (group_ratings - lo) / (hi - lo)
+    # Avoid division by zero when all ratings identical
+    ratings[rows] = np.where(hi == lo, 50.0, np.round(np.clip(scaled * 100, 0, 100), 2))
 
-        # Write back into SAME 'rating' key
-        for p, new_rating in zip(group, scaled):
-            p["rating"] = round(float(new_rating), 2)
-
-    # --- SORT BY UPDATED RATING ---
-    return {
-        pos: sorted(players_list, key=lambda x: x["rating"], reverse=True)
-        for pos, players_list in positions.items()
+    # --- SORT BY POSITION, THEN UPDATED RATING (stable, best first) ---
+    order = np.lexsort((-ratings[rows], groups))
+    rows = rows[order]
+    bounds = np.searchsorted(groups[order], np.arange(len(pos_keys) + 1))
+    positions = {
+        pos_key: players.view(rows[bounds[g] : bounds[g + 1]])
+        for g, pos_key in enumerate(pos_keys)
     }
 
+    # Write back into SAME 'rating' column
+    df["rating"] = ratings
+    return positions
+
 
 def sort_current_team(sorted_players, picks_pids):
     """
     Sort current team players by rating.
     Args:
-        sorted_players: dict of players per position (sort_players)
+        sorted_players: dict of PlayerView per position (sort_players)
         picks_pids: list of current team player IDs
     Returns:
-        list: current team player dicts sorted by rating (ascending)
+        PlayerView: current team players sorted by rating (ascending)
     """
-    # Add rated players from current team into a list and sort
-    current_team = [
-        p
-        for players_list in sorted_players.values()
-        for p in players_list
-        if p["id"] in picks_pids
-    ]
-    sorted_current = sorted(current_team, key=lambda x: x["rating"])
-    return sorted_current
+    views = list(sorted_players.values())
+    table = views[0].table
+    # Current team rows by id lookup; players without a position are skipped
+    rows = table.rows_for_ids(np.unique(np.asarray(list(picks_pids), np.int64)))
+    group_of = {pos_key: g for g, pos_key in enumerate(sorted_players)}
+    groups = np.array(
+        [group_of.get(pos, -1) for pos in table.column("pos", rows)],
+        dtype=np.int64,
+    )
+    rows, groups = rows[groups >= 0], groups[groups >= 0]
+    # Ascending rating; ties keep position order, then sorted (row) order
+    order = np.lexsort((rows, groups, table.column("rating", rows)))
+    return table.view(rows[order])
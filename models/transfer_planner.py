@@ -0,0 +1,224 @@
+import heapq
+import time
+from collections import Counter
+
+import numpy as np
+
+# Local imports
+from config import constants
+from models import replacements
+
+
+class _SearchTimeout(Exception):
+    """Raised inside the search when the time limit is reached."""
+
+
+def _cost_units(view):
+    """Player prices in integer tenths of a million."""
+    return np.round(view.column("now_cost(m)").astype(float) * 10).astype(np.int64)
+
+
+def _build_swaps(sorted_players, current_team, bank_units, max_transfers, depth):
+    """
+    Enumerate every same-position (out, in) swap worth searching.
+    Args:
+        sorted_players: dict of PlayerView per position (sort_players)
+        current_team: PlayerView of current team players (sort_current_team)
+        bank_units: bank in tenths of a million
+        max_transfers: most transfers in one plan
+        depth: incoming players kept per position and price level
+    Returns:
+        dict: swap arrays ordered by rating gain (best first) plus the pool
+    """
+    # Incoming pool: players with fewer than `depth` better-and-cheaper
+    # alternatives outside the squad (see ReplacementIndex.candidate_rows)
+    index = replacements.ReplacementIndex(sorted_players, depth + len(current_team))
+    views = [
+        index.candidate_rows(pos, current_team.ids, depth) for pos in index.positions
+    ]
+    table = current_team.table
+    pool = table.view(np.concatenate([view.rows for view in views]))
+
+    squad_pos, pool_pos = current_team.column("pos"), pool.column("pos")
+    squad_cost, pool_cost = _cost_units(current_team), _cost_units(pool)
+    out_idx, in_idx = np.nonzero(squad_pos[:, None] == pool_pos[None, :])
+    gain = pool.column("rating")[in_idx] - current_team.column("rating")[out_idx]
+    delta = pool_cost[in_idx] - squad_cost[out_idx]
+
+    # Drop swaps no plan can afford, even after selling for the cheapest
+    # replacements in the other transfers
+    cheapest = {pos: pool_cost[pool_pos == pos].min(initial=0) for pos in set(pool_pos)}
+    savings = np.sort(
+        [max(0, c - cheapest.get(p, c)) for p, c in zip(squad_pos, squad_cost)]
+    )[::-1]
+    affordable = delta <= bank_units + savings[: max_transfers - 1].sum()
+
+    order = np.lexsort((in_idx, out_idx, -gain))
+    order = order[affordable[order]]
+    return {
+        "pool": pool,
+        "out": out_idx[order],
+        "in": in_idx[order],
+        "gain": gain[order],
+        "delta": delta[order],
+        "pos": squad_pos[out_idx[order]],
+        "out_team": current_team.column("team_name")[out_idx[order]],
+        "in_team": pool.column("team_name")[in_idx[order]],
+    }
+
+
+def _search_plans(swaps, num_transfers, bank_units, team_counts, num_plans, clock):
+    """
+    Branch and bound over swap combinations of one size.
+
+    Swaps are visited best gain first, so the gain of the next swaps in order
+    bounds any completion; a branch stops once that bound cannot beat the
+    worst plan kept. Budget is pruned with the largest possible saving of the
+    remaining swaps; the 3-per-team cap is checked on complete plans.
+    Re-pairings of the same players within a position are visited once.
+    Args:
+        swaps: swap arrays (_build_swaps)
+        num_transfers: exact num of swaps per plan
+        bank_units: bank in tenths of a million
+        team_counts: Counter of current squad players per team
+        num_plans: num of best plans kept
+        clock: dict with "deadline" and "nodes" (updated in place)
+    Returns:
+        list: (rating_gain, swap indices) best first
+    """
+    gains = swaps["gain"].tolist()
+    deltas = swaps["delta"].tolist()
+    outs, ins = swaps["out"].tolist(), swaps["in"].tolist()
+    out_team, in_team = swaps["out_team"].tolist(), swaps["in_team"].tolist()
+    pos = swaps["pos"].tolist()
+    n = len(gains)
+    prefix = [0.0]
+    for g in gains:
+        prefix.append(prefix[-1] + g)
+    best_saving = -min(deltas, default=0)
+    kept = []  # min-heap of (gain, -sequence, swap indices)
+
+    def within_team_cap(chosen):
+        counts = Counter(team_counts)
+        for j in chosen:
+            counts[out_team[j]] -= 1
+            counts[in_team[j]] += 1
+        return all(counts[in_team[j]] <= 3 for j in chosen)
+
+    def visit(start, chosen, gain, delta):
+        remaining = num_transfers - len(chosen)
+        if remaining == 0:
+            if delta <= bank_units and within_team_cap(chosen):
+                item = (gain, -clock["nodes"], chosen)
+                if len(kept) < num_plans:
+                    heapq.heappush(kept, item)
+                elif item > kept[0]:
+                    heapq.heapreplace(kept, item)
+            return
+        used_out = {outs[j] for j in chosen}
+        used_in = {ins[j] for j in chosen}
+        for j in range(start, n - remaining + 1):
+            bound = gain + prefix[j + remaining] - prefix[j]
+            if len(kept) == num_plans and bound <= kept[0][0]:
+                break  # later swaps only have lower gains
+            clock["nodes"] += 1
+            if clock["nodes"] % 2048 == 0 and time.perf_counter() > clock["deadline"]:
+                raise _SearchTimeout
+            if outs[j] in used_out or ins[j] in used_in:
+                continue
+            # Same-position swaps pair outs and ins in the same order, so a
+            # plan is not found again with its players paired differently
+            if any(
+                pos[c] == pos[j] and (outs[c] < outs[j]) != (ins[c] < ins[j])
+                for c in chosen
+            ):
+                continue
+            if delta + deltas[j] - (remaining - 1) * best_saving > bank_units:
+                continue
+            visit(j + 1, chosen + [j], gain + gains[j], delta + deltas[j])
+
+    try:
+        visit(0, [], 0.0, 0)
+    except _SearchTimeout:
+        clock["complete"] = False
+    return [(gain, chosen) for gain, _, chosen in sorted(kept, reverse=True)]
+
+
+def plan_transfers(
+    sorted_players,
+    current_team,
+    bank,
+    free_transfers=constants.TRANSFER_PLAN_FREE_TRANSFERS,
+    max_transfers=constants.TRANSFER_PLAN_MAX_TRANSFERS,
+    num_plans=constants.TRANSFER_PLAN_COUNT,
+    time_limit=constants.TRANSFER_PLAN_TIME_LIMIT,
+):
+    """
+    Rank the best 1-, 2- and 3-transfer plans for the current squad.
+
+    Plans share one bank, keep the 3-per-team cap and pay
+    TRANSFER_HIT_RATING per transfer beyond the free ones (a -4 hit each).
+    The search is exact over the pruned incoming pool and returns the best
+    plans found so far if the time limit is reached.
+    Args:
+        sorted_players: dict of PlayerView per position (sort_players)
+        current_team: PlayerView of current team players (sort_current_team)
+        bank: num of current team bank in millions (my_picks)
+        free_transfers: num of free transfers available
+        max_transfers: most transfers in one plan
+        num_plans: num of plans kept per transfer count
+        time_limit: seconds for the whole search
+    Returns:
+        dict: ranked plans plus search diagnostics
+    """
+    start = time.perf_counter()
+    clock = {"deadline": start + time_limit, "nodes": 0, "complete": True}
+    bank_units = int(round(float(bank) * 10))
+    team_counts = Counter(current_team.column("team_name").tolist())
+    swaps = _build_swaps(
+        sorted_players,
+        current_team,
+        bank_units,
+        max_transfers,
+        constants.TRANSFER_PLAN_DEPTH,
+    )
+
+    plans = []
+    for num_transfers in range(1, max_transfers + 1):
+        if time.perf_counter() > clock["deadline"]:
+            clock["complete"] = False
+            break
+        hits = max(0, num_transfers - free_transfers)
+        for gain, chosen in _search_plans(
+            swaps, num_transfers, bank_units, team_counts, num_plans, clock
+        ):
+            out_rows = current_team.rows[swaps["out"][chosen]]
+            in_rows = swaps["pool"].rows[swaps["in"][chosen]]
+            spent = int(swaps["delta"][chosen].sum())
+            plans.append(
+                {
+                    "transfers": [
+                        {"out": out_player, "in": in_player}
+                        for out_player, in_player in zip(
+                            current_team.table.records(out_rows),
+                            current_team.table.records(in_rows),
+                        )
+                    ],
+                    "num_transfers": num_transfers,
+                    "hits": hits,
+                    "hit_points": -constants.TRANSFER_HIT_POINTS * hits,
+                    "rating_gain": round(gain, 2),
+                    "net_gain": round(gain - hits * constants.TRANSFER_HIT_RATING, 2),
+                    "bank_after": round((bank_units - spent) / 10, 1),
+                }
+            )
+
+    plans.sort(key=lambda plan: plan["net_gain"], reverse=True)
+    return {
+        "plans": plans,
+        "free_transfers": free_transfers,
+        "swaps_considered": len(swaps["gain"]),
+        "nodes": clock["nodes"],
+        "complete": clock["complete"],
+        "elapsed": round(time.perf_counter() - start, 3),
+    }
@@ -1,19 +1,40 @@
+"""
+Deterministic wildcard squad optimizer.
+
+optimize_wildcard_squad takes every player, first drops the provably
+dominated ones (_undominated: enough better players within a price window
+that no squad can block all of them), and solves the rest as one ILP, so the
+result is optimal over the whole table (benchmarks.bench_wildcard_pruning).
+
+WildcardModel builds the ILP once per pool and re-solves it for a tightened
+spend floor, the WILDCARD_ALTERNATIVES next-best squads (iterative no-good
+cuts, each at least WILDCARD_ALT_MIN_DISTANCE apart) and the
+WILDCARD_EXCLUSION_COUNT top excluded players, each forced into the squad in
+a shared thread pool within WILDCARD_EXCLUSION_TIME_LIMIT seconds to report
+the objective loss and the players swapped. Every re-solve is warm-started
+from the last incumbent or, when that breaks the new floor, cut or forced
+player, from the best feasible squad one swap away.
+
+sweep_budgets solves one pruned pool for a range of budgets in a spawned
+process pool (WILDCARD_SWEEP_WORKERS, reused across requests) and returns
+the objective-vs-spend frontier (benchmarks.bench_budget_sweep).
+"""
+
+import multiprocessing
+import threading
+import time
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
 
-try:
-    from pulp import (
-        LpBinary,
-        LpMaximize,
-        LpProblem,
-        LpStatus,
-        LpVariable,
-        PULP_CBC_CMD,
-        lpSum,
-    )
+import numpy as np
+
+# Local imports
+from config import constants
+from models import wildcard_solvers
 
-    HAS_PULP = True
-except Exception:
-    HAS_PULP = False
+SPEND_TOP_UP_GAP = 1.5  # spend floor gap when the first squad leaves > £4m
 
 
 def _safe_float(value):
@@ -24,194 +45,774 @@ def _safe_float(value):
         return 0.0
 
 
-def _objective_score(player):
-    """Composite wildcard objective score for optimization."""
-    rating = _safe_float(player.get("rating", 0.0))
-    ep_next = _safe_float(player.get("ep_next", 0.0))
-    form = _safe_float(player.get("form", 0.0))
-    points_per_game = _safe_float(player.get("points_per_game", 0.0))
+def _objective_scores(pool):
+    """Composite wildcard objective score per player for optimization."""
+    rating, ep_next, form, points_per_game = (
+        np.fromiter(map(_safe_float, pool.column(col)), float, len(pool))
+        for col in ("rating", "ep_next", "form", "points_per_game")
+    )
     return rating + (1.2 * ep_next) + (0.8 * form) + (0.3 * points_per_game)
 
 
-def _solve_wildcard(players, budget_limit, min_spend):
-    """Solve a single wildcard optimization run with a spend floor."""
-    if not players:
-        return None
-
-    budget_units = int(round(_safe_float(budget_limit) * 10))
-    min_spend_units = int(round(max(0.0, _safe_float(min_spend)) * 10))
-
-    problem = LpProblem("wildcard_squad", LpMaximize)
-
-    x = {
-        p["id"]: LpVariable(f"x_{p['id']}", lowBound=0, upBound=1, cat=LpBinary)
-        for p in players
-    }
-
-    problem += lpSum(x[p["id"]] * p["objective_score"] for p in players)
-
-    problem += lpSum(x[p["id"]] for p in players) == 15
+class WildcardModel:
+    """
+    Wildcard squad model built once per candidate pool and re-solved in place.
+
+    The solver backend (WILDCARD_SOLVER) builds its problem once. Between
+    solves only the spend floor and the no-good cuts change. Every solve is
+    warm-started from the last incumbent, or when that squad breaks the new
+    floor, a cut or a forced player, from the best feasible squad one swap
+    away from it (_start_squad). Each solve stops at time_limit or gap with
+    the best squad found so far. Build and per-solve timings, nodes and
+    gaps are kept for the diagnostics.
+    """
 
-    for pos, expected_count in {"GKP": 2, "DEF": 5, "MID": 5, "FWD": 3}.items():
-        problem += (
-            lpSum(x[p["id"]] for p in players if p.get("pos") == pos) == expected_count
+    def __init__(self, model, budget_limit, backend=None, time_limit=None, gap=None):
+        start = time.perf_counter()
+        self.model = model
+        self.budget_limit = _safe_float(budget_limit)
+        self.time_limit = (
+            constants.WILDCARD_SOLVER_TIME_LIMIT if time_limit is None else time_limit
         )
-
-    teams = sorted({p.get("team_name", "") for p in players})
-    for team in teams:
-        if not team:
-            continue
-        problem += lpSum(x[p["id"]] for p in players if p.get("team_name") == team) <= 3
-
-    problem += lpSum(x[p["id"]] * p["cost_units"] for p in players) <= budget_units
-    if min_spend_units > 0:
-        problem += (
-            lpSum(x[p["id"]] * p["cost_units"] for p in players) >= min_spend_units
+        self.gap = constants.WILDCARD_SOLVER_GAP if gap is None else gap
+        self.incumbent = None
+        self.solves = []
+        self.budget_units = int(round(self.budget_limit * 10))
+        teams = model["team"]
+        self.team_capped = np.array([bool(team) for team in teams])
+        self.team_code = np.unique(teams, return_inverse=True)[1].ravel()
+        self.cuts = []  # (member mask, most members kept) per no-good cut
+        self.backend = wildcard_solvers.make_backend(
+            backend or constants.WILDCARD_SOLVER,
+            model,
+            self.budget_units,
         )
-
-    status_code = problem.solve(PULP_CBC_CMD(msg=False))
-    status = LpStatus.get(status_code, "Unknown")
-    if status != "Optimal":
-        return None
-
-    selected = [p for p in players if x[p["id"]].value() == 1]
-    total_cost = round(sum(p["cost_units"] for p in selected) / 10.0, 1)
-    total_objective = round(sum(p["objective_score"] for p in selected), 2)
-
-    return {
-        "squad": selected,
-        "total_cost": total_cost,
-        "budget_left": round(_safe_float(budget_limit) - total_cost, 1),
-        "objective_score": total_objective,
-        "min_spend_used": round(min_spend_units / 10.0, 1),
-    }
+        self.build_time = time.perf_counter() - start
+
+    def exclude_squad(self, selected, min_distance):
+        """
+        Add a no-good cut: later squads are at least min_distance away.
+
+        Distance is Hamming distance between 0/1 selection vectors, 2 per
+        swapped player, so at most 15 - ceil(min_distance / 2) of the
+        selected players may stay.
+        Args:
+            selected: pool indices of the squad to move away from
+            min_distance: int Hamming distance (at least 1)
+        """
+        swaps = max(1, (int(min_distance) + 1) // 2)
+        squad_size = sum(wildcard_solvers.SQUAD_SHAPE.values())
+        members = np.zeros(len(self.model["ids"]), dtype=bool)
+        members[selected] = True
+        self.cuts.append((members, squad_size - swaps))
+        self.backend.add_cut(selected, squad_size - swaps)
+
+    def _start_squad(self, squad, min_spend_units, include=()):
+        """
+        Warm start for a solve: squad itself if still feasible, else the
+        best-scoring squad one same-position swap away that meets the spend
+        floor, budget, team caps, no-good cuts and forced players.
+        Args:
+            squad: pool indices of a valid squad (e.g. the last incumbent)
+            min_spend_units: spend floor of the solve in tenths of a million
+            include: pool indices forced into the squad for the solve
+        Returns:
+            np.ndarray of pool indices, or None if no such squad exists
+        """
+        if squad is None or not self.backend.warm_start:
+            return None
+        cost, objective = self.model["cost_units"], self.model["objective"]
+        pos, team = self.model["pos"], self.team_code
+        squad = np.sort(np.asarray(squad, dtype=np.int64))
+        in_squad = np.zeros(len(cost), dtype=bool)
+        in_squad[squad] = True
+        missing = [int(i) for i in include if not in_squad[i]]
+        if len(missing) > 1:
+            return None
+        spend = int(cost[squad].sum())
+        team_counts = np.bincount(team[squad], minlength=team.max() + 1)
+        overlaps = [int(members[squad].sum()) for members, _ in self.cuts]
+        if (
+            not missing
+            and min_spend_units <= spend <= self.budget_units
+            and all(o <= cap for o, (_, cap) in zip(overlaps, self.cuts))
+        ):
+            return squad
+
+        candidates = np.array(missing) if missing else np.flatnonzero(~in_squad)
+        best, best_value = None, -np.inf
+        for out in squad:
+            if out in include:
+                continue
+            incoming = candidates[pos[candidates] == pos[out]]
+            new_spend = spend - cost[out] + cost[incoming]
+            ok = (new_spend >= min_spend_units) & (new_spend <= self.budget_units)
+            same_team = team[incoming] == team[out]
+            counts = team_counts[team[incoming]] + 1 - same_team
+            ok &= ~self.team_capped[incoming] | (counts <= wildcard_solvers.TEAM_CAP)
+            for (members, cap), overlap in zip(self.cuts, overlaps):
+                ok &= overlap - members[out] + members[incoming] <= cap
+            if not ok.any():
+                continue
+            incoming = incoming[ok]
+            value = float(objective[squad].sum() - objective[out])
+            top = int(np.argmax(objective[incoming]))
+            if value + objective[incoming[top]] > best_value:
+                best_value = value + float(objective[incoming[top]])
+                best = np.sort(np.append(squad[squad != out], incoming[top]))
+        return best
+
+    def solve(self, min_spend, label=""):
+        """
+        Solve with a spend floor.
+        Args:
+            min_spend: float minimum squad cost (0 for no floor)
+            label: name of the solve in the timing breakdown
+        Returns:
+            dict: selected pool indices, costs and objective, or None
+        """
+        min_spend_units = int(round(max(0.0, _safe_float(min_spend)) * 10))
+        start = time.perf_counter()
+        incumbent = self._start_squad(self.incumbent, min_spend_units)
+        status, selected, stats = self.backend.solve(
+            min_spend_units,
+            incumbent,
+            time_limit=self.time_limit,
+            gap=self.gap,
+        )
+        self.solves.append(
+            {
+                "label": label,
+                "min_spend": round(min_spend_units / 10.0, 1),
+                "status": status,
+                "seconds": round(time.perf_counter() - start, 4),
+                "warm_start": incumbent is not None,
+                "nodes": stats["nodes"],
+                "gap": stats["gap"],
+            }
+        )
+        if selected is None:
+            return None
+        self.incumbent = selected
+        result = self._result(selected, min_spend_units)
+        result["optimal"] = status == "Optimal"
+        result["gap"] = stats["gap"]
+        return result
+
+    def solve_including(self, index, min_spend, deadline=None, start_from=None):
+        """
+        Solve with one pool player forced into the squad.
+
+        Leaves the incumbent and the timing breakdown alone, so it can run
+        in several threads at once (backends serialise if they must). The
+        solve stops at the solver time limit or at deadline, if sooner.
+        Args:
+            index: pool index of the player to force in
+            min_spend: float minimum squad cost (0 for no floor)
+            deadline: time.perf_counter() value to stop by, or None
+            start_from: squad to warm-start from (one swap away), or None
+        Returns:
+            tuple: (status, solve result dict or None, seconds)
+        """
+        min_spend_units = int(round(max(0.0, _safe_float(min_spend)) * 10))
+        start = time.perf_counter()
+        incumbent = self._start_squad(start_from, min_spend_units, [int(index)])
+        time_limit = self.time_limit
+        if deadline is not None:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return "Not Solved", None, time.perf_counter() - start
+            time_limit = remaining if time_limit is None else min(time_limit, remaining)
+        status, selected, stats = self.backend.solve(
+            min_spend_units,
+            incumbent,
+            include=[int(index)],
+            time_limit=time_limit,
+            gap=self.gap,
+        )
+        elapsed = time.perf_counter() - start
+        if selected is None:
+            return status, None, elapsed
+        result = self._result(selected, min_spend_units)
+        result["optimal"] = status == "Optimal"
+        result["gap"] = stats["gap"]
+        return status, result, elapsed
+
+    def _result(self, selected, min_spend_units):
+        """Costs and objective of a solved squad."""
+        total_cost = round(int(self.model["cost_units"][selected].sum()) / 10.0, 1)
+        total_objective = round(float(self.model["objective"][selected].sum()), 2)
+        return {
+            "selected": selected,
+            "total_cost": total_cost,
+            "budget_left": round(self.budget_limit - total_cost, 1),
+            "objective_score": total_objective,
+            "min_spend_used": round(min_spend_units / 10.0, 1),
+        }
 
 
-def _exclusion_reason(player, selected, selected_team_counts):
+def _exclusion_reason(pos, team, score, selected_pos, selected_scores, team_counts):
     """Heuristic reason why an excluded player is not in selected squad."""
-    team = player.get("team_name", "")
-    pos = player.get("pos", "")
-
-    if selected_team_counts.get(team, 0) >= 3:
+    if team_counts.get(team, 0) >= 3:
         return f"team cap reached for {team}"
 
-    selected_same_pos = [p for p in selected if p.get("pos") == pos]
-    if selected_same_pos:
-        min_score = min(p.get("objective_score", 0.0) for p in selected_same_pos)
-        if player.get("objective_score", 0.0) <= min_score:
+    same_pos = selected_pos == pos
+    if same_pos.any():
+        min_score = selected_scores[same_pos].min()
+        if score <= min_score:
             return f"lower objective score than selected {pos} players"
 
     return "excluded by combined budget/formation constraints"
 
 
-def _top_excluded(players, selected, count=5):
+def _top_excluded(model, selected, count=5):
     """Return top excluded players by objective score with heuristic reasons."""
-    selected_ids = {p["id"] for p in selected}
-    selected_team_counts = Counter(p.get("team_name", "") for p in selected)
+    objective = model["objective"]
+    selected_team_counts = Counter(model["team"][selected])
+    selected_pos = model["pos"][selected]
+    selected_scores = objective[selected]
 
-    excluded = [p for p in players if p["id"] not in selected_ids]
-    excluded.sort(key=lambda p: p.get("objective_score", 0.0), reverse=True)
+    excluded = np.setdiff1d(np.arange(len(objective)), selected)
+    excluded = excluded[np.argsort(-objective[excluded], kind="stable")][:count]
 
     top = []
-    for player in excluded[:count]:
+    for i, player in zip(excluded, model["pool"].take(excluded)):
         top.append(
             {
+                "id": player.get("id"),
                 "name": player.get("web_name", ""),
                 "team": player.get("team_name", ""),
                 "pos": player.get("pos", ""),
                 "cost": player.get("now_cost(m)", 0.0),
                 "rating": round(_safe_float(player.get("rating", 0.0)), 2),
-                "objective_score": round(player.get("objective_score", 0.0), 2),
-                "reason": _exclusion_reason(player, selected, selected_team_counts),
+                "objective_score": round(float(objective[i]), 2),
+                "reason": _exclusion_reason(
+                    player.get("pos", ""),
+                    player.get("team_name", ""),
+                    objective[i],
+                    selected_pos,
+                    selected_scores,
+                    selected_team_counts,
+                ),
             }
         )
     return top
 
 
-def optimize_wildcard_squad(wildcard_pool, budget_limit, min_spend_gap=2.0):
+def _exact_exclusions(solver, best, kept, full_model, top_excluded, time_limit):
+    """
+    Replace heuristic exclusion reasons with forced-inclusion re-solves.
+
+    Each excluded player is forced into the squad on the same model, in a
+    shared thread pool, with the spend floor of the best squad. Every
+    re-solve stops by the shared time_limit deadline, and all of them have
+    returned before this does, so no cut can change the model under a
+    running solve. Entries gain the objective loss and the other players
+    swapped; players not re-solved in time keep their heuristic reason.
+    Args:
+        solver: WildcardModel that produced best (before any no-good cut)
+        best: WildcardModel.solve result of the best squad
+        kept: full-model index per solver pool index
+        full_model: solver arrays of every player (_build_model)
+        top_excluded: entries from _top_excluded, updated in place
+        time_limit: seconds to wait for all re-solves
+    """
+    index_of = {pid: i for i, pid in enumerate(full_model["ids"].tolist())}
+    names = full_model["pool"].column("web_name")
+    chosen = set(kept[best["selected"]].tolist())
+    executor = _exclusion_executor()
+    deadline = time.perf_counter() + time_limit
+    futures = {
+        executor.submit(
+            solver.solve_including,
+            int(np.searchsorted(kept, index_of[entry["id"]])),
+            best["min_spend_used"],
+            deadline,
+            best["selected"],
+        ): entry
+        for entry in top_excluded
+    }
+    _, pending = wait(futures, timeout=time_limit)
+    for future in pending:
+        future.cancel()
+    # Re-solves already running stop at the deadline; wait for them
+    wait([future for future in pending if not future.cancelled()])
+
+    for future, entry in futures.items():
+        entry["exact"] = not future.cancelled()
+        if not entry["exact"]:
+            entry["reason"] += " (not re-solved within the time limit)"
+            continue
+        status, forced, seconds = future.result()
+        entry["solve_time"] = round(seconds, 4)
+        if forced is None:
+            entry["objective_loss"] = None
+            if status == "Infeasible":
+                entry["reason"] = "no feasible squad includes this player"
+            else:
+                entry["exact"] = False
+                entry["reason"] += " (no squad found within the solver time limit)"
+            continue
+        rows = set(kept[forced["selected"]].tolist()) - {index_of[entry["id"]]}
+        loss = round(best["objective_score"] - forced["objective_score"], 2)
+        entry["objective_loss"] = loss
+        entry["swaps_out"] = [names[i] for i in sorted(chosen - rows)]
+        entry["swaps_in"] = [names[i] for i in sorted(rows - chosen)]
+        moves = f"out {', '.join(entry['swaps_out'])}"
+        if entry["swaps_in"]:
+            moves += f", also in {', '.join(entry['swaps_in'])}"
+        if forced["optimal"]:
+            entry["reason"] = f"forcing in costs {loss:.2f} objective ({moves})"
+        else:
+            entry["exact"] = False
+            entry["reason"] = (
+                f"forcing in costs at most {loss:.2f} objective ({moves}; "
+                "solver stopped at its limit)"
+            )
+
+
+def _build_model(wildcard_pool):
+    """Collect unique pool players into the arrays the solver works on."""
+    views = list(wildcard_pool.values())
+    table = views[0].table
+    rows = np.concatenate([view.rows for view in views])
+    # Drop duplicate players, keeping first occurrence order
+    _, first = np.unique(table.ids[rows], return_index=True)
+    pool = table.view(rows[np.sort(first)])
+    return {
+        "pool": pool,
+        "ids": pool.ids,
+        "pos": pool.column("pos"),
+        "team": pool.column("team_name"),
+        "objective": _objective_scores(pool),
+        "cost_units": np.round(
+            np.fromiter(map(_safe_float, pool.column("now_cost(m)")), float) * 10
+        ).astype(np.int64),
+    }
+
+
+def _subset_model(model, kept):
+    """Model arrays restricted to the pool indices in kept."""
+    return {
+        key: value.take(kept) if key == "pool" else value[kept]
+        for key, value in model.items()
+    }
+
+
+def _free_dominators(dominates, team_of, num_teams, capped, slots):
+    """
+    Dominators of each player that no squad holding the player can block.
+
+    A squad holding player i blocks a dominator by picking it (at most
+    slots - 1 others in the position) or by filling its team, other than
+    i's, to the cap (t teams take 3t of the 14 other places).
+    Args:
+        dominates: (n, n) bool, [j, i] True when j may replace i
+        team_of: team index per player
+        num_teams: num of team indexes
+        capped: bool per team index, False for players without a team
+        slots: squad places in the position
+    Returns:
+        np.ndarray: lower bound on free dominators per player
+    """
+    teams = np.zeros((len(team_of), num_teams))
+    teams[np.arange(len(team_of)), team_of] = 1.0
+    counts = dominates.T.astype(float) @ teams  # [i, team] dominators of i
+    total = counts.sum(axis=1)
+    counts[np.arange(len(team_of)), team_of] = 0.0
+    counts[:, ~capped] = 0.0
+
+    others = sum(wildcard_solvers.SQUAD_SHAPE.values()) - 1
+    top_teams = np.cumsum(-np.sort(-counts, axis=1), axis=1)
+    blocked = np.minimum(slots - 1, others)
+    for t in range(1, min(num_teams, others // wildcard_solvers.TEAM_CAP) + 1):
+        picks = min(slots - 1, others - wildcard_solvers.TEAM_CAP * t)
+        blocked = np.maximum(blocked, top_teams[:, t - 1] + picks)
+    return total - blocked
+
+
+def _undominated(model, gap_units):
+    """
+    Players that may be in an optimal squad; the rest are provably dominated.
+
+    Valid for any budget B with no spend floor or one of at least B - gap
+    (squads cost far more than gap). Player j may
+    replace i when both play the same position and j scores higher (ties
+    broken by pool order). If a squad holding i spends at least
+    `cheaper` above the floor, any j up to that much cheaper keeps it
+    feasible; otherwise it is more than gap - cheaper under the budget, and
+    any j up to that much dearer fits. i is dropped when, for some split,
+    both kinds of replacement survive every blocking squad
+    (_free_dominators): swapping i out never lowers the objective.
+    Args:
+        model: solver arrays (_build_model)
+        gap_units: smallest budget - spend floor used, in tenths of a million
+    Returns:
+        np.ndarray: pool indices of the players kept, in pool order
+    """
+    keep = np.ones(len(model["ids"]), dtype=bool)
+    teams, team_index = np.unique(model["team"], return_inverse=True)
+    capped = teams != ""
+    for pos, slots in wildcard_solvers.SQUAD_SHAPE.items():
+        members = np.flatnonzero(model["pos"] == pos)
+        if len(members) <= slots:
+            continue
+        score = model["objective"][members]
+        cost = model["cost_units"][members]
+        order = np.arange(len(members))
+        better = (score[:, None] > score[None, :]) | (
+            (score[:, None] == score[None, :]) & (order[:, None] < order[None, :])
+        )
+        dearer = cost[:, None] - cost[None, :]  # [j, i] cost of j above i
+
+        dropped = np.zeros(len(members), dtype=bool)
+        for cheaper in range(int(gap_units) + 1):
+            down = better & (dearer <= 0) & (dearer >= -cheaper)
+            up = better & (dearer >= 0) & (dearer <= gap_units - cheaper)
+            free = [
+                _free_dominators(d, team_index[members], len(teams), capped, slots)
+                for d in (down, up)
+            ]
+            dropped |= (free[0] >= 1) & (free[1] >= 1)
+        keep[members] = ~dropped
+    return np.flatnonzero(keep)
+
+
+def _prune_gap_units(min_spend_gap):
+    """Spend gap _undominated must respect: every floor used is this close."""
+    return round(min(_safe_float(min_spend_gap), SPEND_TOP_UP_GAP) * 10)
+
+
+def _solve_with_spend_floor(solver, min_spend_gap):
+    """
+    Solve with the spend floor, relaxing it if infeasible and topping up
+    spend when more than £4m is left.
+    Args:
+        solver: WildcardModel
+        min_spend_gap: float max budget left unused (budget - spend floor)
+    Returns:
+        dict: best WildcardModel.solve result with "fallback", or None
+    """
+    budget_limit = solver.budget_limit
+    min_spend_floor = max(0.0, budget_limit - _safe_float(min_spend_gap))
+    best = solver.solve(min_spend_floor, "initial")
+
+    if not best:
+        best = solver.solve(0.0, "relaxed")
+        if not best:
+            return None
+        best["fallback"] = "spend_floor_relaxed"
+
+    if best["budget_left"] > 4.0:
+        tighter_floor = max(0.0, budget_limit - SPEND_TOP_UP_GAP)
+        tighter = solver.solve(tighter_floor, "tightened")
+        if tighter:
+            best = tighter
+            best["fallback"] = "tightened_spend_floor"
+    return best
+
+
+def _alternative_squads(solver, best, count, min_distance):
+    """
+    Next-best squads from the same model through iterative no-good cuts.
+
+    Each squad is cut off once found, so every alternative is at least
+    min_distance from the best squad and from each other, solved with the
+    spend floor the best squad used. Alternatives are ranked within the
+    pruned pool: a squad holding a dominated player is never worth choosing
+    over the swap to its dominator.
+    Args:
+        solver: WildcardModel that produced best
+        best: WildcardModel.solve result of the best squad
+        count: num of alternatives wanted
+        min_distance: int Hamming distance between squads
+    Returns:
+        list: WildcardModel.solve results, best first (may be fewer than count)
+    """
+    found, previous = [], best["selected"]
+    for rank in range(2, count + 2):
+        solver.exclude_squad(previous, min_distance)
+        alternative = solver.solve(best["min_spend_used"], f"alternative {rank}")
+        if not alternative:
+            break
+        found.append(alternative)
+        previous = alternative["selected"]
+    return found
+
+
+def optimize_wildcard_squad(
+    wildcard_pool,
+    budget_limit,
+    min_spend_gap=2.0,
+    alternatives=constants.WILDCARD_ALTERNATIVES,
+    min_distance=constants.WILDCARD_ALT_MIN_DISTANCE,
+):
     """
     Optimize wildcard squad deterministically with hard FPL constraints.
     Args:
-        wildcard_pool: dict containing candidate players per position
+        wildcard_pool: dict of candidate PlayerView per position
         budget_limit: float budget cap
         min_spend_gap: float max budget left unused (budget - spend floor)
+        alternatives: num of next-best squads to list after the best one
+        min_distance: int Hamming distance between listed squads (2 = one
+            player swapped)
     Returns:
         dict: optimization result with squad, costs, and diagnostics
     """
-    if not HAS_PULP:
+    full_model = _build_model(wildcard_pool)
+
+    if len(full_model["ids"]) < 15:
         return {
             "valid": False,
             "errors": [
-                "PuLP is not installed. "
-                "Add 'pulp' dependency to enable wildcard optimizer."
+                "Candidate pool too small: "
+                f"only {len(full_model['ids'])} unique players."
             ],
         }
 
-    raw_players = [p for players in wildcard_pool.values() for p in players]
-    players = []
-    seen_ids = set()
-    for player in raw_players:
-        pid = player.get("id")
-        if pid in seen_ids:
-            continue
-        seen_ids.add(pid)
-        prepared = player.copy()
-        prepared["objective_score"] = _objective_score(prepared)
-        prepared["cost_units"] = int(
-            round(_safe_float(prepared.get("now_cost(m)", 0.0)) * 10)
-        )
-        players.append(prepared)
+    budget_limit = _safe_float(budget_limit)
+    start = time.perf_counter()
+    kept = _undominated(full_model, _prune_gap_units(min_spend_gap))
+    # The top excluded players are among the best-scoring squad + count; keep
+    # them all so they can be forced in on the same model
+    exclusions = constants.WILDCARD_EXCLUSION_COUNT
+    best_scoring = np.argsort(-full_model["objective"], kind="stable")
+    kept = np.union1d(kept, best_scoring[: exclusions + 15])
+    model = _subset_model(full_model, kept)
+    prune_time = time.perf_counter() - start
 
-    if len(players) < 15:
+    try:
+        solver = WildcardModel(model, budget_limit)
+    except (ValueError, RuntimeError) as e:
+        return {"valid": False, "errors": [str(e)]}
+    best = _solve_with_spend_floor(solver, min_spend_gap)
+    if not best:
+        if any(solve["status"] == "Not Solved" for solve in solver.solves):
+            error = (
+                "No wildcard squad found within the solver time limit "
+                f"({solver.time_limit:g}s per solve)."
+            )
+        else:
+            error = (
+                "No feasible wildcard squad found for this budget and candidate pool."
+            )
         return {
             "valid": False,
-            "errors": [
-                f"Candidate pool too small: only {len(players)} unique players."
-            ],
+            "errors": [error],
+            "solver": solver.backend.name,
+            "build_time": round(solver.build_time, 4),
+            "solves": solver.solves,
         }
 
-    budget_limit = _safe_float(budget_limit)
-    min_spend_floor = max(0.0, budget_limit - _safe_float(min_spend_gap))
-
-    best = _solve_wildcard(players, budget_limit, min_spend_floor)
+    selected = kept[best["selected"]]
+    top_excluded = _top_excluded(full_model, selected, count=exclusions)
+    _exact_exclusions(
+        solver,
+        best,
+        kept,
+        full_model,
+        top_excluded,
+        constants.WILDCARD_EXCLUSION_TIME_LIMIT,
+    )
 
-    if not best:
-        relaxed = _solve_wildcard(players, budget_limit, 0.0)
-        if not relaxed:
-            return {
-                "valid": False,
-                "errors": [
-                    "No feasible wildcard squad found for "
-                    "this budget and candidate pool."
-                ],
+    names = full_model["pool"].column("web_name")
+    chosen = set(selected.tolist())
+    alternative_squads = []
+    for alternative in _alternative_squads(solver, best, alternatives, min_distance):
+        rows = set(kept[alternative["selected"]].tolist())
+        alternative_squads.append(
+            {
+                "selected_ids": full_model["ids"][sorted(rows)].tolist(),
+                "total_cost": alternative["total_cost"],
+                "objective_score": alternative["objective_score"],
+                "objective_gap": round(
+                    best["objective_score"] - alternative["objective_score"], 2
+                ),
+                "players_in": [names[i] for i in sorted(rows - chosen)],
+                "players_out": [names[i] for i in sorted(chosen - rows)],
             }
-        best = relaxed
-        best["fallback"] = "spend_floor_relaxed"
-
-    if best["budget_left"] > 4.0:
-        tighter_floor = max(0.0, budget_limit - 1.5)
-        tighter = _solve_wildcard(players, budget_limit, tighter_floor)
-        if tighter:
-            best = tighter
-            best["fallback"] = "tightened_spend_floor"
+        )
 
-    selected = best["squad"]
-    top_excluded = _top_excluded(players, selected, count=5)
+    squad = full_model["pool"].take(selected).records()
+    for player, score in zip(squad, full_model["objective"][selected]):
+        player["objective_score"] = float(score)
 
     return {
         "valid": True,
         "errors": [],
-        "squad": selected,
-        "selected_ids": [p["id"] for p in selected],
+        "squad": squad,
+        "selected_ids": [p["id"] for p in squad],
         "total_cost": best["total_cost"],
         "budget_left": best["budget_left"],
         "objective_score": best["objective_score"],
         "min_spend_used": best.get("min_spend_used", 0.0),
         "fallback": best.get("fallback", ""),
+        "optimal": best["optimal"],
+        "gap": best["gap"],
         "top_excluded": top_excluded,
+        "alternatives": alternative_squads,
+        "min_distance": min_distance,
+        "pool_size": len(full_model["ids"]),
+        "pruned_pool_size": len(kept),
+        "prune_time": round(prune_time, 4),
+        "solver": solver.backend.name,
+        "build_time": round(solver.build_time, 4),
+        "solves": solver.solves,
     }
 
 
+def sweep_budgets(wildcard_pool, budgets, min_spend_gap=2.0, workers=None):
+    """
+    Solve one rated pool for a range of budgets in a process pool.
+
+    The pool is pruned once (pruning does not depend on the budget) and each
+    budget runs the same spend-floor flow as optimize_wildcard_squad. A point
+    is on the Pareto frontier when no other point spends no more for at
+    least the same objective.
+    Args:
+        wildcard_pool: dict of candidate PlayerView per position
+        budgets: iterable of float budget caps
+        min_spend_gap: float max budget left unused (budget - spend floor)
+        workers: num of worker processes (default WILDCARD_SWEEP_WORKERS)
+    Returns:
+        dict: points in budget order with squad changes, plus timings
+    """
+    start = time.perf_counter()
+    workers = constants.WILDCARD_SWEEP_WORKERS if workers is None else workers
+    budgets = sorted({round(_safe_float(budget), 1) for budget in budgets})
+    full_model = _build_model(wildcard_pool)
+    kept = _undominated(full_model, _prune_gap_units(min_spend_gap))
+    model = _subset_model(full_model, kept)
+    solve_point = partial(
+        _sweep_point,
+        model={key: value for key, value in model.items() if key != "pool"},
+        min_spend_gap=min_spend_gap,
+        backend=constants.WILDCARD_SOLVER,
+    )
+
+    solved = None
+    if workers > 1 and len(budgets) > 1:
+        try:
+            solved = list(_sweep_executor(workers).map(solve_point, budgets))
+        except BrokenProcessPool:
+            _reset_sweep_executor()
+    if solved is None:
+        workers = 1
+        solved = [solve_point(budget) for budget in budgets]
+
+    names = dict(zip(full_model["ids"].tolist(), full_model["pool"].column("web_name")))
+    points, previous = [], None
+    for point in filter(None, solved):
+        selected = kept[point.pop("selected")]
+        ids = set(full_model["ids"][selected].tolist())
+        point["squad_ids"] = sorted(ids)
+        point["gain"] = 0.0
+        point["players_in"], point["players_out"] = [], []
+        if previous is not None:
+            point["gain"] = round(
+                point["objective_score"] - previous["objective_score"], 2
+            )
+            point["players_in"] = [
+                names[pid] for pid in sorted(ids - set(previous["squad_ids"]))
+            ]
+            point["players_out"] = [
+                names[pid] for pid in sorted(set(previous["squad_ids"]) - ids)
+            ]
+        points.append(point)
+        previous = point
+
+    for point in points:
+        point["pareto"] = not any(
+            other["total_cost"] <= point["total_cost"]
+            and other["objective_score"] >= point["objective_score"]
+            and (
+                other["total_cost"] < point["total_cost"]
+                or other["objective_score"] > point["objective_score"]
+            )
+            for other in points
+        )
+
+    return {
+        "points": points,
+        "infeasible": [b for b, point in zip(budgets, solved) if point is None],
+        "workers": workers,
+        "pool_size": len(full_model["ids"]),
+        "pruned_pool_size": len(kept),
+        "elapsed": round(time.perf_counter() - start, 3),
+    }
+
+
+def _sweep_point(budget_limit, model, min_spend_gap, backend):
+    """Solve one sweep budget; runs in a worker process."""
+    solver = WildcardModel(model, budget_limit, backend)
+    best = _solve_with_spend_floor(solver, min_spend_gap)
+    if not best:
+        return None
+    return {
+        "budget": budget_limit,
+        "selected": best["selected"],
+        "total_cost": best["total_cost"],
+        "budget_left": best["budget_left"],
+        "objective_score": best["objective_score"],
+        "fallback": best.get("fallback", ""),
+        "solve_time": round(sum(solve["seconds"] for solve in solver.solves), 4),
+    }
+
+
+_sweep_pool = None
+_sweep_pool_workers = None
+_exclusion_pool = None
+_sweep_pool_lock = threading.Lock()
+
+
+def _sweep_executor(workers):
+    """
+    Process pool shared by sweeps in this process, started on first use.
+
+    Workers are spawned, not forked, so they never inherit the threads and
+    locks of a running web worker; the start-up cost is paid once per pool
+    size. A sweep asking for a different number of workers replaces the
+    pool; sweeps already queued on the old one still finish.
+    """
+    global _sweep_pool, _sweep_pool_workers
+    with _sweep_pool_lock:
+        if _sweep_pool is not None and _sweep_pool_workers != workers:
+            _sweep_pool.shutdown(wait=False)
+            _sweep_pool = None
+        if _sweep_pool is None:
+            _sweep_pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            _sweep_pool_workers = workers
+        return _sweep_pool
+
+
+def _exclusion_executor():
+    """Thread pool shared by exclusion re-solves, started on first use."""
+    global _exclusion_pool
+    with _sweep_pool_lock:
+        if _exclusion_pool is None:
+            _exclusion_pool = ThreadPoolExecutor(
+                max_workers=constants.WILDCARD_EXCLUSION_WORKERS,
+                thread_name_prefix="wildcard-exclusion",
+            )
+        return _exclusion_pool
+
+
+def _reset_sweep_executor():
+    """Drop a broken process pool so the next sweep starts a new one."""
+    global _sweep_pool
+    with _sweep_pool_lock:
+        if _sweep_pool is not None:
+            _sweep_pool.shutdown(wait=False, cancel_futures=True)
+        _sweep_pool = None
+
+
+def _format_gap(gap):
+    """Relative MIP gap as a percentage ("unknown" if not reported)."""
+    return "unknown" if gap is None else f"{gap:.2%}"
+
+
 def format_optimizer_diagnostics(result, budget_limit):
     """Format deterministic optimizer diagnostics for report output."""
     lines = [
@@ -229,6 +830,50 @@ def format_optimizer_diagnostics(result, budget_limit):
     if fallback:
         lines.append(f"Optimizer adjustment: {fallback}")
 
+    if result.get("optimal") is False:
+        lines.append(
+            f"Solver stopped at its limit: best squad found is within "
+            f"{_format_gap(result.get('gap'))} of optimal"
+        )
+
+    solves = result.get("solves", [])
+    if solves:
+        lines.append("")
+        if result.get("pool_size"):
+            lines.append(
+                f"Candidate pool: {result['pruned_pool_size']} of "
+                f"{result['pool_size']} players left after dominance pruning "
+                f"({result.get('prune_time', 0.0) * 1000:.0f} ms)"
+            )
+        lines.append(
+            f"Solver timings ({result.get('solver', '')} model built once in "
+            f"{result.get('build_time', 0.0) * 1000:.0f} ms):"
+        )
+        for solve in solves:
+            nodes = solve.get("nodes")
+            lines.append(
+                f"- {solve['label']} (floor £{solve['min_spend']:.1f}m): "
+                f"{solve['status']} in {solve['seconds'] * 1000:.0f} ms, "
+                f"{'?' if nodes is None else nodes} nodes, "
+                f"gap {_format_gap(solve.get('gap'))}"
+                f"{', warm start' if solve['warm_start'] else ''}"
+            )
+
+    alternatives = result.get("alternatives", [])
+    if alternatives:
+        lines.append("")
+        lines.append(
+            f"Alternative squads (Hamming distance >= {result.get('min_distance')} "
+            "from each other):"
+        )
+        for rank, squad in enumerate(alternatives, start=2):
+            lines.append(
+                f"{rank}. objective {squad['objective_score']:.2f} "
+                f"(-{squad['objective_gap']:.2f}), £{squad['total_cost']:.1f}m - "
+                f"In: {', '.join(squad['players_in'])} / "
+                f"Out: {', '.join(squad['players_out'])}"
+            )
+
     top_excluded = result.get("top_excluded", [])
     if top_excluded:
         lines.append("")
@@ -0,0 +1,506 @@
+"""
+Wildcard ILP solver backends, selected by WILDCARD_SOLVER.
+
+HiGHS runs in-process through scipy.optimize.milp, CBC through PuLP (solves
+serialised by a lock), and the NumPy branch and bound needs no extra
+dependency (per-position knapsack DP relaxation, branching on broken team
+caps and no-good cuts). Every backend supports add_cut and forcing players
+in with solve(..., include=...); a solve stops at WILDCARD_SOLVER_TIME_LIMIT
+seconds or the WILDCARD_SOLVER_GAP relative gap and returns its best squad
+so far with the status, node count and gap
+(benchmarks.bench_wildcard_solvers checks the backends agree).
+"""
+
+import heapq
+import importlib.util
+import os
+import re
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+# Solver libraries are imported when a backend is built, not at worker boot
+HAS_PULP = importlib.util.find_spec("pulp") is not None
+HAS_SCIPY = importlib.util.find_spec("scipy") is not None
+
+SQUAD_SHAPE = {"GKP": 2, "DEF": 5, "MID": 5, "FWD": 3}
+TEAM_CAP = 3
+
+
+class PulpBackend:
+    """
+    CBC through PuLP.
+
+    The problem is built once and grows only by no-good cuts; each solve
+    writes it to a file and runs CBC in a subprocess, warm-started from a
+    given incumbent.
+    """
+
+    name = "cbc"
+    warm_start = True
+
+    def __init__(self, model, budget_units):
+        from pulp import LpBinary, LpMaximize, LpProblem, LpVariable, lpSum
+
+        n = len(model["ids"])
+        cost_units = model["cost_units"]
+        self.problem = LpProblem("wildcard_squad", LpMaximize)
+        self.x = [
+            LpVariable(f"x_{pid}", lowBound=0, upBound=1, cat=LpBinary)
+            for pid in model["ids"]
+        ]
+        x = self.x
+
+        self.problem += lpSum(x[i] * float(model["objective"][i]) for i in range(n))
+
+        self.problem += lpSum(x) == sum(SQUAD_SHAPE.values())
+
+        for pos, expected_count in SQUAD_SHAPE.items():
+            members = np.flatnonzero(model["pos"] == pos)
+            self.problem += lpSum(x[i] for i in members) == expected_count
+
+        for team in sorted(set(model["team"])):
+            if not team:
+                continue
+            members = np.flatnonzero(model["team"] == team)
+            self.problem += lpSum(x[i] for i in members) <= TEAM_CAP
+
+        spend = lpSum(x[i] * int(cost_units[i]) for i in range(n))
+        self.problem += spend <= budget_units
+        # Right-hand side set per solve; a zero floor leaves it inactive
+        self.problem += spend >= 0, "spend_floor"
+        self.lock = threading.Lock()
+
+    def add_cut(self, selected, max_overlap):
+        """Allow at most max_overlap of the selected players from now on."""
+        from pulp import lpSum
+
+        with self.lock:
+            self.problem += lpSum(self.x[i] for i in selected) <= max_overlap
+
+    def solve(
+        self, min_spend_units, incumbent=None, include=(), time_limit=None, gap=0.0
+    ):
+        """
+        Solve with a spend floor.
+
+        The PuLP model is changed in place for each solve, so concurrent
+        solves on one backend run one at a time; time_limit counts from the
+        call, so time spent waiting for another solve is part of it. Nodes
+        and gap are read from the CBC log.
+        Args:
+            min_spend_units: minimum squad cost in tenths of a million
+            incumbent: pool indices of a squad meeting the floor, or None
+            include: pool indices forced into the squad for this solve
+            time_limit: seconds before CBC stops with its incumbent (None = no limit)
+            gap: relative gap at which CBC stops
+        Returns:
+            tuple: (status, selected pool indices or None, solve stats)
+        """
+        from pulp import PULP_CBC_CMD, LpSolutionIntegerFeasible, LpSolutionOptimal
+
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+        handle, log_path = tempfile.mkstemp(prefix="cbc_", suffix=".log")
+        os.close(handle)
+        with self.lock:
+            if deadline is not None:
+                time_limit = deadline - time.perf_counter()
+                if time_limit <= 0:
+                    os.remove(log_path)
+                    return "Not Solved", None, {"nodes": 0, "gap": None}
+            self.problem.constraints["spend_floor"].constant = -min_spend_units
+            if incumbent is not None:
+                chosen = set(incumbent.tolist())
+                for i, var in enumerate(self.x):
+                    var.setInitialValue(1 if i in chosen else 0)
+            for i in include:
+                self.x[i].lowBound = 1
+            try:
+                self.problem.solve(
+                    PULP_CBC_CMD(
+                        msg=False,
+                        warmStart=incumbent is not None,
+                        timeLimit=time_limit,
+                        gapRel=gap,
+                        logPath=log_path,
+                    )
+                )
+                stats = _cbc_stats(log_path)
+            finally:
+                for i in include:
+                    self.x[i].lowBound = 0
+                os.remove(log_path)
+            solution = self.problem.sol_status
+            if solution == LpSolutionOptimal:
+                status = "Optimal"
+            elif solution == LpSolutionIntegerFeasible:
+                status = "Time limit"
+            else:
+                status = "Infeasible" if solution < 0 else "Not Solved"
+                return status, None, stats
+            selected = [i for i, var in enumerate(self.x) if var.value() == 1]
+        if status == "Optimal" and stats["gap"] is None:
+            stats["gap"] = 0.0
+        return status, np.array(selected, dtype=np.int64), stats
+
+
+class HighsBackend:
+    """
+    HiGHS in-process through scipy.optimize.milp.
+
+    The constraint matrix is built once and grows only by no-good cuts; a
+    solve only changes the lower bound of the spend row. HiGHS is called in
+    memory, with no files or subprocess. SciPy passes no starting solution
+    to HiGHS, so an incumbent warm-starts a solve as an objective cutoff:
+    only squads at least as good are searched, and the incumbent is
+    returned if HiGHS stops before finding one.
+    """
+
+    name = "highs"
+    warm_start = True
+
+    def __init__(self, model, budget_units):
+        from scipy.optimize import LinearConstraint
+
+        n = len(model["ids"])
+        teams = [team for team in sorted(set(model["team"])) if team]
+        rows = [np.ones(n)]
+        rows += [model["pos"] == pos for pos in SQUAD_SHAPE]
+        rows += [model["team"] == team for team in teams]
+        rows.append(model["cost_units"])
+        lower = np.array(
+            [sum(SQUAD_SHAPE.values()), *SQUAD_SHAPE.values()] + [0] * len(teams) + [0],
+            dtype=float,
+        )
+        upper = np.array(
+            [sum(SQUAD_SHAPE.values()), *SQUAD_SHAPE.values()]
+            + [TEAM_CAP] * len(teams)
+            + [budget_units],
+            dtype=float,
+        )
+        # (matrix, lower, upper) replaced as one, so a solve never sees a
+        # half-added cut
+        self.rows = (np.array(rows, dtype=float), lower, upper)
+        self.spend_row = len(rows) - 1
+        self.objective = -np.asarray(model["objective"], dtype=float)
+        self.constraint_type = LinearConstraint
+
+    def add_cut(self, selected, max_overlap):
+        """Allow at most max_overlap of the selected players from now on."""
+        matrix, lower, upper = self.rows
+        row = np.zeros(len(self.objective))
+        row[selected] = 1.0
+        self.rows = (
+            np.vstack([matrix, row]),
+            np.append(lower, 0.0),
+            np.append(upper, float(max_overlap)),
+        )
+
+    def solve(
+        self, min_spend_units, incumbent=None, include=(), time_limit=None, gap=0.0
+    ):
+        """
+        Solve with a spend floor. Solves do not change the backend, so
+        several may run at once.
+        Args:
+            min_spend_units: minimum squad cost in tenths of a million
+            incumbent: pool indices of a feasible squad (objective cutoff),
+                or None
+            include: pool indices forced into the squad for this solve
+            time_limit: seconds before HiGHS stops with its incumbent (None = no limit)
+            gap: relative gap at which HiGHS stops (its own default is 0.01%)
+        Returns:
+            tuple: (status, selected pool indices or None, solve stats)
+        """
+        from scipy.optimize import Bounds, milp
+
+        matrix, lower, upper = self.rows
+        lower = lower.copy()
+        lower[self.spend_row] = min_spend_units
+        if incumbent is not None:
+            cutoff = float(self.objective[incumbent].sum())
+            matrix = np.vstack([matrix, self.objective])
+            lower = np.append(lower, -np.inf)
+            upper = np.append(upper, cutoff + 1e-6 * max(1.0, abs(cutoff)))
+        forced = np.zeros(len(self.objective))
+        forced[list(include)] = 1.0
+        options = {"mip_rel_gap": gap}
+        if time_limit is not None:
+            options["time_limit"] = time_limit
+        result = milp(
+            self.objective,
+            constraints=self.constraint_type(matrix, lower, upper),
+            integrality=np.ones(len(self.objective)),
+            bounds=Bounds(forced, 1),
+            options=options,
+        )
+        stats = {
+            "nodes": getattr(result, "mip_node_count", None),
+            "gap": getattr(result, "mip_gap", None),
+        }
+        if result.status == 0:
+            return "Optimal", np.flatnonzero(result.x > 0.5), stats
+        if result.status == 1 and result.x is not None:
+            return "Time limit", np.flatnonzero(result.x > 0.5), stats
+        if incumbent is not None and result.status in (1, 2):
+            # Nothing beats the incumbent (2), or none found in time (1)
+            if result.status == 2:
+                stats["gap"] = 0.0
+                return "Optimal", np.sort(incumbent), stats
+            return "Time limit", np.sort(incumbent), stats
+        status = {1: "Not Solved", 2: "Infeasible"}.get(result.status, "Undefined")
+        return status, None, stats
+
+
+def _position_table(values, costs, count, budget):
+    """
+    Knapsack DP for one position.
+    Returns:
+        np.ndarray: (players + 1, count + 1, budget + 1) best value using the
+            first i players, choosing exactly j, at total cost c (-inf if none)
+    """
+    table = np.full((len(values) + 1, count + 1, budget + 1), -np.inf)
+    table[0, 0, 0] = 0.0
+    for i, (value, cost) in enumerate(zip(values, costs)):
+        table[i + 1] = table[i]
+        if count and cost <= budget:
+            np.maximum(
+                table[i + 1, 1:, cost:],
+                table[i, :-1, : budget + 1 - cost] + value,
+                out=table[i + 1, 1:, cost:],
+            )
+    return table
+
+
+def _max_plus(left, right):
+    """
+    Max-plus convolution over cost.
+    Returns:
+        tuple: (best left[c - s] + right[s] per c, the s used per c)
+    """
+    best = np.full_like(left, -np.inf)
+    split = np.full(len(left), -1, dtype=np.int64)
+    for s in np.flatnonzero(np.isfinite(right)):
+        candidate = left[: len(left) - s] + right[s]
+        better = candidate > best[s:]
+        best[s:][better] = candidate[better]
+        split[s:][better] = s
+    return best, split
+
+
+class BranchBoundBackend:
+    """
+    Exact NumPy branch and bound for the 15-player squad structure.
+
+    Without the "at most k of these players" limits (3-per-team caps and
+    no-good cuts) the problem separates by position: a knapsack DP per
+    position gives the best value of each (count, cost), and a max-plus
+    convolution over cost combines the positions, so the relaxation is solved
+    exactly for any spend between the floor and the budget. When its squad
+    breaks a limit, the node is split on the limit's selected players (drop
+    the first; keep it and drop the second; ...). Nodes are explored best
+    bound first, so the first squad within every limit is optimal.
+    """
+
+    name = "bnb"
+    warm_start = True
+
+    def __init__(self, model, budget_units):
+        self.objective = np.asarray(model["objective"], dtype=float)
+        self.cost = np.asarray(model["cost_units"], dtype=np.int64)
+        self.budget_units = int(budget_units)
+        self.groups = {pos: np.flatnonzero(model["pos"] == pos) for pos in SQUAD_SHAPE}
+        # (member set, most members in a squad)
+        self.limits = [
+            (set(np.flatnonzero(model["team"] == team).tolist()), TEAM_CAP)
+            for team in sorted(set(model["team"]))
+            if team
+        ]
+
+    def add_cut(self, selected, max_overlap):
+        """Allow at most max_overlap of the selected players from now on."""
+        # Rebound rather than appended, so running solves keep a stable list
+        self.limits = self.limits + [
+            (set(np.asarray(selected).tolist()), int(max_overlap))
+        ]
+
+    def _relaxation(self, forced_in, forced_out, min_spend_units):
+        """Best squad ignoring the limits; (value, selected) or None."""
+        base_cost = int(self.cost[forced_in].sum())
+        budget = self.budget_units - base_cost
+        if budget < 0:
+            return None
+
+        # Forced players are placed already; a limit they fill admits no one else
+        blocked = set(forced_in) | set(forced_out)
+        for members, cap in self.limits:
+            forced = len(members.intersection(forced_in))
+            if forced > cap:
+                return None
+            if forced == cap:
+                blocked |= members
+
+        tables, members, total, splits = [], [], None, []
+        for pos, shape in SQUAD_SHAPE.items():
+            group = self.groups[pos]
+            count = shape - int(np.isin(forced_in, group).sum())
+            group = group[~np.isin(group, list(blocked))]
+            if count < 0 or len(group) < count:
+                return None
+            table = _position_table(
+                self.objective[group], self.cost[group], count, budget
+            )
+            tables.append((table, count))
+            members.append(group)
+            row = table[-1, count]
+            if total is None:
+                total = row
+            else:
+                total, split = _max_plus(total, row)
+                splits.append(split)
+
+        floor = max(0, int(min_spend_units) - base_cost)
+        if floor > budget or not np.isfinite(total[floor:]).any():
+            return None
+        spend = floor + int(np.argmax(total[floor:]))
+
+        # Walk the convolutions and the per-position DPs back to the players
+        selected = list(forced_in)
+        for position in range(len(tables) - 1, -1, -1):
+            table, count = tables[position]
+            if position:
+                own = int(splits[position - 1][spend])
+            else:
+                own = spend
+            spend -= own
+            group = members[position]
+            for i in range(len(group) - 1, -1, -1):
+                if count and table[i + 1, count, own] != table[i, count, own]:
+                    selected.append(int(group[i]))
+                    count -= 1
+                    own -= int(self.cost[group[i]])
+
+        selected = np.sort(np.array(selected, dtype=np.int64))
+        return float(self.objective[selected].sum()), selected
+
+    def _broken_limit(self, selected):
+        """Selected members of the most exceeded limit, or None."""
+        chosen = set(selected.tolist())
+        excess, worst = 0, None
+        for members, cap in self.limits:
+            inside = members & chosen
+            if len(inside) - cap > excess:
+                excess, worst = len(inside) - cap, sorted(inside)
+        return worst
+
+    def solve(
+        self, min_spend_units, incumbent=None, include=(), time_limit=None, gap=0.0
+    ):
+        """
+        Solve with a spend floor. Solves do not change the backend, so
+        several may run at once.
+
+        A relaxation that keeps every limit is a feasible squad and becomes
+        the incumbent; the search stops once no open node can beat it by
+        more than gap, or at time_limit with the incumbent so far.
+        Args:
+            min_spend_units: minimum squad cost in tenths of a million
+            incumbent: pool indices of a feasible squad, or None
+            include: pool indices forced into the squad for this solve
+            time_limit: seconds before the search stops (None = no limit)
+            gap: relative gap at which the search stops
+        Returns:
+            tuple: (status, selected pool indices or None, solve stats)
+        """
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+        best = None if incumbent is None else np.sort(incumbent)
+        best_value = -np.inf if best is None else float(self.objective[best].sum())
+        heap = []
+        nodes = 0
+
+        def push(forced_in, forced_out):
+            nonlocal best, best_value, nodes
+            nodes += 1
+            node = self._relaxation(forced_in, forced_out, min_spend_units)
+            if node is None or node[0] <= best_value:
+                return
+            inside = self._broken_limit(node[1])
+            if inside is None:
+                best, best_value = node[1], node[0]
+            else:
+                heapq.heappush(heap, (-node[0], nodes, forced_in, forced_out, inside))
+
+        status = "Optimal"
+        push(sorted(int(i) for i in include), frozenset())
+        while heap and -heap[0][0] - best_value > gap * abs(heap[0][0]):
+            if deadline is not None and time.perf_counter() > deadline:
+                status = "Time limit"
+                break
+            _, _, forced_in, forced_out, inside = heapq.heappop(heap)
+            # Any squad within the limit drops at least one of these players
+            free = [i for i in inside if i not in forced_in]
+            for k, player in enumerate(free):
+                push(forced_in + free[:k], forced_out | {player})
+
+        stats = {"nodes": nodes, "gap": None}
+        if best is None:
+            return ("Infeasible" if status == "Optimal" else "Not Solved"), None, stats
+        bound = max(best_value, -heap[0][0]) if heap else best_value
+        stats["gap"] = (bound - best_value) / max(abs(bound), 1e-9)
+        return status, best, stats
+
+
+def _cbc_stats(log_path):
+    """Enumerated nodes and final gap from a CBC log (None if not reported)."""
+    try:
+        with open(log_path) as f:
+            log = f.read()
+    except OSError:
+        log = ""
+    nodes = re.search(r"Enumerated nodes:\s+(\d+)", log)
+    gap = re.search(r"^Gap:\s+([-\d.eE+]+)", log, re.MULTILINE)
+    return {
+        "nodes": int(nodes.group(1)) if nodes else None,
+        "gap": max(0.0, float(gap.group(1))) if gap else None,
+    }
+
+
+BACKENDS = {
+    "cbc": (PulpBackend, HAS_PULP),
+    "highs": (HighsBackend, HAS_SCIPY),
+    "bnb": (BranchBoundBackend, True),
+}
+AUTO_ORDER = ["highs", "cbc", "bnb"]
+
+
+def make_backend(name, model, budget_units):
+    """
+    Build a solver backend for a wildcard model.
+    Args:
+        name: backend key in BACKENDS, or "auto" for the first available
+            in AUTO_ORDER
+        model: solver arrays (wildcard_optimizer._build_model)
+        budget_units: budget cap in tenths of a million
+    Returns:
+        backend object with name, warm_start, add_cut(selected, max_overlap)
+            and solve(min_spend_units, incumbent, include, time_limit, gap)
+    Raises:
+        ValueError: unknown backend name
+        RuntimeError: backend library not installed
+    """
+    if name == "auto":
+        name = next(key for key in AUTO_ORDER if BACKENDS[key][1])
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Unknown wildcard solver '{name}'. "
+            f"Choose one of: auto, {', '.join(BACKENDS)}."
+        )
+    backend, available = BACKENDS[name]
+    if not available:
+        library = {"cbc": "pulp", "highs": "scipy"}[name]
+        raise RuntimeError(
+            f"The '{name}' wildcard solver needs '{library}', which is not installed."
+        )
+    return backend(model, budget_units)
@@ -1,6 +1,5 @@
-import json
-
 # Local imports
+from ai import prompt_builder
 from utils import format_date, print_output
 from models import replacements
 
@@ -46,12 +45,13 @@ def transfer(bank, sorted_players, sorted_current):
         print(f"REPLACEMENT SUGGESTIONS FOR {num_of_replacements} PLAYERS")
         print("=" * 60)
         # Generate replacement suggestions
-        player_replacement_options = {}
-        for player in sorted_current[:num_of_replacements]:
-            # Get a list a 4 replacement players for player
-            candidates = replacements.find_replacements(
-                player, bank, sorted_players, sorted_current
-            )
+        # Get a list of 4 replacement players for each player, in one batch
+        replacement_options = replacements.find_replacements_batch(
+            sorted_current[:num_of_replacements], bank, sorted_players, sorted_current
+        )
+        for player, candidates in zip(
+            sorted_current[:num_of_replacements], replacement_options
+        ):
             player_name = player.get("web_name", "")
             player_pos = player.get("pos", "")
             player_cost = player.get("now_cost(m)", "")
@@ -67,23 +67,13 @@ def transfer(bank, sorted_players, sorted_current):
             if candidates:
                 print_output.print_players(candidates)
                 print_output.print_replacement_impact(player, candidates)
-                player_replacement_options[player_name] = candidates
             else:
                 print("No suitable replacements found within budget.")
 
-        # Prepare the AI prompt for transfer mode (full data, no trimming)
-        transfers_full = {
-            player.get("web_name", ""): {
-                "current": player,  # full current player dict
-                "candidates": candidates,  # list of full candidate dicts
-            }
-            for player, candidates in zip(
-                sorted_current[:num_of_replacements],
-                player_replacement_options.values(),
-            )
-        }
-
-        AI_PROMPT = json.dumps(transfers_full, ensure_ascii=False, indent=2)
+        # Prepare the compact, token-budgeted AI prompt for transfer mode
+        AI_PROMPT, _ = prompt_builder.build_transfer_prompt(
+            sorted_current[:num_of_replacements], replacement_options
+        )
         return AI_PROMPT
 
     else:
@@ -1,6 +1,5 @@
-import json
-
 # Local imports
+from ai import prompt_builder
 from utils import format_date, print_output
 
 
@@ -52,5 +51,5 @@ def wildcard(sorted_players):
         print_output.print_players(wildcard_trimmed[position])
 
     # Prepare AI prompt for the wildcard selection
-    AI_PROMPT = json.dumps(wildcard_trimmed, ensure_ascii=False, indent=2)
+    AI_PROMPT, _ = prompt_builder.build_wildcard_prompt(wildcard_trimmed)
     return AI_PROMPT, total_team_cost
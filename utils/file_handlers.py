@@ -1,4 +1,5 @@
 import os
+import threading
 
 
 class Tee:
@@ -36,3 +37,19 @@ def get_unique_filename(base_name, ext=".txt", folder="reports"):
         filename = os.path.join(folder, f"{base_name}_{counter}{ext}")
         counter += 1
     return filename
+
+
+def atomic_write(path, body):
+    """
+    Write bytes to path via a temp file and rename, so concurrent readers (other
+    threads or gunicorn workers) never see a partially written file.
+    Args:
+        path: str of destination file path
+        body: bytes to write
+    Returns:
+        None
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(body)
+    os.replace(tmp_path, path)
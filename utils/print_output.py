@@ -80,6 +80,130 @@ def print_replacement_impact(player, candidates):
         )
 
 
+def print_transfer_plans(result):
+    """
+    Print ranked multi-transfer plans.
+    Args:
+        result: dict from transfer_planner.plan_transfers
+    Returns:
+        print of table containing the ranked plans
+    """
+    table_data = []
+    for i, plan in enumerate(result.get("plans", []), 1):
+        moves = "; ".join(
+            f"{move['out'].get('web_name', '')} → {move['in'].get('web_name', '')}"
+            for move in plan["transfers"]
+        )
+        table_data.append(
+            [
+                i,
+                moves,
+                plan["num_transfers"],
+                plan["hit_points"] or 0,
+                plan["rating_gain"],
+                plan["net_gain"],
+                f"£{plan['bank_after']}m",
+            ]
+        )
+    headers = ["Plan", "Transfers", "Moves", "Hit", "Rating Gain", "Net Gain", "Bank"]
+    if table_data:
+        print(tabulate(table_data, headers=headers, tablefmt="grid"))
+    else:
+        print("No affordable transfer plans found.")
+    search = "complete" if result.get("complete") else "stopped at time limit"
+    print(
+        f"Search {search}: {result.get('nodes', 0)} nodes in "
+        f"{result.get('elapsed', 0)}s, {result.get('free_transfers', 1)} free "
+        "transfer(s) assumed"
+    )
+
+
+def print_budget_sweep(result):
+    """
+    Print the wildcard objective-vs-budget frontier.
+    Args:
+        result: dict from wildcard_optimizer.sweep_budgets
+    Returns:
+        print of table containing one row per budget
+    """
+    table_data = []
+    for point in result.get("points", []):
+        changes = []
+        if point["players_in"]:
+            changes.append(f"In: {', '.join(point['players_in'])}")
+        if point["players_out"]:
+            changes.append(f"Out: {', '.join(point['players_out'])}")
+        table_data.append(
+            [
+                f"£{point['budget']:.1f}m",
+                f"£{point['total_cost']:.1f}m",
+                f"{point['objective_score']:.2f}",
+                f"{point['gain']:.2f}",
+                "yes" if point["pareto"] else "no",
+                " / ".join(changes) or "-",
+            ]
+        )
+    headers = ["Budget", "Spend", "Objective", "Gain", "Frontier", "Changes"]
+    if table_data:
+        print(tabulate(table_data, headers=headers, tablefmt="grid"))
+    else:
+        print("No feasible wildcard squad for any budget in the sweep.")
+    for budget in result.get("infeasible", []):
+        print(f"No feasible squad at £{budget:.1f}m")
+    print(
+        f"{len(table_data)} budgets solved in {result.get('elapsed', 0)}s "
+        f"with {result.get('workers', 1)} worker process(es); "
+        f"{result.get('pruned_pool_size', 0)} of {result.get('pool_size', 0)} "
+        "players after dominance pruning"
+    )
+
+
+def print_horizon_plan(result):
+    """
+    Print the multi-gameweek transfer plan.
+    Args:
+        result: dict from horizon_planner.plan_horizon
+    Returns:
+        print of table containing one row per gameweek
+    """
+    if not result.get("valid"):
+        for error in result.get("errors", []):
+            print(error)
+        return
+    table_data = []
+    for gw in result["gameweeks"]:
+        # A transfer swaps players of the same position
+        moves = "; ".join(
+            f"{out_player.get('web_name', '')} → {in_player.get('web_name', '')}"
+            for pos in ("GKP", "DEF", "MID", "FWD")
+            for out_player, in_player in zip(
+                [p for p in gw["out"] if p.get("pos") == pos],
+                [p for p in gw["in"] if p.get("pos") == pos],
+            )
+        )
+        table_data.append(
+            [
+                gw["gw"],
+                moves or "Roll transfer",
+                gw["free_transfers"],
+                gw["hit_points"] or 0,
+                gw["captain"],
+                f"{gw['points']:.1f}",
+                f"£{gw['bank']}m",
+            ]
+        )
+    headers = ["GW", "Transfers", "Free", "Hit", "Captain", "Proj. Points", "Bank"]
+    print(tabulate(table_data, headers=headers, tablefmt="grid"))
+    solve = "optimal" if result.get("optimal") else "best found in the time limit"
+    gap = result.get("gap")
+    gap_text = f", gap {gap:.2%}" if gap is not None and not result["optimal"] else ""
+    print(
+        f"Plan value {result['objective']:.1f} vs {result['hold_objective']:.1f} "
+        f"for no transfers ({solve}{gap_text}); {result['pool_size']} candidates "
+        f"solved in {result['elapsed']}s"
+    )
+
+
 def print_ai_response(API_KEY, resp):
     """
     Print AI response with appropriate formatting.
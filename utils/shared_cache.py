@@ -0,0 +1,132 @@
+import os
+import json
+import time
+import threading
+
+try:
+    import fcntl
+
+    HAS_FCNTL = True
+except ImportError:  # non-POSIX: fall back to per-process single-flight
+    HAS_FCNTL = False
+
+# Local imports
+from utils import file_handlers
+
+
+class SharedFileCache:
+    """
+    Small JSON value shared by every worker process through one file.
+
+    Reads never block on the loader: a stale or missing value is returned at
+    once and a single background refresh is started. The refresh is
+    single-flight across threads (in-process lock) and across gunicorn workers
+    (non-blocking flock on a sidecar lock file), and its result replaces the
+    file atomically. A failed refresh keeps the last good value and is retried
+    after retry_ttl rather than being cached as empty for the full ttl. If the
+    file cannot be written (read-only cache dir) the entry is kept in-process
+    instead, so the value and the retry backoff still apply per worker.
+    """
+
+    def __init__(self, path, loader, ttl, retry_ttl):
+        self.path = path
+        self.loader = loader
+        self.ttl = ttl
+        self.retry_ttl = retry_ttl
+        self._thread_lock = threading.Lock()
+        self._memo = (None, {})  # (file mtime, parsed entry)
+        self._local = {}  # last entry written by this process
+
+    def _read(self):
+        """Read the shared entry, re-parsing only when the file has changed."""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return {}
+        if self._memo[0] == mtime:
+            return self._memo[1]
+        try:
+            with open(self.path, "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        self._memo = (mtime, entry)
+        return entry
+
+    def _entry(self):
+        """The newer of the shared entry and the one kept in-process."""
+        shared, local = self._read(), self._local
+
+        def written(entry):
+            return max(entry.get("timestamp", 0), entry.get("failed_at", 0))
+
+        return local if written(local) > written(shared) else shared
+
+    def _write(self, entry):
+        self._local = entry
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            file_handlers.atomic_write(self.path, json.dumps(entry).encode("utf-8"))
+        except OSError:
+            pass
+
+    def get(self, default=None):
+        """
+        Return the cached value, scheduling a background refresh when due.
+        Args:
+            default: value returned when nothing has been cached yet
+        Returns:
+            cached value (possibly stale) or default
+        """
+        entry = self._entry()
+        now = time.time()
+        fresh = now - entry.get("timestamp", 0) < self.ttl
+        backing_off = now - entry.get("failed_at", 0) < self.retry_ttl
+        if not fresh and not backing_off:
+            self.refresh_async()
+        return entry.get("data", default)
+
+    def refresh_async(self):
+        """Start a refresh thread unless one is already running in this process."""
+        if not self._thread_lock.acquire(blocking=False):
+            return
+        thread = threading.Thread(target=self._refresh, daemon=True)
+        try:
+            thread.start()
+        except RuntimeError:
+            self._thread_lock.release()
+
+    def _refresh(self):
+        lock_file = None
+        try:
+            if HAS_FCNTL:
+                try:
+                    os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                    lock_file = open(f"{self.path}.lock", "w")
+                except OSError:
+                    lock_file = None  # unwritable dir: single-flight per process
+                if lock_file is not None:
+                    try:
+                        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except OSError:
+                        return  # another worker is already refreshing
+
+            # Re-check: another worker may have refreshed while we were starting
+            entry = self._entry()
+            now = time.time()
+            if now - entry.get("timestamp", 0) < self.ttl:
+                return
+
+            try:
+                data = self.loader()
+            except Exception:
+                entry = dict(entry, failed_at=time.time())
+                self._write(entry)
+                return
+            self._write({"data": data, "timestamp": time.time()})
+        except OSError:
+            pass
+        finally:
+            if lock_file is not None:
+                lock_file.close()  # releases the flock
+            self._thread_lock.release()
@@ -1,9 +1,18 @@
 import os
 import sys
-import json
 import re
 import time
-from flask import Flask, render_template, request, redirect, url_for, session, flash
+import codecs
+import threading
+from flask import (
+    Flask,
+    render_template,
+    request,
+    redirect,
+    url_for,
+    session,
+    flash,
+)
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -11,20 +20,29 @@ load_dotenv()
 app = Flask(__name__)
 app.secret_key = os.getenv("SECRET_KEY", "fpl-gaffer-secret-key")
 NAV_DEADLINE_CACHE_TTL = 300
-_nav_deadline_cache = {
-    "timestamp": 0,
-    "data": {"nav_next_gw": None, "nav_deadline": None},
-}
-
-from config import constants, settings
-from ai import ai_prompt, ai_advisor, wildcard_validator
-from utils import file_handlers, format_date
-from models import ratings, sort, replacements, wildcard_optimizer
+NAV_DEADLINE_RETRY_TTL = 30
+
+from config import acquisition, constants, settings
+from ai import ai_prompt, ai_advisor, prompt_builder, response_cache, wildcard_validator
+from utils import file_handlers, format_date, shared_cache
+from models import (
+    fixtures,
+    horizon_planner,
+    ratings,
+    replacements,
+    sort,
+    transfer_planner,
+    wildcard_optimizer,
+)
 
 
 @app.route("/health")
 def health():
-    return {"status": "ok", "service": "fplgaffer"}, 200
+    return {
+        "status": "ok",
+        "service": "fplgaffer",
+        "ai_cache": response_cache.get_cache().stats(),
+    }, 200
 
 
 def get_reports():
@@ -66,8 +84,20 @@ def format_report_name(filename):
     return filename.replace("_", " ").replace(".txt", "")
 
 
-def run_analysis(mode, team_id=None, num_replacements=4, team_cost=100):
-    """Run the FPL analysis and return results"""
+def run_analysis(
+    mode,
+    team_id=None,
+    num_replacements=4,
+    team_cost=100,
+    sweep_extra=0.0,
+    stream=False,
+):
+    """
+    Run the FPL analysis and return results.
+    With stream=True the deterministic report is written first and the AI
+    step then runs in a background thread (see finish_report), so the
+    report can be shown while the AI text arrives.
+    """
     if team_id:
         os.environ["FPL_TEAM_ID"] = team_id
 
@@ -78,12 +108,13 @@ def run_analysis(mode, team_id=None, num_replacements=4, team_cost=100):
     with redirect_stdout(captured):
         API_KEY, client = settings.ai_client()
 
-    bootstrap_data = settings.fetch_bootstrap_data()
-    players = settings.format_all_players(bootstrap_data)
-    gw_current = settings.get_current_gameweek(bootstrap_data)
-    next_event = settings.get_next_gameweek_event(bootstrap_data)
-    transfer_target_gw = next_event.get("id", gw_current + 1)
-    bank, picks_pids = settings.my_picks(gw_current)
+    data = acquisition.acquire_analysis_data(team_id)
+    players = settings.format_all_players(
+        data.bootstrap, data.fixtures, data.fixtures_version, data.bootstrap_version
+    )
+    gw_current = data.gw_current
+    transfer_target_gw = data.next_event.get("id", gw_current + 1)
+    bank, picks_pids = data.bank, data.picks_pids
 
     if mode == "transfer":
         weights, base_name = (
@@ -99,227 +130,322 @@ def run_analysis(mode, team_id=None, num_replacements=4, team_cost=100):
     f = open(filename, "w")
     original_stdout = sys.stdout
     sys.stdout = file_handlers.Tee(sys.stdout, f)
+    # Restore stdout and close the report whatever fails below
+    try:
+        players = ratings.compute_ml_ratings(players, weights, mode)
+        sorted_players = sort.sort_players(players)
+        sorted_current = sort.sort_current_team(sorted_players, picks_pids)
 
-    players = ratings.compute_ml_ratings(players, weights, mode)
-    sorted_players = sort.sort_players(players)
-    sorted_current = sort.sort_current_team(sorted_players, picks_pids)
+        # Print analysis output to report file
+        from utils import print_output
 
-    # Print analysis output to report file
-    from utils import print_output
+        if mode == "transfer":
+            print(f"\n{'=' * 60}")
+            print(f"TRANSFER MODE ({format_date.format_date_with_ordinal()})")
+            print(f"{'=' * 60}")
+            print(f"\n{'=' * 60}")
+            print("FPL TEAM ASSESSMENT")
+            print(f"{'=' * 60}")
+            print("Players sorted by performance score (lowest to highest)")
+            print(f"BANK: £{bank}m\n")
+            print_output.print_players(sorted_current)
 
-    if mode == "transfer":
-        print(f"\n{'=' * 60}")
-        print(f"TRANSFER MODE ({format_date.format_date_with_ordinal()})")
-        print(f"{'=' * 60}")
-        print(f"\n{'=' * 60}")
-        print("FPL TEAM ASSESSMENT")
-        print(f"{'=' * 60}")
-        print("Players sorted by performance score (lowest to highest)")
-        print(f"BANK: £{bank}m\n")
-        print_output.print_players(sorted_current)
+            # Replacements for every squad slot in one batch (report + AI prompt)
+            replacement_options = replacements.find_replacements_batch(
+                sorted_current, bank, sorted_players, sorted_current
+            )
 
-        if num_replacements > 0:
+            if num_replacements > 0:
+                print(f"\n{'=' * 60}")
+                print(f"REPLACEMENT SUGGESTIONS FOR {num_replacements} PLAYERS")
+                print(f"{'=' * 60}")
+                for player, candidates in zip(
+                    sorted_current[:num_replacements], replacement_options
+                ):
+                    player_name = player.get("web_name", "")
+                    player_pos = player.get("pos", "")
+                    player_cost = player.get("now_cost(m)", "")
+                    player_rating = player.get("rating", "")
+                    player_team = player.get("team_name", "")
+                    print(f"\n{'=' * 60}")
+                    print(
+                        f"REPLACEMENT OPTIONS FOR: {player_name} - {player_team} "
+                        f"({player_pos}, £{player_cost}m, Rating: {player_rating})"
+                    )
+                    print(f"{'=' * 60}")
+                    if candidates:
+                        print_output.print_players(candidates)
+                        print_output.print_replacement_impact(player, candidates)
+
+            transfer_plans = transfer_planner.plan_transfers(
+                sorted_players, sorted_current, bank
+            )
             print(f"\n{'=' * 60}")
-            print(f"REPLACEMENT SUGGESTIONS FOR {num_replacements} PLAYERS")
+            max_transfers = constants.TRANSFER_PLAN_MAX_TRANSFERS
+            print(f"TRANSFER PLANS (UP TO {max_transfers} TRANSFERS)")
             print(f"{'=' * 60}")
-            for player in sorted_current[:num_replacements]:
-                candidates = replacements.find_replacements(
-                    player, bank, sorted_players, sorted_current
-                )
-                player_name = player.get("web_name", "")
-                player_pos = player.get("pos", "")
-                player_cost = player.get("now_cost(m)", "")
-                player_rating = player.get("rating", "")
-                player_team = player.get("team_name", "")
+            print_output.print_transfer_plans(transfer_plans)
+
+            horizon = horizon_planner.plan_horizon(
+                sorted_players,
+                sorted_current,
+                bank,
+                fixtures.get_fixture_matrix(data.fixtures, data.fixtures_version),
+                transfer_target_gw,
+            )
+            last_gw = transfer_target_gw + constants.HORIZON_GAMEWEEKS - 1
+            print(f"\n{'=' * 60}")
+            print(f"TRANSFER HORIZON (GW {transfer_target_gw} TO GW {last_gw})")
+            print(f"{'=' * 60}")
+            print_output.print_horizon_plan(horizon)
+        else:
+            print(f"\n{'=' * 60}")
+            print(f"WILDCARD MODE ({format_date.format_date_with_ordinal()})")
+            print(f"{'=' * 60}")
+            print(f"Total Team Value: £{team_cost}m\n")
+
+            wildcard_trimmed = {
+                "GKP": sorted_players["GKP"][: constants.WILDCARD_POOL_GKP],
+                "DEF": sorted_players["DEF"][: constants.WILDCARD_POOL_DEF],
+                "MID": sorted_players["MID"][: constants.WILDCARD_POOL_MID],
+                "FWD": sorted_players["FWD"][: constants.WILDCARD_POOL_FWD],
+            }
+
+            positions = [
+                ("TOP GOALKEEPERS", "GKP"),
+                ("TOP DEFENDERS", "DEF"),
+                ("TOP MIDFIELDERS", "MID"),
+                ("TOP FORWARDS", "FWD"),
+            ]
+
+            for title, position in positions:
                 print(f"\n{'=' * 60}")
-                print(
-                    f"REPLACEMENT OPTIONS FOR: {player_name} - {player_team} "
-                    f"({player_pos}, £{player_cost}m, Rating: {player_rating})"
-                )
+                print(title)
                 print(f"{'=' * 60}")
-                if candidates:
-                    print_output.print_players(candidates)
-                    print_output.print_replacement_impact(player, candidates)
-    else:
+                print_output.print_players(wildcard_trimmed[position])
+
+            if sweep_extra > 0:
+                budgets = [
+                    team_cost + step * constants.WILDCARD_SWEEP_STEP
+                    for step in range(
+                        int(sweep_extra / constants.WILDCARD_SWEEP_STEP) + 1
+                    )
+                ]
+                print(f"\n{'=' * 60}")
+                print(f"BUDGET SWEEP (£{budgets[0]:.1f}m TO £{budgets[-1]:.1f}m)")
+                print(f"{'=' * 60}")
+                try:
+                    sweep = wildcard_optimizer.sweep_budgets(
+                        sorted_players, budgets, constants.WILDCARD_MIN_SPEND_GAP
+                    )
+                except (ValueError, RuntimeError) as e:
+                    print(f"Budget sweep failed: {e}")
+                else:
+                    print_output.print_budget_sweep(sweep)
+
         print(f"\n{'=' * 60}")
-        print(f"WILDCARD MODE ({format_date.format_date_with_ordinal()})")
+        print("AI Response")
         print(f"{'=' * 60}")
-        print(f"Total Team Value: £{team_cost}m\n")
-
-        wildcard_trimmed = {
-            "GKP": sorted_players["GKP"][: constants.WILDCARD_POOL_GKP],
-            "DEF": sorted_players["DEF"][: constants.WILDCARD_POOL_DEF],
-            "MID": sorted_players["MID"][: constants.WILDCARD_POOL_MID],
-            "FWD": sorted_players["FWD"][: constants.WILDCARD_POOL_FWD],
-        }
-
-        positions = [
-            ("TOP GOALKEEPERS", "GKP"),
-            ("TOP DEFENDERS", "DEF"),
-            ("TOP MIDFIELDERS", "MID"),
-            ("TOP FORWARDS", "FWD"),
-        ]
-
-        for title, position in positions:
-            print(f"\n{'=' * 60}")
-            print(title)
-            print(f"{'=' * 60}")
-            print_output.print_players(wildcard_trimmed[position])
 
-    print(f"\n{'=' * 60}")
-    print("AI Response")
-    print(f"{'=' * 60}")
+        prompt_stats = None
+        head = ""  # deterministic part of the AI section, written straight away
+        ask = None  # AI step: function of an on_delta callback -> text
 
-    AI_PROMPT = ""
-    ai_response = ""
-    ai_error = None
+        try:
+            if mode == "transfer":
+                AI_PROMPT, prompt_stats = process_transfers(
+                    bank, sorted_players, sorted_current, replacement_options
+                )
+                transfer_prompt = ai_prompt.ai_transfer_prompt()
 
-    try:
-        if mode == "transfer":
-            AI_PROMPT = process_transfers(bank, sorted_players, sorted_current)
-            transfer_prompt = ai_prompt.ai_transfer_prompt()
-            ai_response = ai_advisor.ai_fpl_helper(
-                AI_PROMPT, transfer_prompt, client, API_KEY
-            )
-        else:
-            AI_PROMPT, wildcard_pool = process_wildcard(sorted_players)
-            optimization = wildcard_optimizer.optimize_wildcard_squad(
-                wildcard_pool,
-                team_cost,
-                constants.WILDCARD_MIN_SPEND_GAP,
-            )
+                def ask_transfers(on_delta):
+                    return ai_advisor.ai_fpl_helper(
+                        AI_PROMPT, transfer_prompt, client, API_KEY, on_delta
+                    )
+
+                ask = ask_transfers
 
-            if not optimization.get("valid"):
-                joined_errors = "\n".join(optimization.get("errors", []))
-                ai_response = (
-                    "AI Error: Could not build a valid wildcard squad with optimizer.\n"
-                    f"{joined_errors}"
-                )
             else:
-                base_output = wildcard_validator.format_validated_wildcard_response(
-                    optimization["squad"],
-                    optimization["total_cost"],
+                AI_PROMPT, wildcard_pool = process_wildcard(sorted_players)
+                optimization = wildcard_optimizer.optimize_wildcard_squad(
+                    wildcard_pool,
                     team_cost,
+                    constants.WILDCARD_MIN_SPEND_GAP,
                 )
-                diagnostics = wildcard_optimizer.format_optimizer_diagnostics(
-                    optimization,
-                    team_cost,
-                )
-                ai_response = f"{base_output}\n\nDiagnostics:\n{diagnostics}"
-
-                if API_KEY and client:
-                    explain_prompt = ai_prompt.ai_wildcard_explain_prompt(team_cost)
-                    explain_payload = {
-                        "budget_limit": team_cost,
-                        "selected_squad": [
-                            {
-                                "id": p.get("id"),
-                                "name": p.get("web_name"),
-                                "team": p.get("team_name"),
-                                "pos": p.get("pos"),
-                                "cost": p.get("now_cost(m)"),
-                                "rating": p.get("rating"),
-                                "form": p.get("form"),
-                                "ep_next": p.get("ep_next"),
-                                "minutes": p.get("minutes"),
-                            }
-                            for p in optimization["squad"]
-                        ],
-                        "diagnostics": {
-                            "total_cost": optimization.get("total_cost"),
-                            "budget_left": optimization.get("budget_left"),
-                            "objective_score": optimization.get("objective_score"),
-                        },
-                        "top_excluded": optimization.get("top_excluded", []),
-                    }
-                    explain_input = json.dumps(
-                        explain_payload,
-                        ensure_ascii=False,
-                        indent=2,
+
+                if not optimization.get("valid"):
+                    joined_errors = "\n".join(optimization.get("errors", []))
+                    head = (
+                        "AI Error: Could not build a valid wildcard squad "
+                        f"with optimizer.\n{joined_errors}"
                     )
-                    explanation = ai_advisor.ai_fpl_helper(
-                        explain_input,
-                        explain_prompt,
-                        client,
-                        API_KEY,
+                else:
+                    base_output = wildcard_validator.format_validated_wildcard_response(
+                        optimization["squad"],
+                        optimization["total_cost"],
+                        team_cost,
                     )
-                    if explanation and not explanation.startswith("AI Error:"):
-                        ai_response = f"{ai_response}\n\nAI Notes:\n{explanation}"
-                    else:
-                        ai_response = (
-                            f"{ai_response}\n\nAI Notes:\n"
-                            "AI explanation unavailable for this run."
+                    diagnostics = wildcard_optimizer.format_optimizer_diagnostics(
+                        optimization,
+                        team_cost,
+                    )
+                    head = f"{base_output}\n\nDiagnostics:\n{diagnostics}"
+
+                    if API_KEY and client:
+                        explain_prompt = ai_prompt.ai_wildcard_explain_prompt(team_cost)
+                        explain_input, prompt_stats = (
+                            prompt_builder.build_explain_prompt(optimization, team_cost)
                         )
-    except Exception as e:
-        ai_error = str(e)
-        ai_response = f"AI Error: {ai_error}"
+
+                        def ask_explanation(on_delta):
+                            on_delta("AI Notes:\n")
+                            explanation = ai_advisor.ai_fpl_helper(
+                                explain_input,
+                                explain_prompt,
+                                client,
+                                API_KEY,
+                                on_delta,
+                            )
+                            if explanation and not explanation.startswith("AI Error:"):
+                                return f"\nAI Notes:\n{explanation}"
+                            return (
+                                "\nAI Notes:\nAI explanation unavailable for this run."
+                            )
+
+                        ask = ask_explanation
+
+        except Exception as e:
+            head = f"AI Error: {e}"
+            ask = None
+        if head:
+            print(head)
     finally:
-        if ai_response:
-            print(ai_response)
         sys.stdout = original_stdout
         f.close()
 
-    return {
+    result = {
         "filename": os.path.basename(filename),
         "mode": mode,
         "gw": report_gw,
         "bank": bank,
-        "ai_response": ai_response,
+        "ai_response": head,
+        "prompt_tokens": prompt_stats["tokens"] if prompt_stats else None,
     }
+    if ask is not None:
+        if stream:
+            # The report so far is complete on disk; the AI text streams into
+            # its sidecar from a background thread
+            open(filename + constants.AI_STREAM_SUFFIX, "w").close()
+            threading.Thread(
+                target=finish_report, args=(filename, ask), daemon=True
+            ).start()
+            result["ai_pending"] = True
+        else:
+            tail = finish_report(filename, ask)
+            result["ai_response"] = "\n".join(part for part in (head, tail) if part)
+    return result
+
+
+def finish_report(report_path, ask):
+    """
+    Run the AI step of an analysis and append its text to the report.
+
+    Text is appended to the report's sidecar (report path +
+    AI_STREAM_SUFFIX) as it streams in, so any worker can relay it; the
+    sidecar is removed once the report holds the final text.
+    Args:
+        report_path: path of the report file
+        ask: function of an on_delta callback returning the final text
+    Returns:
+        str: AI text appended to the report
+    """
+    sidecar = report_path + constants.AI_STREAM_SUFFIX
+    try:
+        with open(sidecar, "a", encoding="utf-8") as out:
+
+            def on_delta(text):
+                out.write(text)
+                out.flush()
+
+            tail = ask(on_delta)
+    except Exception as e:
+        tail = f"AI Error: {e}"
+    try:
+        with open(report_path, "a") as f:
+            f.write(f"{tail}\n")
+    finally:
+        try:
+            os.remove(sidecar)
+        except OSError:
+            pass
+    return tail
+
+
+def ai_pending(report_path):
+    """True while a report's AI text is still streaming into its sidecar."""
+    try:
+        age = time.time() - os.path.getmtime(report_path + constants.AI_STREAM_SUFFIX)
+    except OSError:
+        return False
+    # A sidecar left by a worker that died stops counting once it goes stale
+    return age < constants.AI_STREAM_STALL_SECONDS
+
+
+def load_next_deadline():
+    """Fetch next gameweek and formatted deadline for the nav bar."""
+    bootstrap_data = settings.fetch_bootstrap_data()
+    next_event = settings.get_next_gameweek_event(bootstrap_data)
+    return {
+        "nav_next_gw": next_event.get("id"),
+        "nav_deadline": format_date.format_uk_deadline(next_event.get("deadline_time")),
+    }
+
+
+# Shared by all gunicorn workers; renders never wait on the FPL API.
+_nav_deadline_cache = shared_cache.SharedFileCache(
+    os.path.join(constants.FPL_CACHE_DIR, "nav_deadline.json"),
+    load_next_deadline,
+    ttl=NAV_DEADLINE_CACHE_TTL,
+    retry_ttl=NAV_DEADLINE_RETRY_TTL,
+)
 
 
 @app.context_processor
 def inject_next_deadline():
     """Inject next gameweek and transfer deadline into all templates."""
-    now = time.time()
-    if now - _nav_deadline_cache["timestamp"] < NAV_DEADLINE_CACHE_TTL:
-        return _nav_deadline_cache["data"]
+    return _nav_deadline_cache.get(default={"nav_next_gw": None, "nav_deadline": None})
 
-    try:
-        bootstrap_data = settings.fetch_bootstrap_data()
-        next_event = settings.get_next_gameweek_event(bootstrap_data)
-        next_gw = next_event.get("id")
-        deadline = format_date.format_uk_deadline(next_event.get("deadline_time"))
-        data = {
-            "nav_next_gw": next_gw,
-            "nav_deadline": deadline,
-        }
-        _nav_deadline_cache["timestamp"] = now
-        _nav_deadline_cache["data"] = data
-        return data
-    except Exception:
-        data = {
-            "nav_next_gw": None,
-            "nav_deadline": None,
-        }
-        _nav_deadline_cache["timestamp"] = now
-        _nav_deadline_cache["data"] = data
-        return data
-
-
-def process_transfers(bank, sorted_players, sorted_current):
-    """Process transfer mode and return AI prompt"""
-    transfers_full = {}
-    for player in sorted_current:
-        candidates = replacements.find_replacements(
-            player, bank, sorted_players, sorted_current
+
+def process_transfers(bank, sorted_players, sorted_current, replacement_options=None):
+    """
+    Process transfer mode and return the AI prompt.
+
+    The payload is built by prompt_builder within AI_TRANSFER_TOKEN_BUDGET.
+    Returns:
+        tuple: (prompt text, prompt_builder stats with the token count)
+    """
+    if replacement_options is None:
+        replacement_options = replacements.find_replacements_batch(
+            sorted_current, bank, sorted_players, sorted_current
         )
-        transfers_full[player.get("web_name", "")] = {
-            "current": player,
-            "candidates": candidates,
-        }
-    return json.dumps(transfers_full, ensure_ascii=False, indent=2)
+    return prompt_builder.build_transfer_prompt(sorted_current, replacement_options)
 
 
 def process_wildcard(sorted_players):
-    """Build wildcard candidate pool and serialized payload."""
+    """
+    Build the wildcard report payload and the optimizer candidate pool.
+
+    The payload holds the WILDCARD_POOL_* top players per position; the
+    optimizer gets every player and prunes dominated ones itself.
+    """
     wildcard_trimmed = {
         "GKP": sorted_players["GKP"][: constants.WILDCARD_POOL_GKP],
         "DEF": sorted_players["DEF"][: constants.WILDCARD_POOL_DEF],
         "MID": sorted_players["MID"][: constants.WILDCARD_POOL_MID],
         "FWD": sorted_players["FWD"][: constants.WILDCARD_POOL_FWD],
     }
-    return json.dumps(wildcard_trimmed, ensure_ascii=False, indent=2), wildcard_trimmed
+    prompt, _ = prompt_builder.build_wildcard_prompt(wildcard_trimmed)
+    return prompt, sorted_players
 
 
 def parse_report_content(content):
@@ -351,6 +477,7 @@ def parse_report_content(content):
                     "TOP DEFENDERS",
                     "TOP MIDFIELDERS",
                     "TOP FORWARDS",
+                    "BUDGET SWEEP",
                 ]
             ):
                 if table_data and headers:
@@ -386,7 +513,7 @@ def parse_report_content(content):
             elif "|" in line_stripped:
                 parts = [p.strip() for p in line_stripped.split("|") if p.strip()]
                 if parts and len(parts) > 1:
-                    if "Name" in parts:
+                    if "Name" in parts or "Budget" in parts:
                         headers = parts
                         in_table = True
                     elif in_table:
@@ -409,6 +536,7 @@ def parse_report_content(content):
         in_current_team = False
         in_ai_section = False
         current_replacement = None
+        plans_section = None
         table_data = []
         headers = []
 
@@ -434,6 +562,28 @@ def parse_report_content(content):
                     table_data = []
                     headers = []
                 in_current_team = False
+            elif "TRANSFER PLANS" in line_stripped:
+                if in_current_team and table_data and headers:
+                    current_team["tables"].append(
+                        {"headers": headers, "rows": table_data}
+                    )
+                if current_replacement and current_replacement.get("tables"):
+                    sections.append(current_replacement)
+                current_replacement = None
+                plans_section = {"title": "Transfer Plans", "tables": []}
+                table_data = []
+                headers = []
+                in_current_team = False
+            elif "TRANSFER HORIZON" in line_stripped:
+                if plans_section is not None:
+                    if table_data and headers:
+                        plans_section["tables"].append(
+                            {"headers": headers, "rows": table_data}
+                        )
+                    sections.append(plans_section)
+                plans_section = {"title": "Transfer Horizon", "tables": []}
+                table_data = []
+                headers = []
             elif "REPLACEMENT OPTIONS FOR" in line_stripped:
                 if current_replacement and current_replacement.get("tables"):
                     sections.append(current_replacement)
@@ -454,12 +604,24 @@ def parse_report_content(content):
                 if current_replacement and current_replacement.get("tables"):
                     sections.append(current_replacement)
                     current_replacement = None
+                if plans_section is not None:
+                    if table_data and headers:
+                        plans_section["tables"].append(
+                            {"headers": headers, "rows": table_data}
+                        )
+                    sections.append(plans_section)
+                    plans_section = None
                 in_ai_section = True
                 in_current_team = False
             elif "|" in line_stripped:
                 parts = [p.strip() for p in line_stripped.split("|") if p.strip()]
                 if parts and len(parts) > 1:
-                    if "Name" in parts:
+                    if plans_section is not None:
+                        if "Plan" in parts or "GW" in parts:
+                            headers = parts
+                        else:
+                            table_data.append(parts)
+                    elif "Name" in parts:
                         headers = parts
                     else:
                         if current_replacement is not None:
@@ -485,6 +647,11 @@ def parse_report_content(content):
         if current_replacement and current_replacement.get("tables"):
             sections.append(current_replacement)
 
+        if plans_section is not None:
+            if table_data and headers:
+                plans_section["tables"].append({"headers": headers, "rows": table_data})
+            sections.append(plans_section)
+
     # Add AI response for transfer mode
     if not is_wildcard:
         ai_clean = "\n".join(
@@ -526,10 +693,19 @@ def analyze():
     team_id = request.form.get("team_id", "")
     num_replacements = int(request.form.get("num_replacements", 4))
     team_cost = float(request.form.get("team_cost", 100))
+    sweep_extra = min(
+        max(float(request.form.get("sweep_extra", 0) or 0), 0.0),
+        constants.WILDCARD_SWEEP_MAX_EXTRA,
+    )
 
     try:
         result = run_analysis(
-            mode, team_id if team_id else None, num_replacements, team_cost
+            mode,
+            team_id if team_id else None,
+            num_replacements,
+            team_cost,
+            sweep_extra,
+            stream=True,
         )
         session["current_result"] = result
         # Redirect directly to view the new report
@@ -567,15 +743,47 @@ def view_report(filename):
         filename=filename,
         display_name=display_name,
         sections=sections,
+        ai_pending=ai_pending(filepath),
+        poll_ms=int(constants.AI_STREAM_POLL_SECONDS * 1000),
+        max_poll_ms=int(constants.AI_STREAM_MAX_SECONDS * 1000),
     )
 
 
+@app.route("/report/<filename>/ai")
+def report_ai_text(filename):
+    """
+    AI text of a report generated since a byte offset, polled by the report
+    page while the AI step runs.
+
+    The text is read from the report's sidecar file, so any worker can
+    answer, and each poll is one short read: no worker thread is held
+    between polls. Only whole characters are returned; "offset" is where
+    the next poll continues, and "done" is set once the sidecar is gone or
+    stale and the report holds the final text.
+    """
+    report_path = os.path.join("reports", filename)
+    offset = max(0, request.args.get("offset", 0, type=int))
+    chunk = b""
+    try:
+        with open(report_path + constants.AI_STREAM_SUFFIX, "rb") as f:
+            f.seek(offset)
+            chunk = f.read()
+    except OSError:
+        pass
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    text = decoder.decode(chunk)
+    offset += len(chunk) - len(decoder.getstate()[0])
+    return {"text": text, "offset": offset, "done": not ai_pending(report_path)}
+
+
 @app.route("/delete/<filename>")
 def delete_report(filename):
     folder = "reports"
     filepath = os.path.join(folder, filename)
     if os.path.exists(filepath):
         os.remove(filepath)
+        if os.path.exists(filepath + constants.AI_STREAM_SUFFIX):
+            os.remove(filepath + constants.AI_STREAM_SUFFIX)
         flash(f"Report {filename} deleted successfully", "success")
     else:
         flash("Report not found", "danger")